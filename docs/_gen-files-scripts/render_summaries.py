@@ -1,8 +1,12 @@
 """
 Render every SUMMARY.md under docs/docs/ with Jinja, using variables
-from docs/mkdocs.yml::extra, loaded via MkDocs' config system. The
-rendered content is written back to the same relative path *inside*
-MkDocs' virtual file system.
+from docs/mkdocs.yml::extra, taken from the config of the running MkDocs
+build. The rendered content is written back to the same relative path
+*inside* MkDocs' virtual file system.
+
+Rendered summaries are cached in `.docs-cache/summaries.json` by the hash of
+their source (and of any template they include) and the hash of the `extra`
+context, so a rebuild only renders the summaries that changed.
 
 Requires:
   - mkdocs
@@ -10,45 +14,83 @@ Requires:
   - jinja2
 """
 
+import hashlib
+import json
 from pathlib import Path
 
 import jinja2
+import jinja2.meta
 import mkdocs_gen_files as gen_files
-from mkdocs.config import load_config as load_mkdocs_config
 
 # ---------------------------------------------------------------------
-# 1.  Load mkdocs.yml configuration
+# 1.  Jinja context from the running build's mkdocs.yml configuration
 # ---------------------------------------------------------------------
 ROOT = Path(__file__).resolve().parents[2]  # repo root
-MKDOCS_YML = ROOT / "docs" / "mkdocs.yml"
+DOCS_SRC = ROOT / "docs" / "docs"
+CACHE_FILE = ROOT / ".docs-cache" / "summaries.json"
 
-mkdocs_cfg = load_mkdocs_config(str(MKDOCS_YML))
-ctx = mkdocs_cfg.get("extra", {})  # variables for Jinja
+ctx = dict(gen_files.config.get("extra") or {})  # variables for Jinja
+ctx_hash = hashlib.sha256(
+    json.dumps(ctx, sort_keys=True, default=str).encode()
+).hexdigest()
 
 
 # ---------------------------------------------------------------------
-# 2.  Prepare the Jinja environment
+# 2.  Cache of rendered summaries
 # ---------------------------------------------------------------------
-jinja_env = jinja2.Environment(
-    loader=jinja2.FileSystemLoader(str(ROOT)),
-    undefined=jinja2.StrictUndefined,
-    autoescape=False,
-)
+try:
+    cache = json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+except (OSError, ValueError):
+    cache = {}
+
+# The Jinja environment is only built when a summary has to be rendered.
+_jinja_env = None
+
+
+def jinja_env() -> jinja2.Environment:
+    global _jinja_env
+    if _jinja_env is None:
+        _jinja_env = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(str(ROOT)),
+            undefined=jinja2.StrictUndefined,
+            autoescape=False,
+        )
+    return _jinja_env
+
+
+def source_hash(raw: str) -> str:
+    """Hash a summary and the templates it includes, imports or extends."""
+    digest = hashlib.sha256(raw.encode())
+    if "{%" in raw:
+        names = jinja2.meta.find_referenced_templates(jinja_env().parse(raw))
+        for name in sorted(n for n in names if n is not None):
+            digest.update(name.encode())
+            digest.update((ROOT / name).read_bytes())
+    return digest.hexdigest()
 
 
 # ---------------------------------------------------------------------
 # 3.  Walk docs/docs/**/SUMMARY.md, render, and emit via gen-files
 # ---------------------------------------------------------------------
-DOCS_SRC = ROOT / "docs" / "docs"
-
-for path in DOCS_SRC.rglob("SUMMARY.md"):
+fresh = {}
+for path in sorted(DOCS_SRC.rglob("SUMMARY.md")):
     raw = path.read_text(encoding="utf-8")
 
-    rendered = jinja_env.from_string(raw).render(**ctx)
-
     # keep same path *inside* MkDocs' virtual file tree:
     #   docs/…/SUMMARY.md
-    rel_path = path.relative_to(ROOT / "docs" / "docs")
+    rel_path = path.relative_to(DOCS_SRC)
+
+    entry = {"source": source_hash(raw), "context": ctx_hash}
+    cached = cache.get(rel_path.as_posix(), {})
+    if {k: cached.get(k) for k in entry} == entry:
+        rendered = cached["rendered"]
+    else:
+        rendered = jinja_env().from_string(raw).render(**ctx)
+    fresh[rel_path.as_posix()] = {**entry, "rendered": rendered}
 
     with gen_files.open(rel_path, "w") as fp:
         fp.write(rendered)
+
+if fresh != cache:
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    CACHE_FILE.write_text(json.dumps(fresh, indent=2, sort_keys=True), encoding="utf-8")
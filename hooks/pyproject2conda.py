@@ -4,29 +4,98 @@ Pre-commit hook: if `pyproject.toml` is in the staged diff, run
 `pyproject2conda project` to (re)generate `environment-py312-dev.yaml`
 and re-stage the result so the commit is self-contained.
 
+Only some sections of `pyproject.toml` feed the environment file. Their hash
+is stored as the last line of the YAML, and regeneration (a multi-second
+conda metadata resolution) is skipped while it matches, e.g. for edits to
+`[tool.ruff]` or `[tool.mypy]`. A missing YAML is always regenerated.
+
 This script is intentionally short and dependency-free so that the
 `language: python` pre-commit runtime can execute it in an isolated venv.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 import pathlib
 import shutil
 import subprocess
 import sys
-from typing import List
+import tomllib
+from typing import Any
 
 from loguru import logger
 
+ENV_FILE = pathlib.Path("environment-py312-dev.yaml")
+HASH_PREFIX = "# pyproject2conda-hook dependency hash: "
+
+# Sections of `pyproject.toml` that `pyproject2conda project` reads.
+HASHED_SECTIONS = (
+    ("project", "dependencies"),
+    ("project", "optional-dependencies"),
+    ("project", "requires-python"),
+    ("dependency-groups",),
+    ("tool", "pyproject2conda"),
+)
+
+
+def dependency_hash(pyproject: pathlib.Path) -> str | None:
+    """Hash the sections of *pyproject* that feed the environment file."""
+    try:
+        data = tomllib.loads(pyproject.read_text())
+    except (OSError, tomllib.TOMLDecodeError):
+        return None
+    sections: dict[str, Any] = {}
+    for keys in HASHED_SECTIONS:
+        value: Any = data
+        for key in keys:
+            value = value.get(key) if isinstance(value, dict) else None
+        sections[".".join(keys)] = value
+    canonical = json.dumps(sections, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
 
-def main(argv: List[str] | None = None) -> int:  # noqa: D401  (simple imperative)
+def stored_hash(env_file: pathlib.Path) -> str | None:
+    """Return the hash recorded in *env_file*, if any."""
+    try:
+        lines = env_file.read_text().splitlines()
+    except OSError:
+        return None
+    for line in reversed(lines):
+        if line.startswith(HASH_PREFIX):
+            return line.removeprefix(HASH_PREFIX).strip()
+    return None
+
+
+def write_hash(env_file: pathlib.Path, digest: str) -> None:
+    """Record *digest* as the last line of *env_file*."""
+    lines = [
+        line
+        for line in env_file.read_text().splitlines()
+        if not line.startswith(HASH_PREFIX)
+    ]
+    env_file.write_text("\n".join([*lines, HASH_PREFIX + digest]) + "\n")
+
+
+def main(argv: list[str] | None = None) -> int:
     """Entry-point used by pre-commit."""
     argv = argv if argv is not None else sys.argv[1:]
 
     # 1. Bail early if `pyproject.toml` isn’t part of the staged paths.
-    if not any(pathlib.Path(p).name == "pyproject.toml" for p in argv):
+    pyproject = next(
+        (pathlib.Path(p) for p in argv if pathlib.Path(p).name == "pyproject.toml"),
+        None,
+    )
+    if pyproject is None:
         return 0  # Hook passes silently.
 
+    # 1b. Skip when the sections feeding the environment file are unchanged.
+    digest = dependency_hash(pyproject)
+    env_file = ENV_FILE
+    if digest is not None and env_file.exists() and stored_hash(env_file) == digest:
+        logger.info("[pyproject2conda-hook] Dependencies unchanged; skipping.")
+        return 0
+
     # 2. Ensure the CLI is available.
     if not shutil.which("pyproject2conda"):
         logger.error("`pyproject2conda` executable not found in PATH.")
@@ -43,8 +112,9 @@ def main(argv: List[str] | None = None) -> int:  # noqa: D401  (simple imperativ
         return result.returncode
 
     # 4. Stage the updated/created YAML so the commit doesn’t fail CI later.
-    env_file = pathlib.Path("environment-py312-dev.yaml")
     if env_file.exists():
+        if digest is not None:
+            write_hash(env_file, digest)
         subprocess.run(["git", "add", str(env_file)], check=False)
 
     logger.success("[pyproject2conda-hook] Environment file regenerated and staged.")
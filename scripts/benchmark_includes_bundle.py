@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Compare Snakemake startup time with per-file includes and with the includes
+bundle written by `tasks/bundle_smk_includes.py`.
+
+The benchmark builds a synthetic workflow with one smk file per rule, listed
+in `workflow/rules/includes.smk` exactly like `append_smk_include.py` does,
+and times `snakemake --list-rules` (parse only, no DAG) in both modes. The
+bundle is built before timing, so the bundle mode measures the steady state
+where `build()` only has to stat the members.
+
+Usage
+-----
+
+    # 200 rules, 5 timed runs per mode
+    python -m scripts.benchmark_includes_bundle
+
+    python -m scripts.benchmark_includes_bundle --rules 1000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import typer
+
+from scripts.copie_helpers import load_module_from_path
+
+PROJECT_ROOT: Path = Path(__file__).resolve().parents[1]
+BUNDLER_PATH: Path = PROJECT_ROOT / "tasks" / "bundle_smk_includes.py"
+
+###############################################################################
+#  Synthetic workflow                                                          #
+###############################################################################
+
+RULE_TEMPLATE = """\
+rule {name}:
+    input:
+        "data/{name}/input.txt",
+    output:
+        "data/{name}/output.txt",
+    params:
+        threshold=0.5,
+    log:
+        "logs/{name}/log.txt",
+    shell:
+        "cp {{input}} {{output}} 2> {{log}}"
+"""
+
+
+def write_synthetic_workflow(root: Path, n_rules: int) -> Path:
+    """
+    Write a workflow with *n_rules* smk files under *root* and return the
+    path of its Snakefile.
+    """
+    rules_dir = root / "workflow" / "rules"
+    rules_dir.mkdir(parents=True, exist_ok=True)
+    includes = []
+    for i in range(n_rules):
+        name = f"rule_{i:04d}"
+        (rules_dir / f"{name}.smk").write_text(RULE_TEMPLATE.format(name=name))
+        includes.append(f'include: "{name}.smk"\n')
+    (rules_dir / "includes.smk").write_text("".join(includes))
+
+    snakefile = root / "workflow" / "Snakefile"
+    snakefile.write_text('include: "rules/includes.smk"\n')
+    return snakefile
+
+
+###############################################################################
+#  Timing                                                                      #
+###############################################################################
+
+
+def time_startup(
+    snakefile: Path, *, repeat: int, snakemake: str = "snakemake"
+) -> list[float]:
+    """
+    Time *repeat* runs of ``snakemake --list-rules`` after one warm-up run.
+    """
+    cmd = [snakemake, "--snakefile", str(snakefile), "--list-rules"]
+    cwd = snakefile.parents[1]
+
+    def _run() -> float:
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=cwd, check=True, capture_output=True)
+        return time.perf_counter() - start
+
+    _run()  # warm the OS file cache and Python bytecode caches
+    return [_run() for _ in range(repeat)]
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "max_s": max(timings),
+    }
+
+
+def run_benchmark(
+    work_dir: Path, *, n_rules: int, repeat: int, snakemake: str = "snakemake"
+) -> dict[str, Any]:
+    """Time both include modes on a synthetic workflow inside *work_dir*."""
+    snakefile = write_synthetic_workflow(work_dir, n_rules)
+    per_file = summarize(time_startup(snakefile, repeat=repeat, snakemake=snakemake))
+
+    bundler = load_module_from_path(BUNDLER_PATH)
+    bundler.enable(snakefile.parent / "rules", helper_source=BUNDLER_PATH)
+    bundled = summarize(time_startup(snakefile, repeat=repeat, snakemake=snakemake))
+
+    return {
+        "rules": n_rules,
+        "repeat": repeat,
+        "per_file": per_file,
+        "bundled": bundled,
+        "speedup": per_file["median_s"] / bundled["median_s"],
+    }
+
+
+###############################################################################
+#  CLI                                                                         #
+###############################################################################
+
+app = typer.Typer(add_completion=False)  # we do not need shell completion
+
+
+@app.command("run")
+def run_cmd(
+    rules: int = typer.Option(200, min=1, help="Number of synthetic rules."),
+    repeat: int = typer.Option(5, min=1, help="Timed runs per mode."),
+    snakemake: str = typer.Option("snakemake", help="Snakemake executable."),
+    keep: Path | None = typer.Option(
+        None, help="Write the synthetic workflow here and keep it."
+    ),
+) -> None:
+    """
+    Print Snakemake startup times with per-file and bundled includes.
+    """
+    if shutil.which(snakemake) is None:
+        typer.echo(f"Snakemake executable '{snakemake}' not found.", err=True)
+        raise typer.Exit(1)
+
+    work_dir = keep or Path(tempfile.mkdtemp(prefix="includes_bundle_"))
+    try:
+        result = run_benchmark(
+            work_dir, n_rules=rules, repeat=repeat, snakemake=snakemake
+        )
+    finally:
+        if keep is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    typer.echo(f"{rules} rules, {repeat} runs per mode (snakemake --list-rules)")
+    typer.echo(f"{'mode':<10} {'median_s':>9} {'min_s':>9} {'max_s':>9}")
+    for mode in ("per_file", "bundled"):
+        row = result[mode]
+        typer.echo(
+            f"{mode:<10} {row['median_s']:>9.3f} {row['min_s']:>9.3f} "
+            f"{row['max_s']:>9.3f}"
+        )
+    typer.echo(f"speedup    {result['speedup']:>9.2f}x")
+
+
+if __name__ == "__main__":
+    app()
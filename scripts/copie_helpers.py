@@ -10,6 +10,9 @@ from plumbum import local
 from pytest_copie.plugin import Copie, Result
 from ruamel.yaml import YAML
 
+from scripts.render_fanout import FanOutCopie
+from scripts.render_profile import profiled
+
 
 def load_module_from_path(module_path: Path) -> Any:
     spec = importlib.util.spec_from_file_location(module_path.stem, module_path)
@@ -45,8 +48,11 @@ def new_copie(
     test_dir: Path,
     config_file: Path,
     parent_result: Result | None = None,
+    fan_out: bool = False,
 ) -> Copie:
-    return Copie(
+    # SEE: scripts/render_fanout.py
+    copie_cls = FanOutCopie if fan_out else Copie
+    return copie_cls(
         default_template_dir=template_dir.resolve(),
         test_dir=test_dir.resolve(),
         config_file=config_file.resolve(),
@@ -60,6 +66,7 @@ def run_copie_with_output_control(
     answers: dict[str, Any],
     *,
     vcs_ref: str | None = None,
+    profile_name: str | None = None,
 ) -> Result:
     copy_kwargs: dict[str, Any] = {"extra_answers": dict(answers)}
     if vcs_ref is not None:
@@ -80,17 +87,25 @@ def run_copie_with_output_control(
         os.environ["PATH"] = patched_path
         local.env["PATH"] = patched_path
 
+    # SEE: --profile-render in tests/conftest.py and scripts/render_profile.py
+    profile_dir = getattr(config.option, "profile_render", None)
+    if profile_name is None:
+        profile_name = (
+            f"{copie_session.test_dir.parent.name}-{copie_session.test_dir.name}"
+        )
+
     try:
-        if config.option.verbose < 2:
-            with open(os.devnull, "w") as devnull:
-                old_stdout, old_stderr = sys.stdout, sys.stderr
-                sys.stdout, sys.stderr = devnull, devnull
-                try:
-                    return copie_session.copy(**copy_kwargs)
-                finally:
-                    sys.stdout, sys.stderr = old_stdout, old_stderr
-
-        return copie_session.copy(**copy_kwargs)
+        with profiled(Path(profile_dir) if profile_dir else None, profile_name):
+            if config.option.verbose < 2:
+                with open(os.devnull, "w") as devnull:
+                    old_stdout, old_stderr = sys.stdout, sys.stderr
+                    sys.stdout, sys.stderr = devnull, devnull
+                    try:
+                        return copie_session.copy(**copy_kwargs)
+                    finally:
+                        sys.stdout, sys.stderr = old_stdout, old_stderr
+
+            return copie_session.copy(**copy_kwargs)
     finally:
         if should_prepend_python_bin:
             if original_path is None:
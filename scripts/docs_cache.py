@@ -0,0 +1,105 @@
+"""
+Input fingerprint of the MkDocs build, for reusing a built site.
+
+`tests/docs/test_mkdocs_build.py` builds the docs with ``mkdocs build
+--strict``. With ``--docs-site-dir DIR`` it builds into a persistent site dir
+and records the fingerprint of the build inputs there; later runs skip the
+build while the fingerprint matches. The fingerprint covers
+
+- every file under `docs/` (sources, `mkdocs.yml`, gen-files scripts);
+- the files pulled in with ``{% include-markdown "..." %}`` from elsewhere
+  in the repository (e.g. the post-copier todos template);
+- the values of the environment variables `mkdocs.yml` reads with ``!ENV``;
+- the Python version and the versions of the installed MkDocs packages.
+
+Only successful builds are recorded, so a failing build is always re-run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import platform
+import re
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DOCS_DIR = Path("docs")
+MKDOCS_YML = DOCS_DIR / "mkdocs.yml"
+# Written into the site dir after a successful build.
+STAMP_NAME = ".docs-inputs.sha256"
+
+_INCLUDE = re.compile(r"\{%\s*include(?:-markdown)?\s+[\"']([^\"']+)[\"']")
+_ENV_TAG = re.compile(r"!ENV\s*\[\s*[\"']([^\"']+)[\"']")
+# Installed distributions that take part in the build.
+_DIST_PREFIXES = ("mkdocs", "mike", "pymdown-extensions", "jinja2", "markdown")
+_SKIP_DIRS = {"__pycache__", ".cache"}
+
+
+def _file_digest(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _docs_files(root: Path) -> Dict[str, Optional[str]]:
+    files: Dict[str, Optional[str]] = {}
+    for path in sorted((root / DOCS_DIR).rglob("*")):
+        rel = path.relative_to(root)
+        if path.is_file() and not _SKIP_DIRS.intersection(rel.parts):
+            files[rel.as_posix()] = _file_digest(path)
+    return files
+
+
+def _included_files(root: Path) -> Dict[str, Optional[str]]:
+    """Digest the files included into the markdown sources."""
+    files: Dict[str, Optional[str]] = {}
+    for page in sorted((root / DOCS_DIR).rglob("*.md")):
+        for target in _INCLUDE.findall(page.read_text(encoding="utf-8")):
+            path = (page.parent / target).resolve()
+            files[os.path.relpath(path, root)] = _file_digest(path)
+    return files
+
+
+def _env_values(root: Path) -> Dict[str, Optional[str]]:
+    text = (root / MKDOCS_YML).read_text(encoding="utf-8")
+    return {name: os.environ.get(name) for name in sorted(set(_ENV_TAG.findall(text)))}
+
+
+def _tool_versions() -> Dict[str, str]:
+    versions = {"python": platform.python_version()}
+    for dist in metadata.distributions():
+        name = (dist.metadata["Name"] or "").lower()
+        if name.startswith(_DIST_PREFIXES):
+            versions[name] = dist.version
+    return dict(sorted(versions.items()))
+
+
+def docs_inputs(root: Path) -> Dict[str, Any]:
+    """Everything the outcome of the docs build depends on."""
+    return {
+        "docs": _docs_files(root),
+        "includes": _included_files(root),
+        "env": _env_values(root),
+        "tools": _tool_versions(),
+    }
+
+
+def docs_inputs_hash(root: Path) -> str:
+    """Fingerprint of `docs_inputs`."""
+    text = json.dumps(docs_inputs(root), sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def site_is_fresh(site_dir: Path, digest: str) -> bool:
+    """True if *site_dir* was built from inputs with fingerprint *digest*."""
+    stamp = site_dir / STAMP_NAME
+    return stamp.is_file() and stamp.read_text().strip() == digest
+
+
+def mark_site(site_dir: Path, digest: str) -> None:
+    """Record that *site_dir* was built from inputs with fingerprint *digest*."""
+    (site_dir / STAMP_NAME).write_text(digest + "\n")
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Generate a pairwise (or t-wise) set of example answer files from `copier.yml`.
+
+Every `bool` question and every question with `choices` in `copier.yml` is a
+factor, except hidden questions (`when: false`) such as `uses_package`, which
+select template paths that are not implemented yet, and the questions pinned
+in `PINNED_ANSWERS` (`format_code`: without formatting the generated project
+does not pass its lint tests). Free-text questions listed in `TEXT_LEVELS`
+(e.g. a custom `smk_file_name`) add a "default vs custom" factor. The
+generator enumerates all answer combinations, drops the answers of questions
+whose `when:` template is false for that combination (Copier would not ask
+them), and then greedily picks combinations until every reachable t-tuple of
+factor values is covered.
+
+The examples are written to `example-answers/generated/<name>/`, where
+`tests/template/conftest.py` discovers them next to the hand-written ones.
+
+Usage
+-----
+
+    # Pairwise examples from the weh_interviews answers
+    python -m scripts.generate_example_matrix
+
+    # 3-wise, only varying some questions
+    python -m scripts.generate_example_matrix --strength 3 \\
+        --factor uses_conda --factor script_style --factor bundle_includes
+"""
+
+from __future__ import annotations
+
+import itertools
+import shutil
+from pathlib import Path
+from typing import Any
+
+import typer
+from jinja2 import Environment
+from ruamel.yaml import YAML
+
+PROJECT_ROOT: Path = Path(__file__).resolve().parents[1]
+COPIER_YML: Path = PROJECT_ROOT / "copier.yml"
+BASE_EXAMPLE_DIR: Path = PROJECT_ROOT / "example-answers" / "weh_interviews"
+GENERATED_DIR: Path = PROJECT_ROOT / "example-answers" / "generated"
+
+# Free-text questions varied between their default and a custom value.
+TEXT_LEVELS: dict[str, dict[str, Any]] = {
+    "smk_file_name": {"custom": "shared_rules.smk"},
+}
+
+# Answers every example uses; these questions are never varied.
+PINNED_ANSWERS: dict[str, Any] = {
+    "format_code": True,
+}
+
+# Answers needed by questions that only become active in some combinations.
+FILLER_ANSWERS: dict[str, Any] = {
+    "module_name": "example_module",
+}
+
+# Guard against accidentally enumerating a huge product of factors.
+MAX_COMBINATIONS = 200_000
+
+_DEFAULT = object()  # level meaning "leave the question at its default"
+
+Factor = tuple[str, list[Any]]
+Assignment = tuple[tuple[str, Any], ...]
+
+
+###############################################################################
+#  Factors                                                                     #
+###############################################################################
+
+
+def load_questions(copier_yml: Path = COPIER_YML) -> dict[str, dict[str, Any]]:
+    """Return the questions of *copier_yml* in declaration order."""
+    data = YAML(typ="safe").load(copier_yml.read_text()) or {}
+    return {
+        name: spec
+        for name, spec in data.items()
+        if not name.startswith("_") and isinstance(spec, dict) and "type" in spec
+    }
+
+
+def discover_factors(
+    questions: dict[str, dict[str, Any]], only: list[str] | None = None
+) -> list[Factor]:
+    """
+    Return ``(question, levels)`` for every factor, in question order.
+
+    *only* restricts the factors to the given question names.
+    """
+    factors: list[Factor] = []
+    for name, spec in questions.items():
+        if only and name not in only:
+            continue
+        if spec.get("when") is False or name in PINNED_ANSWERS:
+            # Hidden questions (e.g. `uses_package`) select template paths
+            # that are not implemented yet.
+            continue
+        if spec.get("choices"):
+            choices = spec["choices"]
+            levels = list(choices.values() if isinstance(choices, dict) else choices)
+        elif spec.get("type") == "bool":
+            levels = [True, False]
+        elif name in TEXT_LEVELS:
+            levels = [_DEFAULT, *TEXT_LEVELS[name].values()]
+        else:
+            continue
+        factors.append((name, levels))
+
+    unknown = set(only or []) - {name for name, _ in factors}
+    if unknown:
+        raise ValueError(
+            f"Not a bool, choice or text factor, or hidden or pinned: "
+            f"{sorted(unknown)}"
+        )
+    return factors
+
+
+###############################################################################
+#  Combinations                                                                #
+###############################################################################
+
+
+def _is_true(rendered: str) -> bool:
+    return rendered.strip().lower() not in ("", "false", "0", "no", "off", "none")
+
+
+def _is_template(value: Any) -> bool:
+    return isinstance(value, str) and ("{{" in value or "{%" in value)
+
+
+def _active(spec: dict[str, Any], answers: dict[str, Any], env: Environment) -> bool:
+    """Evaluate a question's `when:` like Copier does for a template string."""
+    when = spec.get("when", True)
+    if isinstance(when, bool):
+        # `when: false` hides a question, but answers passed as data still apply.
+        return True
+    return _is_true(env.from_string(str(when)).render(**answers))
+
+
+def _active_answers(
+    answers: dict[str, Any],
+    questions: dict[str, dict[str, Any]],
+    env: Environment,
+) -> list[tuple[str, Any]]:
+    """The ``(question, answer)`` pairs of *answers* that Copier would use."""
+    context: dict[str, Any] = {**FILLER_ANSWERS, **PINNED_ANSWERS}
+    for name, spec in questions.items():
+        if "default" in spec and not _is_template(spec["default"]):
+            context.setdefault(name, spec["default"])
+
+    # In question order, so that an unused answer (which Copier replaces by
+    # the default) does not decide whether a later question is asked.
+    kept = []
+    for name, spec in questions.items():
+        if name not in answers or not _active(spec, context, env):
+            continue
+        kept.append((name, answers[name]))
+        if answers[name] is not _DEFAULT:
+            context[name] = answers[name]
+    return kept
+
+
+def normalize(
+    combination: dict[str, Any],
+    questions: dict[str, dict[str, Any]],
+    env: Environment,
+) -> Assignment:
+    """
+    Drop the factor answers Copier would not use for *combination*, i.e. the
+    questions whose `when:` is false.
+    """
+    return tuple(_active_answers(combination, questions, env))
+
+
+def candidates(
+    factors: list[Factor], questions: dict[str, dict[str, Any]]
+) -> list[Assignment]:
+    """All distinct normalized combinations of the factor levels."""
+    total = 1
+    for _, levels in factors:
+        total *= len(levels)
+    if total > MAX_COMBINATIONS:
+        raise ValueError(
+            f"{total} combinations exceed {MAX_COMBINATIONS}; use fewer --factor."
+        )
+
+    env = Environment()
+    names = [name for name, _ in factors]
+    seen: dict[Assignment, None] = {}
+    for values in itertools.product(*(levels for _, levels in factors)):
+        seen.setdefault(normalize(dict(zip(names, values)), questions, env))
+    return list(seen)
+
+
+def _tuples(assignment: Assignment, strength: int) -> set:
+    return set(itertools.combinations(assignment, min(strength, len(assignment))))
+
+
+def covering_set(pool: list[Assignment], strength: int = 2) -> list[Assignment]:
+    """
+    Greedily pick assignments from *pool* until every *strength*-tuple of
+    factor values reachable in *pool* is covered.
+    """
+    uncovered = set().union(*(_tuples(a, strength) for a in pool)) if pool else set()
+    chosen: list[Assignment] = []
+    while uncovered:
+        best = max(pool, key=lambda a: len(_tuples(a, strength) & uncovered))
+        chosen.append(best)
+        uncovered -= _tuples(best, strength)
+    return chosen
+
+
+###############################################################################
+#  Output                                                                      #
+###############################################################################
+
+
+def write_examples(
+    chosen: list[Assignment],
+    *,
+    questions: dict[str, dict[str, Any]],
+    base_dir: Path,
+    out_dir: Path,
+    factor_names: list[str],
+    strength: int,
+) -> list[Path]:
+    """
+    Write one `package.yml`/`rule.yml` pair per assignment into *out_dir*.
+
+    The base example's answers fill the other questions, without the answers
+    of questions that are not asked for the assignment (e.g. `conda_env_key`
+    without `uses_conda`).
+    """
+    env = Environment()
+    yaml = YAML()
+    yaml.indent(mapping=2, sequence=4, offset=2)
+    loader = YAML(typ="safe")
+    package_answers = loader.load((base_dir / "package.yml").read_text()) or {}
+    base_rule = loader.load((base_dir / "rule.yml").read_text()) or {}
+    base_rule = {k: v for k, v in base_rule.items() if k not in factor_names}
+
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+
+    written = []
+    width = len(str(len(chosen)))
+    for i, assignment in enumerate(chosen, start=1):
+        example_dir = out_dir / f"matrix-t{strength}-{i:0{width}d}"
+        example_dir.mkdir(parents=True)
+        rule_answers = {
+            **base_rule,
+            **PINNED_ANSWERS,
+            **{name: value for name, value in assignment if value is not _DEFAULT},
+        }
+        if rule_answers.get("uses_package"):
+            rule_answers = {**FILLER_ANSWERS, **rule_answers}
+        active = dict(_active_answers(rule_answers, questions, env))
+        rule_answers = {
+            name: value
+            for name, value in rule_answers.items()
+            if name in active or name not in questions
+        }
+        for name, answers in (
+            ("package.yml", package_answers),
+            ("rule.yml", rule_answers),
+        ):
+            with (example_dir / name).open("w") as fp:
+                fp.write(
+                    "# Generated by scripts/generate_example_matrix.py; do not edit.\n"
+                )
+                yaml.dump(answers, fp)
+        written.append(example_dir)
+    return written
+
+
+###############################################################################
+#  CLI                                                                         #
+###############################################################################
+
+app = typer.Typer(add_completion=False)  # we do not need shell completion
+
+
+@app.command("generate")
+def generate_cmd(
+    strength: int = typer.Option(
+        2, min=1, help="Cover every combination of this many factors."
+    ),
+    factor: list[str] | None = typer.Option(
+        None, help="Only vary these questions (default: all bool/choice questions)."
+    ),
+    base: Path = typer.Option(
+        BASE_EXAMPLE_DIR, help="Example whose answers fill the other questions."
+    ),
+    out: Path = typer.Option(GENERATED_DIR, help="Directory to (re)write."),
+) -> None:
+    """
+    Write a t-wise covering set of example answer files.
+    """
+    questions = load_questions()
+    try:
+        factors = discover_factors(questions, factor)
+        pool = candidates(factors, questions)
+    except ValueError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(1) from exc
+
+    chosen = covering_set(pool, strength)
+    written = write_examples(
+        chosen,
+        questions=questions,
+        base_dir=base,
+        out_dir=out,
+        factor_names=[name for name, _ in factors],
+        strength=strength,
+    )
+    typer.echo(
+        f"{len(written)} examples cover all {strength}-wise combinations of "
+        f"{len(factors)} factors ({len(pool)} distinct combinations) in {out}"
+    )
+
+
+if __name__ == "__main__":
+    app()
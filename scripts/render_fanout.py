@@ -0,0 +1,126 @@
+"""
+Fan-out of one parent (package) render to many child (rule) renders.
+
+Rendering the rule template into a package project modifies that project,
+so every rule variant needs its own copy of it. Instead of re-running the
+package template for each variant, the template tests render it once per
+package answer set and clone the result with `clone_tree`:
+
+- on filesystems with reflinks (Btrfs, XFS, APFS, ...) every file is a
+  copy-on-write clone;
+- elsewhere every file is copied. The rule render, its format tasks and the
+  inner tox envs may rewrite any file in place, so files are never shared
+  with the parent render or between variants.
+
+`FanOutCopie` is a `Copie` whose `copy()` clones `parent_result` this way
+instead of copying it file by file.
+"""
+
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from copier import run_copy
+from pytest_copie.plugin import Copie, Result
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+# `FICLONE` from <linux/fs.h>.
+_FICLONE = 0x40049409
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Clone *src* to *dst* with the `FICLONE` ioctl; ``False`` if unsupported."""
+    if fcntl is None:
+        return False
+    with src.open("rb") as fsrc, dst.open("wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError as exc:
+            if exc.errno in (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY):
+                return False
+            raise
+    shutil.copystat(src, dst)
+    return True
+
+
+def clone_tree(src: Path, dst: Path) -> Counter[str]:
+    """
+    Clone the directory *src* to the new directory *dst*; *src* is only read.
+
+    Returns how many files were ``reflinked`` and ``copied``.
+    """
+    counts: Counter[str] = Counter()
+    reflinks = fcntl is not None
+    for dirpath, dirnames, filenames in os.walk(src):
+        source_dir = Path(dirpath)
+        target_dir = dst / source_dir.relative_to(src)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copymode(source_dir, target_dir)
+        for name in [
+            *filenames,
+            *(d for d in dirnames if (source_dir / d).is_symlink()),
+        ]:
+            source, target = source_dir / name, target_dir / name
+            if source.is_symlink():
+                os.symlink(os.readlink(source), target)
+                counts["copied"] += 1
+                continue
+            if reflinks:
+                if _reflink(source, target):
+                    counts["reflinked"] += 1
+                    continue
+                # Same filesystem for every file, so stop trying.
+                reflinks = False
+                target.unlink()
+            shutil.copy2(source, target)
+            counts["copied"] += 1
+        dirnames[:] = [d for d in dirnames if not (source_dir / d).is_symlink()]
+    return counts
+
+
+@dataclass
+class FanOutCopie(Copie):
+    """A `Copie` that clones `parent_result` with `clone_tree`."""
+
+    def copy(
+        self,
+        extra_answers: dict | None = None,
+        template_dir: Path | None = None,
+        vcs_ref: str = "HEAD",
+    ) -> Result:
+        parent = self.parent_result
+        if parent is None or parent.project_dir is None or parent.exit_code != 0:
+            return super().copy(extra_answers or {}, template_dir, vcs_ref)
+
+        template_dir = template_dir or self.default_template_dir
+        output_dir = self.test_dir / f"copie{self.counter:03d}"
+        self.counter += 1
+        clone_tree(parent.project_dir, output_dir)
+        try:
+            worker = run_copy(
+                src_path=str(template_dir),
+                dst_path=str(output_dir),
+                unsafe=True,
+                defaults=True,
+                user_defaults=extra_answers or {},
+                vcs_ref=vcs_ref or "HEAD",
+            )
+            answers: dict[str, Any] = worker._answers_to_remember()
+            return Result(
+                project_dir=Path(worker.dst_path),
+                answers={q: a for q, a in answers.items() if not q.startswith("_")},
+            )
+        except SystemExit as exc:
+            return Result(exception=exc, exit_code=exc.code)
+        except Exception as exc:  # noqa: BLE001  (reported like Copie.copy)
+            return Result(exception=exc, exit_code=-1)
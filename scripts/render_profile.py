@@ -0,0 +1,107 @@
+"""
+cProfile hook for template renders.
+
+`profiled(out_dir, name)` wraps a render in `cProfile` and writes
+
+- `<out_dir>/<name>.pstats`, for `python -m pstats` or snakeviz;
+- `<out_dir>/<name>.collapsed`, one ``frame;frame;frame <microseconds>``
+  line per stack, for flamegraph tools (`flamegraph.pl`, speedscope,
+  inferno).
+
+cProfile only records caller → callee edges, so the stacks are rebuilt by
+walking the call graph from its roots and splitting each function's time
+between its callers in proportion to the time spent under each of them.
+Stacks below `MIN_FRACTION` of the total are dropped to keep the file small.
+
+Used by `run_copie_with_output_control` (pytest `--profile-render DIR`) and
+`scripts/sandbox_examples_generate.py --profile-render DIR`.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+MIN_FRACTION = 0.0005
+MAX_DEPTH = 256
+
+Func = tuple[str, int, str]
+
+
+def frame_label(func: Func) -> str:
+    """Return a flamegraph frame name such as ``_main.py:922(_render_file)``."""
+    filename, lineno, name = func
+    if filename == "~":  # builtins
+        label = name
+    else:
+        label = f"{Path(filename).name}:{lineno}({name})"
+    return re.sub(r"[;\s]+", "_", label)
+
+
+def collapsed_stacks(
+    stats: pstats.Stats, *, min_fraction: float = MIN_FRACTION
+) -> dict[str, int]:
+    """Rebuild approximate stacks (frame names → microseconds) from *stats*."""
+    raw = stats.stats  # type: ignore[attr-defined]
+    callees: dict[Func, dict[Func, tuple]] = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[func] = edge
+
+    roots = [func for func, entry in raw.items() if not entry[4]]
+    total = sum(raw[func][3] for func in roots) or stats.total_tt  # type: ignore[attr-defined]
+    threshold = total * min_fraction
+    stacks: dict[str, int] = {}
+
+    def walk(func: Func, path: tuple[Func, ...], cumulative: float) -> None:
+        _, _, self_time, func_cumulative, _ = raw[func]
+        share = cumulative / func_cumulative if func_cumulative else 0.0
+        path = (*path, func)
+        own = self_time * share
+        if own >= threshold:
+            key = ";".join(frame_label(f) for f in path)
+            stacks[key] = stacks.get(key, 0) + round(own * 1e6)
+        if len(path) >= MAX_DEPTH:
+            return
+        for callee, edge in callees.get(func, {}).items():
+            if callee in path:  # recursion: already accounted for above
+                continue
+            child = edge[3] * share
+            if child >= threshold:
+                walk(callee, path, child)
+
+    for root in roots:
+        walk(root, (), raw[root][3])
+    return stacks
+
+
+def write_profile(profile: cProfile.Profile, out_dir: Path, name: str) -> Path:
+    """Write *profile* as `<name>.pstats` and `<name>.collapsed`."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pstats_path = out_dir / f"{name}.pstats"
+    profile.dump_stats(pstats_path)
+    stacks = collapsed_stacks(pstats.Stats(profile))
+    with (out_dir / f"{name}.collapsed").open("w") as fp:
+        for stack, micros in sorted(stacks.items()):
+            if micros:
+                fp.write(f"{stack} {micros}\n")
+    return pstats_path
+
+
+@contextmanager
+def profiled(out_dir: Path | None, name: str) -> Iterator[None]:
+    """Profile the block into *out_dir*; a no-op when *out_dir* is ``None``."""
+    if out_dir is None:
+        yield
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        write_profile(profile, out_dir, name)
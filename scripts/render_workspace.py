@@ -0,0 +1,264 @@
+"""
+Managed workspace for rendered example projects.
+
+The template tests and `scripts/sandbox_examples_generate.py` render every
+example into a fresh directory holding the package and rule projects, the
+inner `.tox` envs and Copier's config and replay dirs. Instead of leaking
+`tempfile.mkdtemp` directories, they acquire them from a `RenderWorkspace`:
+
+- every render directory is listed in `index.json` under the workspace root
+  with its owner process, last use and size;
+- released directories stay around for debugging until the workspace
+  exceeds its quota, then the least recently used ones are evicted: first
+  their `.tox` envs, then the whole render. The quota is enforced whenever a
+  directory is acquired or released, counting the current size of the
+  directories still in use, so a long session makes room as it grows;
+- directories owned by a running process or marked *kept* are never evicted;
+  `purge()` removes everything not owned by a running process.
+
+The root defaults to `<tmp>/able-rule-renders` and the quota to 10 GiB; set
+`RENDER_WORKSPACE_DIR` and `RENDER_WORKSPACE_QUOTA` (e.g. `2G`) to change
+them on shared runners.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+DEFAULT_ROOT = Path(tempfile.gettempdir()) / "able-rule-renders"
+DEFAULT_QUOTA = "10G"
+INDEX_FILE = "index.json"
+LOCK_FILE = ".lock"
+
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_size(value: str | int) -> int:
+    """Parse a byte count such as ``"500M"``, ``"2G"`` or ``1024``."""
+    if isinstance(value, int):
+        return value
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)I?B?\s*", value.upper())
+    if match is None:
+        raise ValueError(f"Expected a size like '500M' or '2G', got {value!r}.")
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
+
+
+def tree_size(path: Path) -> int:
+    """Return the apparent size in bytes of the files below *path*."""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+    return total
+
+
+def tox_dirs(path: Path) -> list[Path]:
+    """Return the `.tox` directories below *path* (not descending into them)."""
+    found = []
+    for dirpath, dirnames, _ in os.walk(path):
+        if ".tox" in dirnames:
+            found.append(Path(dirpath) / ".tox")
+        dirnames[:] = [d for d in dirnames if d not in (".tox", ".git")]
+    return found
+
+
+def _pid_alive(pid: int | None) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class RenderWorkspace:
+    """Owner of the render directories below *root*."""
+
+    def __init__(
+        self,
+        root: Path | None = None,
+        *,
+        quota: str | int | None = None,
+        keep: bool = False,
+    ) -> None:
+        self.root = Path(root or os.environ.get("RENDER_WORKSPACE_DIR", DEFAULT_ROOT))
+        self.quota = parse_size(
+            quota
+            if quota is not None
+            else os.environ.get("RENDER_WORKSPACE_QUOTA", DEFAULT_QUOTA)
+        )
+        self.keep = keep
+        self._owned: set[str] = set()
+
+    # --- index --------------------------------------------------------------
+    @contextmanager
+    def _locked_index(self) -> Iterator[dict[str, dict[str, Any]]]:
+        """Yield the index for modification, holding the workspace lock."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with (self.root / LOCK_FILE).open("a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            index = self._read_index()
+            yield index
+            self._write_index(index)
+
+    def _read_index(self) -> dict[str, dict[str, Any]]:
+        try:
+            data = json.loads((self.root / INDEX_FILE).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write_index(self, index: dict[str, dict[str, Any]]) -> None:
+        path = self.root / INDEX_FILE
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=f".{INDEX_FILE}.")
+        try:
+            with os.fdopen(fd, "w") as fp:
+                json.dump(index, fp, indent=2, sort_keys=True)
+                fp.write("\n")
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def entries(self) -> dict[str, dict[str, Any]]:
+        """Return a snapshot of the index (directory name -> metadata)."""
+        return self._read_index()
+
+    # --- lifecycle ----------------------------------------------------------
+    def acquire(self, prefix: str) -> Path:
+        """
+        Create and own a new render directory named after *prefix*, after
+        evicting old renders if the workspace exceeds its quota.
+        """
+        self.enforce_quota()
+        name = f"{prefix}-{uuid.uuid4().hex[:8]}"
+        path = self.root / name
+        with self._locked_index() as index:
+            path.mkdir()
+            index[name] = {
+                "owner": os.getpid(),
+                "kept": False,
+                "created": time.time(),
+                "last_used": time.time(),
+                "size": 0,
+            }
+        self._owned.add(name)
+        return path
+
+    def touch(self, path: Path) -> None:
+        """Mark *path* as recently used."""
+        with self._locked_index() as index:
+            if path.name in index:
+                index[path.name]["last_used"] = time.time()
+
+    def release(self, path: Path | None = None) -> None:
+        """
+        Give up ownership of *path* (default: every directory acquired by
+        this workspace), record its size and enforce the quota.
+
+        With ``keep=True`` the directories are marked as kept instead, so the
+        quota never evicts them.
+        """
+        names = {path.name} if path is not None else set(self._owned)
+        with self._locked_index() as index:
+            for name in names & index.keys():
+                index[name].update(
+                    owner=None,
+                    kept=self.keep,
+                    last_used=time.time(),
+                    size=tree_size(self.root / name),
+                )
+        self._owned -= names
+        self.enforce_quota()
+
+    def discard(self, path: Path) -> None:
+        """Remove *path* right away, e.g. after a failed render."""
+        with self._locked_index() as index:
+            index.pop(path.name, None)
+            shutil.rmtree(path, ignore_errors=True)
+        self._owned.discard(path.name)
+
+    # --- cleanup ------------------------------------------------------------
+    def _evictable(self, meta: dict[str, Any]) -> bool:
+        return not meta.get("kept") and not _pid_alive(meta.get("owner"))
+
+    def enforce_quota(self) -> list[Path]:
+        """
+        Evict least recently used renders until the workspace fits its quota.
+
+        The directories this workspace still owns are measured first: they
+        cannot be evicted, but they take up the space.
+
+        Returns the paths that were trimmed or removed.
+        """
+        evicted: list[Path] = []
+        with self._locked_index() as index:
+            for name in [n for n in index if not (self.root / n).exists()]:
+                del index[name]
+            for name in self._owned & index.keys():
+                index[name]["size"] = tree_size(self.root / name)
+            used = sum(meta.get("size", 0) for meta in index.values())
+            if used <= self.quota:
+                return evicted
+
+            lru = sorted(
+                (name for name, meta in index.items() if self._evictable(meta)),
+                key=lambda name: index[name].get("last_used", 0),
+            )
+            # Dropping the inner tox envs frees most space and keeps the
+            # rendered sources around for inspection.
+            for name in lru:
+                if used <= self.quota:
+                    break
+                for tox_dir in tox_dirs(self.root / name):
+                    shutil.rmtree(tox_dir, ignore_errors=True)
+                    evicted.append(tox_dir)
+                size = tree_size(self.root / name)
+                used -= index[name].get("size", 0) - size
+                index[name]["size"] = size
+            for name in lru:
+                if used <= self.quota:
+                    break
+                shutil.rmtree(self.root / name, ignore_errors=True)
+                used -= index.pop(name).get("size", 0)
+                evicted.append(self.root / name)
+        return evicted
+
+    def purge(self) -> list[Path]:
+        """Remove every render not owned by a running process, kept or not."""
+        removed: list[Path] = []
+        with self._locked_index() as index:
+            for name, meta in list(index.items()):
+                if _pid_alive(meta.get("owner")):
+                    continue
+                shutil.rmtree(self.root / name, ignore_errors=True)
+                del index[name]
+                removed.append(self.root / name)
+        return removed
@@ -0,0 +1,257 @@
+"""
+Python API for generating rules.
+
+`generate_rule(project_dir, answers)` runs the rule template into an
+existing package project with Copier's public `run_copy`, exactly as
+`copier copy` would (same answers, same `_tasks`), and then reads what
+happened from the project:
+
+- the files written, by diffing the project tree before and after;
+- the template files kept by `_skip_if_exists`;
+- the recorded answers, from the rule's answers file;
+- the `_external_data` files the render could read.
+
+It returns a `RuleResult`, so tooling that generates many rules does not
+have to parse Copier's output. A failing task raises `RuleGenerationError`
+carrying the partial result.
+
+Example
+-------
+
+    from scripts.rule_api import generate_rule
+
+    result = generate_rule("path/to/project", {"rule_name": "clean_data"})
+    print(result.written, result.answers)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import asdict, dataclass, field
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any
+
+from copier import run_copy
+from copier.errors import TaskError
+from jinja2 import Environment
+from ruamel.yaml import YAML
+
+from scripts.sandbox_watch import changed_paths, snapshot
+
+PROJECT_ROOT: Path = Path(__file__).resolve().parents[1]
+
+# Directories of a project never written by a rule render.
+SKIP_DIRS: tuple[str, ...] = (
+    ".git",
+    ".tox",
+    ".snakemake",
+    ".venv",
+    "__pycache__",
+    ".ruff_cache",
+    ".mypy_cache",
+    ".pytest_cache",
+)
+
+# Copier's answers file when the template does not set `_answers_file`.
+DEFAULT_ANSWERS_FILE = ".copier-answers.yml"
+
+###############################################################################
+#  Results                                                                     #
+###############################################################################
+
+
+@dataclass
+class RuleResult:
+    """Result of `generate_rule`."""
+
+    project_dir: Path
+    # Files created or modified in the project, by the render or the tasks.
+    written: list[str] = field(default_factory=list)
+    # Existing files the template did not overwrite (`_skip_if_exists`).
+    skipped: list[str] = field(default_factory=list)
+    # Answers recorded in the rule's answers file, without `_` entries.
+    answers: dict[str, Any] = field(default_factory=dict)
+    # `_external_data` entries -> file, relative to the project; None when
+    # the file does not exist.
+    external_data: dict[str, str | None] = field(default_factory=dict)
+    # Seconds spent in `copy` (render and tasks) and `total`.
+    phases: dict[str, float] = field(default_factory=dict)
+    # Why the render failed, if it did.
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form of the result."""
+        data = asdict(self)
+        data["project_dir"] = str(self.project_dir)
+        data["ok"] = self.ok
+        return data
+
+
+class RuleGenerationError(RuntimeError):
+    """The render failed; `result` holds everything done up to the failure."""
+
+    def __init__(self, message: str, result: RuleResult) -> None:
+        super().__init__(message)
+        self.result = result
+
+
+###############################################################################
+#  Template                                                                    #
+###############################################################################
+
+
+@dataclass(frozen=True)
+class RuleTemplate:
+    """The rule template repository *src* at the git ref *ref*."""
+
+    src: Path = PROJECT_ROOT
+    ref: str | None = "HEAD"
+
+    def config(self) -> dict[str, Any]:
+        """The parsed `copier.yml` of the template."""
+        return YAML(typ="safe").load((self.src / "copier.yml").read_text()) or {}
+
+
+def _context(config: dict[str, Any], answers: dict[str, Any]) -> dict[str, Any]:
+    """*answers* over the question defaults that are not templates."""
+    context = {
+        name: spec["default"]
+        for name, spec in config.items()
+        if isinstance(spec, dict)
+        and "default" in spec
+        and not (isinstance(spec["default"], str) and "{" in spec["default"])
+    }
+    return {**context, **answers}
+
+
+def _render(text: str, context: dict[str, Any]) -> str:
+    return Environment().from_string(text).render(**context).strip()
+
+
+@contextlib.contextmanager
+def _timed(phases: dict[str, float], name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = round(time.perf_counter() - start, 4)
+
+
+###############################################################################
+#  API                                                                         #
+###############################################################################
+
+
+def generate_rule(
+    project_dir: Path | str,
+    answers: dict[str, Any],
+    *,
+    format: bool | None = None,
+    tasks: bool = True,
+    overwrite: bool = False,
+    template: RuleTemplate | None = None,
+    require_external_data: Sequence[str] = (),
+) -> RuleResult:
+    """
+    Generate a rule into the package project *project_dir*.
+
+    Parameters
+    ----------
+    project_dir
+        Existing project rendered from the package template.
+    answers
+        Answers to the rule template questions; unanswered questions take
+        their defaults.
+    format
+        Answer for `format_code` (run black, ruff and snakefmt); ``None``
+        keeps the answer from *answers* or the template default.
+    tasks
+        Run the template `_tasks` (smk include, rules index, formatters).
+    overwrite
+        Overwrite conflicting files instead of failing.
+    template
+        Template to render; defaults to this repository at ``HEAD``.
+    require_external_data
+        `_external_data` names (e.g. ``parent_project_tpl``) whose file must
+        exist in the project; a missing one fails before anything is written.
+
+    Raises
+    ------
+    RuleGenerationError
+        A task failed or a required `_external_data` file is missing. Its
+        `result` holds the partial result.
+    """
+    project_dir = Path(project_dir).resolve()
+    template = template or RuleTemplate()
+    data = dict(answers)
+    if format is not None:
+        data["format_code"] = format
+
+    config = template.config()
+    context = _context(config, data)
+    result = RuleResult(project_dir)
+    for name, path in (config.get("_external_data") or {}).items():
+        rel = _render(str(path), context)
+        result.external_data[name] = rel if (project_dir / rel).is_file() else None
+    missing = [
+        name for name in require_external_data if not result.external_data.get(name)
+    ]
+    if missing:
+        result.error = f"_external_data {missing[0]!r} not found in {project_dir}"
+        raise RuleGenerationError(result.error, result)
+
+    start = time.perf_counter()
+    before = snapshot([project_dir], skip_dirs=SKIP_DIRS)
+    try:
+        with _timed(result.phases, "copy"):
+            run_copy(
+                src_path=str(template.src),
+                dst_path=project_dir,
+                data=data,
+                vcs_ref=template.ref,
+                defaults=True,
+                overwrite=overwrite,
+                quiet=True,
+                unsafe=True,
+                skip_tasks=not tasks,
+            )
+    except TaskError as exc:
+        result.error = str(exc)
+        raise RuleGenerationError(result.error, result) from exc
+    finally:
+        after = snapshot([project_dir], skip_dirs=SKIP_DIRS)
+        changed = {str(path) for path in changed_paths(before, after)}
+        result.written = sorted(
+            Path(path).relative_to(project_dir).as_posix()
+            for path in changed
+            if path in after
+        )
+        skip_globs = [
+            _render(str(g), context) for g in config.get("_skip_if_exists", [])
+        ]
+        result.skipped = sorted(
+            Path(path).relative_to(project_dir).as_posix()
+            for path in before
+            if path not in changed
+            and any(
+                fnmatch(Path(path).relative_to(project_dir).as_posix(), pattern)
+                for pattern in skip_globs
+            )
+        )
+        answers_file = project_dir / _render(
+            str(config.get("_answers_file", DEFAULT_ANSWERS_FILE)), context
+        )
+        if answers_file.is_file():
+            recorded = YAML(typ="safe").load(answers_file.read_text()) or {}
+            result.answers = {
+                k: v for k, v in recorded.items() if not k.startswith("_")
+            }
+        result.phases["total"] = round(time.perf_counter() - start, 4)
+    return result
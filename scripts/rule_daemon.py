@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Long-lived rule generation daemon.
+
+Every `copier copy` of the rule template starts Python and imports
+copier/Jinja/ruamel before it renders anything. The daemon keeps one process
+with those imports alive and renders with `scripts/rule_api.py`, so each
+request only pays for the render itself. Only `serve` imports Copier; the
+`generate` and `stop` clients use the standard library, typer and ruamel
+alone, so they start quickly.
+
+Clients talk to it over a UNIX socket with one JSON object per line. A
+``generate`` request returns the `RuleResult` of the render (files written
+and skipped, recorded answers, timings); requests are handled one at a
+time, so concurrent clients never interleave renders.
+
+Usage
+-----
+
+    # Start the daemon (foreground; Ctrl-C or `stop` to quit)
+    python -m scripts.rule_daemon serve
+
+    # Generate a rule into a project from an answers file
+    python -m scripts.rule_daemon generate path/to/project rule.yml
+
+    python -m scripts.rule_daemon stop
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import typer
+from ruamel.yaml import YAML
+
+if TYPE_CHECKING:
+    from scripts.rule_api import RuleTemplate
+
+DEFAULT_SOCKET: Path = (
+    Path(tempfile.gettempdir()) / f"able-rule-daemon-{os.getuid()}.sock"
+)
+
+###############################################################################
+#  Server                                                                      #
+###############################################################################
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: RuleDaemon
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                response = self.server.dispatch(request)
+            except Exception as exc:  # noqa: BLE001  (reported to the client)
+                response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class RuleDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """UNIX socket server that generates rules from a `RuleTemplate`."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, template: RuleTemplate) -> None:
+        self.socket_path = socket_path
+        self.template = template
+        self.started = time.time()
+        self.served = 0
+        self._lock = threading.Lock()
+        socket_path.unlink(missing_ok=True)
+        super().__init__(str(socket_path), _Handler)
+        socket_path.chmod(0o600)
+
+    def dispatch(self, request: dict[str, Any]) -> dict[str, Any]:
+        from scripts.rule_api import RuleGenerationError, generate_rule
+
+        op = request.get("op")
+        if op == "ping":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "uptime_s": round(time.time() - self.started, 1),
+                "served": self.served,
+            }
+        if op == "stop":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        if op == "generate":
+            project_dir = Path(request["project_dir"]).resolve()
+            if not project_dir.is_dir():
+                return {"ok": False, "error": f"Not a directory: {project_dir}"}
+            output = io.StringIO()
+            with self._lock, contextlib.redirect_stdout(output):
+                self.served += 1
+                try:
+                    result = generate_rule(
+                        project_dir,
+                        dict(request.get("answers") or {}),
+                        overwrite=bool(request.get("overwrite", False)),
+                        template=self.template,
+                    )
+                except RuleGenerationError as exc:
+                    return {**exc.result.to_dict(), "error": str(exc)}
+            return result.to_dict()
+        return {"ok": False, "error": f"Unknown op: {op!r}"}
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+###############################################################################
+#  Client                                                                      #
+###############################################################################
+
+
+def request(
+    payload: dict[str, Any], socket_path: Path = DEFAULT_SOCKET, timeout: float = 600
+) -> dict[str, Any]:
+    """Send one request to the daemon and return its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        with sock.makefile("rb") as fp:
+            line = fp.readline()
+    if not line:
+        raise ConnectionError("The rule daemon closed the connection.")
+    return json.loads(line)
+
+
+###############################################################################
+#  CLI                                                                         #
+###############################################################################
+
+app = typer.Typer(add_completion=False)  # we do not need shell completion
+
+_SOCKET_OPTION = typer.Option(DEFAULT_SOCKET, "--socket", help="UNIX socket path.")
+
+
+@app.command("serve")
+def serve_cmd(
+    socket_path: Path = _SOCKET_OPTION,
+    vcs_ref: str = typer.Option("HEAD", help="Template ref to render."),
+) -> None:
+    """
+    Run the daemon in the foreground.
+    """
+    # Copier and Jinja are only imported here, not by the clients.
+    from scripts.rule_api import RuleTemplate
+
+    with RuleDaemon(socket_path, RuleTemplate(ref=vcs_ref)) as server:
+        typer.echo(f"Rule daemon listening on {socket_path} (pid {os.getpid()})")
+        with contextlib.suppress(KeyboardInterrupt):
+            server.serve_forever()
+    typer.echo("Rule daemon stopped.")
+
+
+@app.command("generate")
+def generate_cmd(
+    project_dir: Path = typer.Argument(..., help="Project to add the rule to."),
+    answers_file: Path = typer.Argument(..., help="YAML file with the rule answers."),
+    overwrite: bool = typer.Option(False, help="Overwrite conflicting files."),
+    socket_path: Path = _SOCKET_OPTION,
+) -> None:
+    """
+    Ask the daemon to generate a rule and print the written files.
+    """
+    answers = YAML(typ="safe").load(answers_file.read_text()) or {}
+    try:
+        response = request(
+            {
+                "op": "generate",
+                "project_dir": str(project_dir.resolve()),
+                "answers": answers,
+                "overwrite": overwrite,
+            },
+            socket_path,
+        )
+    except (FileNotFoundError, ConnectionError) as exc:
+        typer.echo(f"Rule daemon not reachable on {socket_path}: {exc}", err=True)
+        raise typer.Exit(1) from exc
+    if not response.get("ok"):
+        typer.echo(response.get("error", "unknown error"), err=True)
+        raise typer.Exit(1)
+    for rel in response["written"]:
+        typer.echo(rel)
+    typer.echo(
+        f"{len(response['written'])} file(s) in {response['phases']['total']}s",
+        err=True,
+    )
+
+
+@app.command("stop")
+def stop_cmd(socket_path: Path = _SOCKET_OPTION) -> None:
+    """
+    Stop a running daemon.
+    """
+    try:
+        request({"op": "stop"}, socket_path, timeout=10)
+    except (FileNotFoundError, ConnectionError) as exc:
+        typer.echo(f"Rule daemon not reachable on {socket_path}: {exc}", err=True)
+        raise typer.Exit(1) from exc
+
+
+if __name__ == "__main__":
+    app()
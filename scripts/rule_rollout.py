@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Apply one rule to many downstream projects in parallel.
+
+Rolling a shared rule (data QA, logging, docs builds, ...) out to every
+workflow repository generated from able-workflow-copier used to mean one
+`copier copy` per repository, run one after the other. This command takes a
+list of project directories and one rule answers file and renders the rule
+into each project with `scripts.rule_api.generate_rule`:
+
+- each project's `_external_data` (its parent answers in
+  `.copier-answers/`) is resolved in that project; a project without the
+  required parent answers fails before anything is written to it;
+- renders and their format tasks run in a pool of worker processes;
+- the output of the format tasks and other subprocesses is captured per
+  project (at the file descriptor level, so child processes are included)
+  instead of interleaving on the terminal;
+- a failure in one project never stops the others. The command prints one
+  line per project and can write a JSON report with each project's output.
+
+Usage
+-----
+
+    python -m scripts.rule_rollout rule.yml ../etl-a ../etl-b --jobs 4
+
+    # Projects listed in a file, one per line (`#` starts a comment)
+    python -m scripts.rule_rollout rule.yml --projects-file fleet.txt \\
+        --report rollout.json
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import typer
+from ruamel.yaml import YAML
+
+from scripts.rule_api import (
+    PROJECT_ROOT,
+    RuleGenerationError,
+    RuleTemplate,
+    generate_rule,
+)
+
+# `_external_data` of the rule template that must exist in every project.
+REQUIRED_EXTERNAL_DATA: tuple[str, ...] = ("parent_project_tpl",)
+
+###############################################################################
+#  Results                                                                     #
+###############################################################################
+
+
+@dataclass
+class ProjectOutcome:
+    """What the rollout did to one project."""
+
+    project_dir: str
+    ok: bool
+    seconds: float = 0.0
+    written: list[str] = field(default_factory=list)
+    error: str | None = None
+    # `RuleResult.to_dict()`, when the render got that far.
+    result: dict[str, Any] | None = None
+    # Everything the render and its tasks wrote to stdout and stderr.
+    output: str = ""
+
+    @property
+    def status(self) -> str:
+        return "ok" if self.ok else "FAILED"
+
+
+###############################################################################
+#  Workers                                                                     #
+###############################################################################
+
+
+@contextlib.contextmanager
+def captured_output() -> Iterator[list[str]]:
+    """
+    Send stdout and stderr of this process and its children to a temporary
+    file; the yielded list holds the captured text once the block exits.
+    """
+    captured: list[str] = []
+    with tempfile.TemporaryFile(mode="w+b") as tmp:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved = [os.dup(1), os.dup(2)]
+        try:
+            os.dup2(tmp.fileno(), 1)
+            os.dup2(tmp.fileno(), 2)
+            yield captured
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved[0], 1)
+            os.dup2(saved[1], 2)
+            for fd in saved:
+                os.close(fd)
+            tmp.seek(0)
+            captured.append(tmp.read().decode(errors="replace"))
+
+
+def apply_rule(
+    project_dir: Path | str,
+    answers: dict[str, Any],
+    *,
+    format: bool | None = None,
+    overwrite: bool = False,
+    template: RuleTemplate | None = None,
+    require_external_data: Sequence[str] = REQUIRED_EXTERNAL_DATA,
+) -> ProjectOutcome:
+    """Render the rule into one project; never raises for a project error."""
+    project_dir = Path(project_dir).resolve()
+    outcome = ProjectOutcome(str(project_dir), ok=False)
+    output: list[str] = []
+    start = time.perf_counter()
+    try:
+        if not project_dir.is_dir():
+            outcome.error = "not a directory"
+            return outcome
+        # Task output (formatters, subprocesses) would interleave across
+        # workers; the outcome keeps it per project.
+        with captured_output() as output:
+            result = generate_rule(
+                project_dir,
+                answers,
+                format=format,
+                overwrite=overwrite,
+                template=template,
+                require_external_data=require_external_data,
+            )
+        outcome.ok, outcome.written = result.ok, result.written
+        outcome.result = result.to_dict()
+    except RuleGenerationError as exc:
+        outcome.error = str(exc)
+        outcome.written = exc.result.written
+        outcome.result = exc.result.to_dict()
+    except Exception as exc:  # noqa: BLE001  (reported per project)
+        outcome.error = f"{type(exc).__name__}: {exc}"
+    finally:
+        outcome.output = "".join(output)
+        outcome.seconds = round(time.perf_counter() - start, 3)
+    return outcome
+
+
+def rollout(
+    projects: Iterable[Path | str],
+    answers: dict[str, Any],
+    *,
+    jobs: int | None = None,
+    format: bool | None = None,
+    overwrite: bool = False,
+    src: Path = PROJECT_ROOT,
+    ref: str | None = "HEAD",
+    require_external_data: Sequence[str] = REQUIRED_EXTERNAL_DATA,
+) -> list[ProjectOutcome]:
+    """
+    Render the rule with *answers* into every project of *projects*.
+
+    Duplicate projects are rendered once. With ``jobs=1`` the renders run in
+    this process; otherwise in up to *jobs* worker processes (default: one
+    per CPU). Outcomes are returned in the order of *projects*.
+    """
+    unique = list(dict.fromkeys(str(Path(p).resolve()) for p in projects))
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(unique) or 1))
+    options: dict[str, Any] = {
+        "format": format,
+        "overwrite": overwrite,
+        "template": RuleTemplate(Path(src), ref),
+        "require_external_data": tuple(require_external_data),
+    }
+    if jobs == 1:
+        return [apply_rule(p, answers, **options) for p in unique]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(apply_rule, p, answers, **options) for p in unique]
+        return [future.result() for future in futures]
+
+
+def read_projects_file(path: Path) -> list[Path]:
+    """Read project directories, one per line; relative to the file."""
+    projects = []
+    for line in path.read_text().splitlines():
+        entry = line.split("#", 1)[0].strip()
+        if entry:
+            projects.append((path.parent / entry).resolve())
+    return projects
+
+
+###############################################################################
+#  CLI                                                                         #
+###############################################################################
+
+app = typer.Typer(add_completion=False)  # we do not need shell completion
+
+
+@app.command()
+def main(
+    answers_file: Path = typer.Argument(..., help="YAML file with the rule answers."),
+    projects: list[Path] = typer.Argument(None, help="Project directories."),
+    projects_file: Path | None = typer.Option(
+        None, help="File listing project directories, one per line."
+    ),
+    jobs: int = typer.Option(0, "--jobs", "-j", help="Worker processes (0: #CPUs)."),
+    format: bool | None = typer.Option(
+        None, "--format/--no-format", help="Override the `format_code` answer."
+    ),
+    overwrite: bool = typer.Option(False, help="Overwrite conflicting files."),
+    template: Path = typer.Option(PROJECT_ROOT, help="Rule template repository."),
+    vcs_ref: str = typer.Option("HEAD", help="Template ref to render."),
+    require_data: list[str] = typer.Option(
+        list(REQUIRED_EXTERNAL_DATA),
+        help="`_external_data` entries every project must have.",
+    ),
+    report: Path | None = typer.Option(None, help="Write a JSON report here."),
+) -> None:
+    """
+    Render one rule into many projects in parallel and summarize the results.
+    """
+    answers = YAML(typ="safe").load(answers_file.read_text()) or {}
+    targets = list(projects or [])
+    if projects_file is not None:
+        targets += read_projects_file(projects_file)
+    if not targets:
+        typer.echo("No projects given.", err=True)
+        raise typer.Exit(2)
+
+    start = time.perf_counter()
+    outcomes = rollout(
+        targets,
+        answers,
+        jobs=jobs or None,
+        format=format,
+        overwrite=overwrite,
+        src=template,
+        ref=vcs_ref,
+        require_external_data=require_data,
+    )
+    elapsed = time.perf_counter() - start
+
+    for outcome in outcomes:
+        line = (
+            f"{outcome.status:<6} {outcome.project_dir}  "
+            f"{len(outcome.written)} file(s) in {outcome.seconds:.1f}s"
+        )
+        typer.echo(line + (f"  {outcome.error}" if outcome.error else ""))
+    failed = [outcome for outcome in outcomes if not outcome.ok]
+    typer.echo(
+        f"{len(outcomes) - len(failed)}/{len(outcomes)} project(s) updated "
+        f"in {elapsed:.1f}s",
+        err=True,
+    )
+    if report is not None:
+        report.write_text(
+            json.dumps([asdict(outcome) for outcome in outcomes], indent=2) + "\n"
+        )
+    if failed:
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    app()
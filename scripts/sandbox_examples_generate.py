@@ -19,21 +19,32 @@ Usage
 -----
 
     # All examples
-    python -m scripts.sandbox_examples_generate
+    python -m scripts.sandbox_examples_generate generate
 
     # Only specific examples
-    python -m scripts.sandbox_examples_generate example-answers-able
+    python -m scripts.sandbox_examples_generate generate example-answers-able
+
+    # Keep Copier's config/replay dirs, after removing those of earlier runs
+    python -m scripts.sandbox_examples_generate generate --purge --keep
+
+    # Write cProfile stats and collapsed stacks of each render to profiles/
+    python -m scripts.sandbox_examples_generate generate --profile-render profiles
+
+    # Render, then re-render (rule template only) and patch the sandbox on
+    # every save
+    python -m scripts.sandbox_examples_generate watch
 """
 
 from __future__ import annotations
 
 import shutil
-import tempfile
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, cast
 
 import typer
+from pytest_copie.plugin import Result
 from ruamel.yaml import YAML
 
 from scripts.copie_helpers import (
@@ -41,6 +52,19 @@ from scripts.copie_helpers import (
     make_copier_config,
     new_copie,
 )
+from scripts.render_fanout import clone_tree
+from scripts.render_profile import profiled
+from scripts.render_workspace import RenderWorkspace
+from scripts.rule_api import RuleTemplate, generate_rule
+from scripts.sandbox_watch import (
+    patch_tree,
+    plan_rerender,
+    snapshot,
+    sync_template,
+    tree_manifest,
+    wait_for_changes,
+)
+from scripts.tox_result_cache import TEMPLATE_SOURCES
 
 PROJECT_ROOT: Path = Path(__file__).resolve().parents[1]
 ensure_package_repo_path = PROJECT_ROOT / "scripts" / "pull_able_workflow_copier.py"
@@ -97,22 +121,278 @@ EXAMPLES: List[Example] = [
     )
 ]
 
+###############################################################################
+#  Rendering                                                                   #
+###############################################################################
+
+
+@dataclass
+class _Render:
+    """A rendered sandbox example and what `watch` needs to update it."""
+
+    package: Result  # parent for rule re-renders
+    project_dir: Path  # the sandbox rule project
+    manifest: dict[str, str]  # rendered files → sha256, SEE: sandbox_watch
+
+
+def _render_example(
+    ex: Example,
+    workspace: RenderWorkspace,
+    template_package_dir: Path,
+    profile_render: Path | None = None,
+) -> _Render | None:
+    """Render *ex* from scratch into `sandbox/example-<name>/`."""
+    ex_dir = SANDBOX_ROOT / f"example-{ex.name}"
+    if ex_dir.exists():
+        shutil.rmtree(ex_dir)
+    ex_dir.mkdir(parents=True)
+
+    # A dedicated temp root for *all* Copie runs belonging to this example
+    # SEE: scripts/render_workspace.py
+    tmp_root = workspace.acquire(f"copie_{ex.name}")
+    config_file = make_copier_config(tmp_root)
+
+    # ───── 1. Run the *package* template ────────────────────────────────────
+    package_test_dir = ex_dir / "package_run"
+    package_test_dir.mkdir()
+    c_pkg = new_copie(
+        template_dir=template_package_dir,
+        test_dir=package_test_dir,
+        config_file=config_file,
+    )
+
+    if ex.package_answers is None:  # pragma: no cover
+        typer.echo(
+            f"[{ex.name}] No package answers found, skipping package template.",
+            err=True,
+        )
+        return None
+    with profiled(profile_render, f"{ex.name}-package"):
+        pkg_result = c_pkg.copy(extra_answers=ex.package_answers)
+
+    if pkg_result.exception or pkg_result.exit_code != 0:  # pragma: no cover
+        typer.echo(
+            f"[{ex.name}] Package template failed: {pkg_result.exception}",
+            err=True,
+        )
+        return None
+
+    # ───── 2. Run the *rule* template (child) ───────────────────────────────
+    rule_test_dir = ex_dir / "rule_run"
+    rule_test_dir.mkdir()
+    c_rule = new_copie(
+        template_dir=TEMPLATE_RULE_DIR,
+        test_dir=rule_test_dir,
+        config_file=config_file,
+        parent_result=pkg_result,
+    )
+    if ex.rule_answers is None:
+        typer.echo(
+            f"[{ex.name}] No rule answers found, skipping rule template.",
+            err=True,
+        )
+        return None
+    with profiled(profile_render, f"{ex.name}-rule"):
+        rule_result = c_rule.copy(extra_answers=ex.rule_answers)
+
+    if rule_result.exception or rule_result.exit_code != 0:  # pragma: no cover
+        typer.echo(
+            f"[{ex.name}] Rule template failed: {rule_result.exception}", err=True
+        )
+        return None
+
+    typer.secho(
+        f"[{ex.name}] ✔  Finished. Final project is at\n"
+        f"    {rule_result.project_dir}",  # normally <sandbox>/<name>/rule_run/copie000/…
+        fg="green",
+    )
+    assert rule_result.project_dir is not None
+    return _Render(
+        package=pkg_result,
+        project_dir=rule_result.project_dir,
+        manifest=tree_manifest(rule_result.project_dir),
+    )
+
+
+def _rerender_rule(
+    ex: Example, render: _Render, workspace: RenderWorkspace, template: RuleTemplate
+) -> bool:
+    """
+    Render the rule *template* again onto a clone of the kept package render
+    and patch the changed files into the sandbox project.
+    """
+    tmp_root = workspace.acquire(f"watch_{ex.name}")
+    try:
+        assert render.package.project_dir is not None
+        project_dir = tmp_root / "project"
+        clone_tree(render.package.project_dir, project_dir)
+        try:
+            generate_rule(
+                project_dir, ex.rule_answers or {}, overwrite=True, template=template
+            )
+        except Exception as exc:  # noqa: BLE001  (reported like a failed render)
+            typer.echo(f"[{ex.name}] Rule template failed: {exc}", err=True)
+            return False
+        render.manifest, written, removed, conflicts = patch_tree(
+            project_dir, render.project_dir, render.manifest
+        )
+    finally:
+        workspace.discard(tmp_root)
+
+    changes = [f"    M {rel}" for rel in written] + [f"    D {rel}" for rel in removed]
+    typer.secho(
+        f"[{ex.name}] ✔  Patched {len(written)} file(s), removed {len(removed)}"
+        + "".join(f"\n{line}" for line in changes),
+        fg="green",
+    )
+    if conflicts:
+        typer.secho(
+            f"[{ex.name}] Kept {len(conflicts)} file(s) edited in the sandbox; "
+            "the new render differs:" + "".join(f"\n    C {rel}" for rel in conflicts),
+            fg="yellow",
+            err=True,
+        )
+    return True
+
+
+def _watch(
+    examples: list[Example],
+    renders: dict[str, _Render],
+    workspace: RenderWorkspace,
+    template_package_dir: Path,
+    debounce: float,
+) -> None:
+    """Re-render the examples affected by each burst of saves until Ctrl-C."""
+    template_paths = [TEMPLATE_RULE_DIR / src for src in TEMPLATE_SOURCES]
+    # Rule re-renders read a plain copy of the template sources, kept in sync
+    # below, so Copier does not clone the template repository on every save.
+    template_root = workspace.acquire("watch_template")
+    template = RuleTemplate(template_root / "template", ref=None)
+    sync_template(TEMPLATE_RULE_DIR, TEMPLATE_SOURCES, template.src)
+    answers_paths = [
+        path
+        for ex in examples
+        for path in (ex.package_answers_file, ex.rule_answers_file)
+    ]
+    watched = [path for path in [*template_paths, *answers_paths] if path.exists()]
+    state = snapshot(watched)
+    typer.echo(f"Watching {len(watched)} path(s) for changes; press Ctrl-C to stop.")
+
+    try:
+        while True:
+            state, changed = wait_for_changes(watched, state, debounce=debounce)
+            sync_template(TEMPLATE_RULE_DIR, TEMPLATE_SOURCES, template.src, changed)
+            plan = plan_rerender(
+                changed,
+                template_paths,
+                {ex.name: ex.package_answers_file for ex in examples},
+                {ex.name: ex.rule_answers_file for ex in examples},
+            )
+            if not plan:
+                continue
+            started = time.perf_counter()
+            for i, ex in enumerate(examples):
+                if ex.name not in plan.full | plan.rule:
+                    continue
+                try:
+                    # Reload the answers, they may be what changed.
+                    ex = examples[i] = Example(
+                        name=ex.name,
+                        package_answers_file=ex.package_answers_file,
+                        rule_answers_file=ex.rule_answers_file,
+                    )
+                except (OSError, ValueError) as exc:
+                    typer.echo(f"[{ex.name}] Cannot read answers: {exc}", err=True)
+                    continue
+                if ex.name in plan.full or ex.name not in renders:
+                    render = _render_example(ex, workspace, template_package_dir)
+                    if render is not None:
+                        renders[ex.name] = render
+                else:
+                    _rerender_rule(ex, renders[ex.name], workspace, template)
+            typer.echo(f"Updated in {time.perf_counter() - started:.2f}s")
+    except KeyboardInterrupt:
+        typer.echo("Stopped watching.")
+    finally:
+        workspace.discard(template_root)
+
+
 ###############################################################################
 #  CLI                                                                         #
 ###############################################################################
 
 app = typer.Typer(add_completion=False)  # we do not need shell completion
 
+_EXAMPLES_ARGUMENT = typer.Argument(
+    None,
+    help=(
+        "Subset of examples to render "
+        f"(available: {', '.join(e.name for e in EXAMPLES)})"
+    ),
+)
+_KEEP_OPTION = typer.Option(
+    False, help="Keep Copier's config and replay dirs of this run for debugging."
+)
+_PURGE_OPTION = typer.Option(
+    False, help="Remove the dirs of earlier runs from the render workspace first."
+)
+_QUOTA_OPTION = typer.Option(
+    None,
+    help="Disk quota of the render workspace, e.g. 2G "
+    "(default: $RENDER_WORKSPACE_QUOTA or 10G).",
+)
+
+
+def _open_workspace(quota: str | None, keep: bool, purge: bool) -> RenderWorkspace:
+    try:
+        workspace = RenderWorkspace(quota=quota, keep=keep)
+    except ValueError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(1) from exc
+    if purge:
+        removed = workspace.purge()
+        typer.echo(f"Purged {len(removed)} dir(s) from {workspace.root}")
+    return workspace
+
+
+def _select_examples(names: list[str] | None) -> list[Example]:
+    """The examples called *names*, or all of them."""
+    if not names:
+        return list(EXAMPLES)
+    lookup = {e.name: e for e in EXAMPLES}
+    missing = [name for name in names if name not in lookup]
+    if missing:
+        typer.echo(f"Unknown example name(s): {', '.join(missing)}", err=True)
+        raise typer.Exit(1)
+    return [lookup[name] for name in names]
+
+
+def _render_examples(
+    to_render: list[Example],
+    workspace: RenderWorkspace,
+    template_package_dir: Path,
+    profile_render: Path | None = None,
+) -> dict[str, _Render]:
+    SANDBOX_ROOT.mkdir(exist_ok=True)
+    renders: dict[str, _Render] = {}
+    for ex in to_render:
+        render = _render_example(ex, workspace, template_package_dir, profile_render)
+        if render is not None:
+            renders[ex.name] = render
+    return renders
+
 
 @app.command("generate")
 def generate_cmd(
-    examples: Optional[List[str]] = typer.Argument(
+    examples: Optional[List[str]] = _EXAMPLES_ARGUMENT,
+    keep: bool = _KEEP_OPTION,
+    purge: bool = _PURGE_OPTION,
+    quota: str | None = _QUOTA_OPTION,
+    profile_render: Path | None = typer.Option(
         None,
-        help=(
-            "Subset of examples to render "
-            f"(available: {', '.join(e.name for e in EXAMPLES)})"
-        ),
-    )
+        help="Write <example>-<template>.pstats and .collapsed profiles of "
+        "each render to this directory.",
+    ),
 ) -> None:
     """
     Render one or more *extra-answers* files into the «sandbox» directory.
@@ -120,85 +400,48 @@ def generate_cmd(
     The command works exactly the same way as the original pytest fixture would,
     but you can run it ad-hoc from the shell - no pytest needed.
     """
-    SANDBOX_ROOT.mkdir(exist_ok=True)
-    template_package_dir = _resolve_package_template_dir()
-
-    # Determine the list of examples we need to work on
-    to_render: list[Example]
-    if not examples:
-        to_render = EXAMPLES
-    else:
-        lookup = {e.name: e for e in EXAMPLES}
-        missing = [name for name in examples if name not in lookup]
-        if missing:
-            typer.echo(f"Unknown example name(s): {', '.join(missing)}", err=True)
-            raise typer.Exit(1)
-        to_render = [lookup[name] for name in examples]
-
-    # Work each example
-    for ex in to_render:
-        ex_dir = SANDBOX_ROOT / f"example-{ex.name}"
-        if ex_dir.exists():
-            shutil.rmtree(ex_dir)
-        ex_dir.mkdir(parents=True)
-
-        # A dedicated temp root for *all* Copie runs belonging to this example
-        tmp_root = Path(tempfile.mkdtemp(prefix=f"copie_{ex.name}_"))
-        config_file = make_copier_config(tmp_root)
-
-        # ───── 1. Run the *package* template ────────────────────────────────
-        package_test_dir = ex_dir / "package_run"
-        package_test_dir.mkdir()
-        c_pkg = new_copie(
-            template_dir=template_package_dir,
-            test_dir=package_test_dir,
-            config_file=config_file,
-        )
+    workspace = _open_workspace(quota, keep, purge)
+    to_render = _select_examples(examples)
+    _render_examples(
+        to_render, workspace, _resolve_package_template_dir(), profile_render
+    )
 
-        if ex.package_answers is None:  # pragma: no cover
-            typer.echo(
-                f"[{ex.name}] No package answers found, skipping package template.",
-                err=True,
-            )
-            continue
-        pkg_result = c_pkg.copy(extra_answers=ex.package_answers)
+    workspace.release()
+    if profile_render is not None:
+        typer.echo(f"Render profiles written to {profile_render}")
+    if keep:
+        typer.echo(f"Copier config and replay dirs kept under {workspace.root}")
+    typer.echo("All done.")
 
-        if pkg_result.exception or pkg_result.exit_code != 0:  # pragma: no cover
-            typer.echo(
-                f"[{ex.name}] Package template failed: {pkg_result.exception}",
-                err=True,
-            )
-            continue
-
-        # ───── 2. Run the *rule* template (child) ───────────────────────────
-        rule_test_dir = ex_dir / "rule_run"
-        rule_test_dir.mkdir()
-        c_rule = new_copie(
-            template_dir=TEMPLATE_RULE_DIR,
-            test_dir=rule_test_dir,
-            config_file=config_file,
-            parent_result=pkg_result,
-        )
-        if ex.rule_answers is None:
-            typer.echo(
-                f"[{ex.name}] No rule answers found, skipping rule template.",
-                err=True,
-            )
-            continue
-        rule_result = c_rule.copy(extra_answers=ex.rule_answers)
 
-        if rule_result.exception or rule_result.exit_code != 0:  # pragma: no cover
-            typer.echo(
-                f"[{ex.name}] Rule template failed: {rule_result.exception}", err=True
-            )
-            continue
+@app.command("watch")
+def watch_cmd(
+    examples: list[str] | None = _EXAMPLES_ARGUMENT,
+    keep: bool = _KEEP_OPTION,
+    purge: bool = _PURGE_OPTION,
+    quota: str | None = _QUOTA_OPTION,
+    debounce: float = typer.Option(
+        0.25, help="Wait this many seconds for a burst of saves to end."
+    ),
+) -> None:
+    """
+    Render the examples, then re-render them whenever the rule template,
+    copier.yml, tasks/ or the answers files change, until Ctrl-C.
 
-        typer.secho(
-            f"[{ex.name}] ✔  Finished. Final project is at\n"
-            f"    {rule_result.project_dir}",  # normally <sandbox>/<name>/rule_run/copie000/…
-            fg="green",
-        )
+    The package renders are kept. After each change only the rule template
+    is rendered again, from a plain copy of its sources, and the changed
+    files are patched into the sandbox projects. A change to a package
+    answers file re-renders that example from scratch.
+    """
+    workspace = _open_workspace(quota, keep, purge)
+    to_render = _select_examples(examples)
+    template_package_dir = _resolve_package_template_dir()
+    renders = _render_examples(to_render, workspace, template_package_dir)
+    _watch(to_render, renders, workspace, template_package_dir, debounce)
 
+    workspace.release()
+    if keep:
+        typer.echo(f"Copier config and replay dirs kept under {workspace.root}")
     typer.echo("All done.")
 
 
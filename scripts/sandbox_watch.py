@@ -0,0 +1,218 @@
+"""
+Helpers for `sandbox_examples_generate watch`.
+
+- `snapshot`/`wait_for_changes` poll the modification times of the watched
+  files (stdlib only, no inotify dependency) and return once a burst of
+  saves has settled for the debounce delay;
+- `plan_rerender` maps the changed paths to the examples that need a new
+  rule render and the ones whose package answers changed (full render);
+- `sync_template` keeps a plain (non-git) copy of the rule template
+  sources up to date, so re-renders read it directly instead of Copier
+  cloning the template repository for every change;
+- `patch_tree` copies only the files whose content changed from a fresh
+  render into the existing sandbox project, so editors and terminals
+  pointed at the sandbox keep working; files edited in the sandbox are
+  reported as conflicts instead of being overwritten.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+Snapshot = dict[str, tuple[int, int]]
+
+
+def snapshot(
+    paths: Iterable[Path], *, skip_dirs: Iterable[str] = ("__pycache__",)
+) -> Snapshot:
+    """Return ``{file: (mtime_ns, size)}`` for the files at or below *paths*."""
+    skip = set(skip_dirs)
+    state: Snapshot = {}
+    for path in paths:
+        if path.is_file():
+            st = path.stat()
+            state[str(path)] = (st.st_mtime_ns, st.st_size)
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [d for d in dirnames if d not in skip]
+            for name in filenames:
+                try:
+                    st = os.stat(os.path.join(dirpath, name))
+                except FileNotFoundError:  # deleted mid-scan
+                    continue
+                state[os.path.join(dirpath, name)] = (st.st_mtime_ns, st.st_size)
+    return state
+
+
+def changed_paths(before: Snapshot, after: Snapshot) -> set[Path]:
+    """Return the files added, removed or modified between two snapshots."""
+    keys = before.keys() | after.keys()
+    return {Path(k) for k in keys if before.get(k) != after.get(k)}
+
+
+def wait_for_changes(
+    paths: list[Path],
+    previous: Snapshot,
+    *,
+    interval: float = 0.1,
+    debounce: float = 0.25,
+    sleep: Callable[[float], None] = time.sleep,
+) -> tuple[Snapshot, set[Path]]:
+    """
+    Block until the files below *paths* differ from *previous*, then until
+    they have not changed for *debounce* seconds.
+
+    Returns the new snapshot and every path changed during the burst.
+    """
+    current = previous
+    while True:
+        sleep(interval)
+        current = snapshot(paths)
+        if current != previous:
+            break
+    quiet = 0.0
+    while quiet < debounce:
+        sleep(interval)
+        latest = snapshot(paths)
+        quiet = quiet + interval if latest == current else 0.0
+        current = latest
+    return current, changed_paths(previous, current)
+
+
+@dataclass
+class RerenderPlan:
+    """Examples to render again after a change."""
+
+    full: set[str] = field(default_factory=set)  # package answers changed
+    rule: set[str] = field(default_factory=set)  # rule template or answers changed
+
+    def __bool__(self) -> bool:
+        return bool(self.full or self.rule)
+
+
+def plan_rerender(
+    changed: set[Path],
+    template_paths: list[Path],
+    package_answers: dict[str, Path],
+    rule_answers: dict[str, Path],
+) -> RerenderPlan:
+    """Decide which examples *changed* affects."""
+    plan = RerenderPlan()
+    resolved = {path.resolve() for path in changed}
+    for name, path in package_answers.items():
+        if path.resolve() in resolved:
+            plan.full.add(name)
+    for name, path in rule_answers.items():
+        if path.resolve() in resolved and name not in plan.full:
+            plan.rule.add(name)
+    roots = [root.resolve() for root in template_paths]
+    if any(path == root or root in path.parents for path in resolved for root in roots):
+        plan.rule |= set(rule_answers) - plan.full
+    return plan
+
+
+def sync_template(
+    root: Path,
+    sources: Iterable[str],
+    dst: Path,
+    changed: Iterable[Path] | None = None,
+) -> int:
+    """
+    Copy the template *sources* of the repository *root* to *dst*.
+
+    Without *changed* the copy is made from scratch; otherwise only the
+    *changed* files below *sources* are copied or, if deleted, removed.
+    Returns the number of files updated.
+    """
+    roots = [(root / src).resolve() for src in sources]
+    if changed is None:
+        if dst.exists():
+            shutil.rmtree(dst)
+        dst.mkdir(parents=True)
+        changed = snapshot([path for path in roots if path.exists()])
+    updated = 0
+    for path in {Path(p).resolve() for p in changed}:
+        if not any(path == r or r in path.parents for r in roots):
+            continue
+        target = dst / path.relative_to(root.resolve())
+        if path.is_file():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, target)
+        else:
+            target.unlink(missing_ok=True)
+        updated += 1
+    return updated
+
+
+def _digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def tree_manifest(root: Path) -> dict[str, str]:
+    """Return ``{relative path: sha256}`` for the files below *root*."""
+    manifest = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in (".git", ".tox", ".snakemake")]
+        for name in filenames:
+            path = Path(dirpath) / name
+            if path.is_symlink():
+                continue
+            manifest[path.relative_to(root).as_posix()] = _digest(path)
+    return manifest
+
+
+def patch_tree(
+    src: Path, dst: Path, previous: dict[str, str]
+) -> tuple[dict[str, str], list[str], list[str], list[str]]:
+    """
+    Make the rendered files of *dst* match the fresh render *src*.
+
+    *previous* is the manifest of the last render patched into *dst*. Files
+    whose rendered content did not change are not touched, and only files
+    from that render are removed. A file the user edited or created in the
+    sandbox is never overwritten or removed: it is reported as a conflict
+    instead. Returns the new manifest and the written, removed and
+    conflicting relative paths.
+    """
+
+    def user_changed(rel: str) -> bool:
+        target = dst / rel
+        if not target.is_file():
+            return False
+        return rel not in previous or _digest(target) != previous[rel]
+
+    manifest = tree_manifest(src)
+    written, conflicts = [], []
+    for rel, digest in sorted(manifest.items()):
+        target = dst / rel
+        if target.is_file() and previous.get(rel) == digest:
+            continue
+        if user_changed(rel) and _digest(target) != digest:
+            conflicts.append(rel)
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            target.unlink()
+        shutil.copy2(src / rel, target)
+        written.append(rel)
+    removed = []
+    for rel in sorted(previous.keys() - manifest.keys()):
+        if user_changed(rel):
+            conflicts.append(rel)
+            continue
+        (dst / rel).unlink(missing_ok=True)
+        removed.append(rel)
+    # Keep the last patched digest of a conflicting file, so that it stays a
+    # conflict until the user's edit is resolved.
+    for rel in conflicts:
+        if rel in previous:
+            manifest[rel] = previous[rel]
+        else:
+            manifest.pop(rel, None)
+    return manifest, written, removed, sorted(conflicts)
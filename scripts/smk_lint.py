@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+In-process Snakemake syntax and lint check of a rendered project.
+
+Checking a generated rule with the inner tox envs means building conda
+environments and running Snakemake; this check takes a second. Starting at
+`workflow/rules/includes.smk` (or `includes.members.smk` when the includes
+bundle is enabled) it
+
+- parses every file of the `include:` chain with Snakemake's own parser and
+  compiles the result, so syntax errors and unknown directives are reported
+  with their original line numbers;
+- reports missing include targets and rule names defined twice;
+- evaluates the `script:`, `conda:`, `log:` and `benchmark:` expressions
+  against stand-ins for the names the package `Snakefile` defines
+  (`WORKFLOW_BASE`, `LOG_DIR`, `config`, `get_localized_conda`, ...) and
+  checks that scripts and conda env files exist in the rendered tree and that
+  no two rules write the same log or benchmark file.
+
+The rule bodies and `run:` blocks are never executed. The directive
+expressions are evaluated with `eval`, with no builtins and only the
+stand-ins in scope. That is not a sandbox, so only lint projects you would
+also run. Expressions that use other names are reported as warnings.
+
+Usage
+-----
+
+    python -m scripts.smk_lint path/to/project
+"""
+
+from __future__ import annotations
+
+import ast
+import io
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import typer
+from ruamel.yaml import YAML
+
+try:
+    from snakemake import parser as smk_parser
+    from snakemake.sourcecache import LocalSourceFile
+except ImportError:  # pragma: no cover - snakemake is a test dependency
+    smk_parser = None  # type: ignore[assignment]
+
+RULES_DIR = Path("workflow/rules")
+ENTRY_POINTS = ("includes.members.smk", "includes.smk")
+# Workflow config files, first match wins.
+CONFIG_FILES = (
+    "config/config.yaml",
+    "config/config.yml",
+    "workflow/config.yaml",
+    "config.yaml",
+)
+# Directives whose value is a path checked against the rendered tree.
+PATH_DIRECTIVES = ("script", "conda", "log", "benchmark")
+
+###############################################################################
+#  Results                                                                     #
+###############################################################################
+
+
+@dataclass
+class Issue:
+    """One finding, located in the original smk file."""
+
+    path: str
+    line: int
+    message: str
+    severity: str = "error"  # or "warning"
+    rule: str | None = None
+
+    def __str__(self) -> str:
+        where = f"{self.path}:{self.line}"
+        rule = f" [rule {self.rule}]" if self.rule else ""
+        return f"{where}: {self.severity}:{rule} {self.message}"
+
+
+@dataclass
+class Rule:
+    name: str
+    path: Path
+    line: int
+    # Directive name -> AST of its arguments.
+    directives: dict[str, ast.Call] = field(default_factory=dict)
+
+
+@dataclass
+class LintReport:
+    files: list[Path] = field(default_factory=list)
+    rules: list[Rule] = field(default_factory=list)
+    issues: list[Issue] = field(default_factory=list)
+
+    @property
+    def errors(self) -> list[Issue]:
+        return [issue for issue in self.issues if issue.severity == "error"]
+
+
+###############################################################################
+#  Parsing                                                                     #
+###############################################################################
+
+
+class SmkSyntaxError(Exception):
+    def __init__(self, line: int, message: str) -> None:
+        super().__init__(message)
+        self.line = line
+
+
+def compile_smk(path: Path) -> tuple[ast.Module, dict[int, int]]:
+    """
+    Translate *path* with Snakemake's parser and return the Python AST and
+    the map from generated to original line numbers.
+    """
+    if smk_parser is None:
+        raise RuntimeError("The smk lint needs snakemake installed.")
+    # The parser only uses the workflow to open the file; hand it the text so
+    # that no file handle outlives the parse.
+    workflow = SimpleNamespace(
+        sourcecache=SimpleNamespace(
+            open=lambda source: io.StringIO(
+                Path(source.get_path_or_uri(secret_free=True)).read_text()
+            )
+        )
+    )
+    linemap: dict[int, int] = {}
+    try:
+        code, _ = smk_parser.parse(LocalSourceFile(str(path)), workflow, linemap)
+    except SyntaxError as exc:
+        raise SmkSyntaxError(exc.lineno or 1, exc.msg) from exc
+    try:
+        return ast.parse(code, filename=str(path)), linemap
+    except SyntaxError as exc:
+        line = linemap.get(exc.lineno or 1, exc.lineno or 1)
+        raise SmkSyntaxError(line, exc.msg) from exc
+
+
+def _workflow_call(node: ast.AST) -> tuple[str, ast.Call] | None:
+    """Return ``(name, call)`` for a ``workflow.<name>(...)`` call."""
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == "workflow"
+    ):
+        return node.func.attr, node
+    return None
+
+
+def rules_and_includes(
+    tree: ast.Module, path: Path, linemap: dict[int, int]
+) -> tuple[list[Rule], list[ast.Call]]:
+    """Collect the rules and the top-level ``include:`` calls of a file."""
+    rules: list[Rule] = []
+    includes: list[ast.Call] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Expr):
+            found = _workflow_call(node.value)
+            if found and found[0] == "include":
+                includes.append(found[1])
+        if not isinstance(node, ast.FunctionDef):
+            continue
+        calls = [c for c in map(_workflow_call, node.decorator_list) if c]
+        header = next((call for name, call in calls if name == "rule"), None)
+        if header is None:
+            continue
+        keywords = {k.arg: k.value for k in header.keywords}
+        name = keywords.get("name")
+        rules.append(
+            Rule(
+                name=name.value if isinstance(name, ast.Constant) else node.name,
+                path=path,
+                line=linemap.get(header.lineno, header.lineno),
+                directives={n: c for n, c in calls if n != "rule"},
+            )
+        )
+    return rules, includes
+
+
+###############################################################################
+#  Evaluation                                                                  #
+###############################################################################
+
+
+class _Unresolved(Exception):
+    pass
+
+
+def default_symbols(project_dir: Path) -> dict[str, Any]:
+    """Stand-ins for the names the package Snakefile defines."""
+    config: dict[str, Any] = {}
+    for rel in CONFIG_FILES:
+        if (project_dir / rel).is_file():
+            config = YAML(typ="safe").load((project_dir / rel).read_text()) or {}
+            break
+    return {
+        "WORKFLOW_BASE": project_dir / "workflow",
+        "LOG_DIR": project_dir / "logs",
+        "config": config,
+        "get_localized_conda": lambda path: path,
+        "repeat": lambda path, _n: path,
+        "str": str,
+        "Path": Path,
+    }
+
+
+def _evaluate(node: ast.expr, symbols: dict[str, Any]) -> Any:
+    code = compile(ast.Expression(node), "<directive>", "eval")
+    try:
+        return eval(code, {"__builtins__": {}}, dict(symbols))
+    except (NameError, KeyError, TypeError, AttributeError, ValueError) as exc:
+        raise _Unresolved(f"{type(exc).__name__}: {exc}") from exc
+
+
+def directive_values(
+    call: ast.Call, symbols: dict[str, Any]
+) -> list[tuple[str | None, Any]]:
+    """Evaluate the arguments of a directive call to ``(keyword, value)``."""
+    args: list[tuple[str | None, ast.expr]] = [(None, arg) for arg in call.args]
+    args += [(k.arg, k.value) for k in call.keywords]
+    return [(key, _evaluate(node, symbols)) for key, node in args]
+
+
+def _resolve(value: Any, rule: Rule, project_dir: Path) -> Path | None:
+    """
+    Find a script/conda path. Snakemake resolves relative paths against the
+    rule's file; `get_localized_conda` and friends may use the workflow
+    directory or the project instead, so accept any of them.
+    """
+    path = Path(str(value))
+    if path.is_absolute():
+        return path if path.exists() else None
+    bases = (rule.path.parent, project_dir / "workflow", project_dir)
+    return next((b / path for b in bases if (b / path).exists()), None)
+
+
+###############################################################################
+#  Lint                                                                        #
+###############################################################################
+
+
+def _entry_point(project_dir: Path) -> Path:
+    for name in ENTRY_POINTS:
+        if (project_dir / RULES_DIR / name).is_file():
+            return project_dir / RULES_DIR / name
+    return project_dir / RULES_DIR / ENTRY_POINTS[-1]
+
+
+def lint_project(
+    project_dir: Path,
+    *,
+    entry: Path | None = None,
+    symbols: dict[str, Any] | None = None,
+) -> LintReport:
+    """Parse the include chain of *project_dir* and check its rules."""
+    project_dir = project_dir.resolve()
+    symbols = {**default_symbols(project_dir), **(symbols or {})}
+    report = LintReport()
+
+    def rel(path: Path) -> str:
+        try:
+            return path.resolve().relative_to(project_dir).as_posix()
+        except ValueError:
+            return str(path)
+
+    entry = entry or _entry_point(project_dir)
+    if not entry.is_file():
+        report.issues.append(Issue(rel(entry), 0, "include chain entry not found"))
+        return report
+
+    queue, seen = [entry.resolve()], set()
+    while queue:
+        path = queue.pop(0)
+        if path in seen:
+            continue
+        seen.add(path)
+        report.files.append(path)
+        try:
+            tree, linemap = compile_smk(path)
+        except SmkSyntaxError as exc:
+            report.issues.append(Issue(rel(path), exc.line, f"syntax: {exc}"))
+            continue
+        rules, includes = rules_and_includes(tree, path, linemap)
+        report.rules.extend(rules)
+        for call in includes:
+            line = linemap.get(call.lineno, call.lineno)
+            try:
+                (_, target), *_ = directive_values(call, symbols)
+            except _Unresolved as exc:
+                report.issues.append(
+                    Issue(rel(path), line, f"unresolved include: {exc}", "warning")
+                )
+                continue
+            target_path = path.parent / str(target)
+            if not target_path.is_file():
+                report.issues.append(
+                    Issue(rel(path), line, f"included file not found: {target}")
+                )
+                continue
+            queue.append(target_path.resolve())
+
+    report.issues.extend(_check_rules(report.rules, project_dir, symbols, rel))
+    return report
+
+
+def _check_rules(
+    rules: list[Rule], project_dir: Path, symbols: dict[str, Any], rel: Any
+) -> list[Issue]:
+    issues: list[Issue] = []
+    defined: dict[str, Rule] = {}
+    outputs: dict[str, str] = {}
+    for rule in rules:
+        where = {"path": rel(rule.path), "line": rule.line, "rule": rule.name}
+        if rule.name in defined:
+            first = defined[rule.name]
+            issues.append(
+                Issue(
+                    **where,
+                    message=f"rule name already defined in {rel(first.path)}:"
+                    f"{first.line}",
+                )
+            )
+        defined.setdefault(rule.name, rule)
+
+        for directive in PATH_DIRECTIVES:
+            call = rule.directives.get(directive)
+            if call is None:
+                continue
+            try:
+                values = directive_values(call, symbols)
+            except _Unresolved as exc:
+                issues.append(
+                    Issue(
+                        **where,
+                        message=f"{directive}: could not resolve ({exc})",
+                        severity="warning",
+                    )
+                )
+                continue
+            for key, value in values:
+                if callable(value):  # resolved per job, e.g. from wildcards
+                    continue
+                label = f"{directive}.{key}" if key else directive
+                if directive == "script" and _resolve(value, rule, project_dir) is None:
+                    issues.append(Issue(**where, message=f"{label}: {value} not found"))
+                elif directive == "conda":
+                    text = str(value)
+                    if text.endswith((".yaml", ".yml")) and (
+                        _resolve(value, rule, project_dir) is None
+                    ):
+                        issues.append(
+                            Issue(
+                                **where, message=f"{label}: env file {text} not found"
+                            )
+                        )
+                elif directive in ("log", "benchmark"):
+                    owner = outputs.setdefault(str(value), rule.name)
+                    if owner != rule.name:
+                        issues.append(
+                            Issue(
+                                **where,
+                                message=f"{label}: {rel(Path(str(value)))} is also "
+                                f"written by rule {owner}",
+                            )
+                        )
+    return issues
+
+
+###############################################################################
+#  CLI                                                                         #
+###############################################################################
+
+app = typer.Typer(add_completion=False)  # we do not need shell completion
+
+
+@app.command()
+def main(
+    project_dir: Path = typer.Argument(..., help="Rendered project to check."),
+    strict: bool = typer.Option(False, help="Fail on warnings too."),
+) -> None:
+    """
+    Parse and lint the smk include chain of a rendered project.
+    """
+    report = lint_project(project_dir)
+    for issue in report.issues:
+        typer.echo(str(issue), err=True)
+    typer.echo(
+        f"{len(report.files)} smk file(s), {len(report.rules)} rule(s), "
+        f"{len(report.errors)} error(s), "
+        f"{len(report.issues) - len(report.errors)} warning(s)"
+    )
+    if report.errors or (strict and report.issues):
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,217 @@
+"""
+Golden snapshot manifests of rendered examples.
+
+A manifest records, for every file the rule template renders or rewrites,
+the SHA-256 of its *normalized* content, and the full text of the rule
+files so that a regression shows up as a readable diff. Normalization
+removes what changes from run to run without changing the output:
+
+- absolute paths of the temporary render directory;
+- the `_commit` and `_src_path` entries of Copier answers files;
+- Windows line endings.
+
+Which files belong to the rule template is derived from the `template/`
+tree, whose paths are rendered with the example's rule answers, and the files
+the rule's tasks write (`TASK_SNAPSHOT_PATHS`). Files of the package template
+and volatile files (`VOLATILE_GLOBS`) are left out, so a manifest only changes
+when the rule template's output does.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import posixpath
+import re
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any
+
+from jinja2 import Environment
+from ruamel.yaml import YAML
+
+from scripts.template_impact import rendered_files, rendered_glob
+
+MANIFEST_VERSION = 1
+
+# Files stored with their full text in addition to the hash.
+FULL_TEXT_GLOBS: tuple[str, ...] = (
+    "workflow/rules/*.smk",
+    "workflow/scripts/*.py",
+    "tests/workflow/*.py",
+)
+
+# Answers file written by Copier outside `template/` (see `_answers_file`).
+ANSWERS_GLOB = "copier-answers/rule-*.yml"
+
+# Files the rule's tasks write besides the rendered template files. Narrower
+# than `template_impact.TASK_OUTPUTS`, which may over-select envs but must not
+# match files of the package template here.
+TASK_SNAPSHOT_PATHS: tuple[str, ...] = (
+    "workflow/rules/{{ smk_file_name }}",  # append_smk_rule.py
+    "workflow/rules/includes*.smk",  # append_smk_include.py, bundle_smk_includes.py
+    "workflow/rules/bundle_includes.py",  # bundle_smk_includes.py
+    ".copier-answers/rules-index.json",  # rules_index.py
+)
+
+# Never snapshotted: contents that change from run to run.
+VOLATILE_GLOBS: tuple[str, ...] = (
+    "workflow/rules/.includes.bundle.json",  # member mtimes
+    "*/__pycache__/*",
+)
+
+_ANSWERS_VOLATILE = re.compile(r"^(_commit|_src_path):.*\n?", flags=re.MULTILINE)
+
+
+def _question_defaults(repo: Path) -> dict[str, Any]:
+    """Defaults of the `copier.yml` questions that are not templates."""
+    data = YAML(typ="safe").load((repo / "copier.yml").read_text()) or {}
+    return {
+        name: spec["default"]
+        for name, spec in data.items()
+        if isinstance(spec, dict)
+        and "default" in spec
+        and not (isinstance(spec["default"], str) and "{" in spec["default"])
+    }
+
+
+def _render_path(template_path: str, context: dict[str, Any]) -> str | None:
+    """Render a template path like Copier; ``None`` if it is not rendered."""
+    path = Environment().from_string(template_path).render(**context)
+    path = path.removeprefix("template/").removesuffix(".jinja")
+    # Copier skips files and directories whose name renders empty.
+    if "" in path.split("/"):
+        return None
+    return posixpath.normpath(path)
+
+
+def rule_template_globs(repo: Path, answers: dict[str, Any] | None = None) -> list[str]:
+    """
+    Globs over rendered paths that the rule template produces.
+
+    With the rule *answers*, template paths are rendered with them, so that
+    only this rule's files match; without, every `{{ ... }}` is a wildcard.
+    """
+    sources = [
+        path.relative_to(repo).as_posix()
+        for path in (repo / "template").rglob("*")
+        if path.is_file() and "__pycache__" not in path.parts
+    ]
+    if answers is None:
+        globs = {rendered_glob(source) for source in sources}
+        globs.update(rendered_glob(path) for path in TASK_SNAPSHOT_PATHS)
+    else:
+        context = {
+            **_question_defaults(repo),
+            **answers,
+            # The answers file is matched by `ANSWERS_GLOB` instead.
+            "_copier_conf": {"sep": "/", "answers_file": ""},
+        }
+        rendered = (_render_path(path, context) for path in sources)
+        globs = {path for path in rendered if path is not None}
+        globs.update(
+            Environment().from_string(path).render(**context)
+            for path in TASK_SNAPSHOT_PATHS
+        )
+    globs.add(ANSWERS_GLOB)
+    return sorted(globs)
+
+
+def rule_answers(project_dir: Path) -> list[dict[str, Any]]:
+    """The answers of every rule rendered into *project_dir*."""
+    loader = YAML(typ="safe")
+    return [
+        loader.load(path.read_text()) or {}
+        for path in sorted(project_dir.glob(ANSWERS_GLOB))
+    ]
+
+
+def project_globs(repo: Path, project_dir: Path) -> list[str]:
+    """`rule_template_globs` for the rules rendered into *project_dir*."""
+    answers = rule_answers(project_dir)
+    if not answers:
+        return rule_template_globs(repo)
+    return sorted({g for a in answers for g in rule_template_globs(repo, a)})
+
+
+def normalize(text: str, project_dir: Path) -> str:
+    """Remove run-specific details from a rendered text file."""
+    text = text.replace("\r\n", "\n")
+    for root in {str(project_dir), str(project_dir.resolve())}:
+        text = text.replace(root, "<PROJECT>")
+    return _ANSWERS_VOLATILE.sub("", text)
+
+
+def build_manifest(
+    project_dir: Path, globs: list[str], *, full_text: bool = True
+) -> dict[str, Any]:
+    """Snapshot the files of *project_dir* matching *globs*."""
+    files: dict[str, dict[str, str]] = {}
+    for rel in sorted(rendered_files(project_dir)):
+        if not any(fnmatch(rel, pattern) for pattern in globs):
+            continue
+        if any(fnmatch(rel, pattern) for pattern in VOLATILE_GLOBS):
+            continue
+        raw = (project_dir / rel).read_bytes()
+        try:
+            text: str | None = normalize(raw.decode("utf-8"), project_dir)
+        except UnicodeDecodeError:
+            text = None
+        entry = {
+            "sha256": hashlib.sha256(
+                raw if text is None else text.encode("utf-8")
+            ).hexdigest()
+        }
+        if (
+            full_text
+            and text is not None
+            and any(fnmatch(rel, pattern) for pattern in FULL_TEXT_GLOBS)
+        ):
+            entry["text"] = text
+        files[rel] = entry
+    return {"version": MANIFEST_VERSION, "files": files}
+
+
+def load_manifest(path: Path) -> dict[str, Any] | None:
+    try:
+        manifest = json.loads(path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def save_manifest(path: Path, manifest: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+
+
+def diff_manifests(expected: dict[str, Any], actual: dict[str, Any]) -> list[str]:
+    """
+    Describe how *actual* differs from *expected*; empty when they match.
+
+    Changed files with stored text get a unified diff.
+    """
+    old, new = expected["files"], actual["files"]
+    lines: list[str] = []
+    for rel in sorted(old.keys() - new.keys()):
+        lines.append(f"removed: {rel}")
+    for rel in sorted(new.keys() - old.keys()):
+        lines.append(f"added:   {rel}")
+    for rel in sorted(old.keys() & new.keys()):
+        if old[rel]["sha256"] == new[rel]["sha256"]:
+            continue
+        lines.append(f"changed: {rel}")
+        if "text" in old[rel] and "text" in new[rel]:
+            lines.extend(
+                difflib.unified_diff(
+                    old[rel]["text"].splitlines(),
+                    new[rel]["text"].splitlines(),
+                    fromfile=f"snapshot/{rel}",
+                    tofile=f"rendered/{rel}",
+                    lineterm="",
+                )
+            )
+    return lines
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Scaling stress test: generate many rules into one project.
+
+The harness renders the package template once, then runs the rule template
+into that same project again and again (like a user adding rule after rule)
+with synthetic answers `stress_rule_0000`, `stress_rule_0001`, ... Each rule
+gets its own smk file, so `append_smk_include.py`, the rule index and the
+formatters all see a project that grows by one rule per step.
+
+For every phase (`package`, `rules`, `parse`) it records the wall time and the
+peak RSS of this process and of its child processes (the Copier tasks and
+formatters); for every rule it records the latency. The report shows the
+curve at each requested size: cumulative time, median latency of the rules
+just before that size and the growth exponent *k* of the latency between two
+sizes (latency ~ rules^k; about 0 when adding a rule costs the same in a
+small and a large project, 1 when it grows linearly with the project).
+
+Usage
+-----
+
+    # 10/100/1000 rules, report written to stress.json
+    python -m scripts.stress_rule_generation --size 10 --size 100 \\
+        --size 1000 --out stress.json
+
+    # Fail when the latency at any size regressed by more than 25%
+    python -m scripts.stress_rule_generation --size 10 --size 100 \\
+        --baseline stress.json
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import typer
+from copier import run_copy
+from ruamel.yaml import YAML
+
+from scripts.copie_helpers import (
+    load_module_from_path,
+    make_copier_config,
+    new_copie,
+)
+from scripts.render_workspace import RenderWorkspace
+
+PROJECT_ROOT: Path = Path(__file__).resolve().parents[1]
+EXAMPLE_DIR: Path = PROJECT_ROOT / "example-answers" / "weh_interviews"
+
+# Fraction of the rules before a size whose latencies make up its median.
+WINDOW = 0.1
+
+###############################################################################
+#  Measurement                                                                 #
+###############################################################################
+
+
+def _maxrss_mb(who: int) -> float:
+    """Peak RSS of this process or its waited-for children, in MiB."""
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+@contextmanager
+def phase(phases: dict[str, dict[str, float]], name: str) -> Iterator[None]:
+    """
+    Record the wall time and peak RSS of the block in *phases[name]*.
+
+    RSS peaks are high-water marks, so a phase shows the peak reached by the
+    end of it; compare consecutive phases to see which one raised it.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = {
+            "seconds": round(time.perf_counter() - start, 4),
+            "peak_rss_mb": round(_maxrss_mb(resource.RUSAGE_SELF), 1),
+            "peak_children_rss_mb": round(_maxrss_mb(resource.RUSAGE_CHILDREN), 1),
+        }
+
+
+def run_rules(
+    generate: Callable[[int], None], n_rules: int, *, progress: bool = False
+) -> list[float]:
+    """Call ``generate(i)`` for each rule index and return the latencies."""
+    latencies = []
+    for i in range(n_rules):
+        start = time.perf_counter()
+        generate(i)
+        latencies.append(time.perf_counter() - start)
+        if progress and (i + 1) % max(1, n_rules // 20) == 0:
+            typer.echo(f"  {i + 1}/{n_rules} rules, last {latencies[-1]:.3f}s")
+    return latencies
+
+
+def scaling_curve(latencies: list[float], sizes: list[int]) -> list[dict[str, Any]]:
+    """Summarize *latencies* at each of *sizes* (number of rules generated)."""
+    curve: list[dict[str, Any]] = []
+    for size in sorted(s for s in set(sizes) if 0 < s <= len(latencies)):
+        window = latencies[size - max(1, math.ceil(size * WINDOW)) : size]
+        point: dict[str, Any] = {
+            "rules": size,
+            "total_s": round(sum(latencies[:size]), 4),
+            "median_latency_s": round(statistics.median(window), 4),
+        }
+        if curve:
+            prev = curve[-1]
+            point["growth_exponent"] = round(
+                math.log(point["median_latency_s"] / prev["median_latency_s"])
+                / math.log(size / prev["rules"]),
+                3,
+            )
+        curve.append(point)
+    return curve
+
+
+def regressions(
+    baseline: dict[str, Any], report: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Describe the sizes whose median latency exceeds the baseline's."""
+    before = {p["rules"]: p["median_latency_s"] for p in baseline.get("curve", [])}
+    found = []
+    for point in report["curve"]:
+        old = before.get(point["rules"])
+        if old and point["median_latency_s"] > old * (1 + tolerance):
+            found.append(
+                f"{point['rules']} rules: median latency "
+                f"{point['median_latency_s']:.3f}s vs {old:.3f}s baseline"
+            )
+    return found
+
+
+###############################################################################
+#  Rendering                                                                   #
+###############################################################################
+
+
+def rule_answers(base: dict[str, Any], i: int, *, format_code: bool) -> dict[str, Any]:
+    """Answers of the *i*-th synthetic rule, each in its own smk file."""
+    name = f"stress_rule_{i:04d}"
+    return {
+        **base,
+        "rule_name": name,
+        "rule_description": f"Synthetic rule {i} of the scaling stress test.",
+        "smk_file_name": f"{name}.smk",
+        "smk_file_exists": False,
+        "format_code": format_code,
+    }
+
+
+def render_package(work_dir: Path, answers: dict[str, Any]) -> Path:
+    """Render the package template into *work_dir* and return the project."""
+    module = load_module_from_path(
+        PROJECT_ROOT / "scripts" / "pull_able_workflow_copier.py"
+    )
+    template_dir = module.ensure_package_template_repo(PROJECT_ROOT)
+    (work_dir / "package").mkdir()
+    result = new_copie(
+        template_dir=template_dir,
+        test_dir=work_dir / "package",
+        config_file=make_copier_config(work_dir),
+    ).copy(extra_answers=answers)
+    if result.exception or result.exit_code != 0 or result.project_dir is None:
+        raise RuntimeError(f"Package template failed: {result.exception}")
+    return result.project_dir
+
+
+def generate_rule(project_dir: Path, answers: dict[str, Any]) -> None:
+    """Run the rule template into *project_dir* in place."""
+    run_copy(
+        str(PROJECT_ROOT),
+        str(project_dir),
+        data=answers,
+        defaults=True,
+        unsafe=True,
+        quiet=True,
+        vcs_ref="HEAD",
+    )
+
+
+###############################################################################
+#  CLI                                                                         #
+###############################################################################
+
+app = typer.Typer(add_completion=False)  # we do not need shell completion
+
+
+@app.command("run")
+def run_cmd(
+    size: list[int] = typer.Option(
+        [10, 100], min=1, help="Report the curve at these rule counts."
+    ),
+    format_code: bool = typer.Option(
+        True, help="Answer format_code, i.e. run black/ruff/snakefmt per rule."
+    ),
+    parse: bool = typer.Option(
+        True, help="Time `snakemake --list-rules` on the final project."
+    ),
+    out: Path | None = typer.Option(None, help="Write the JSON report here."),
+    baseline: Path | None = typer.Option(
+        None, help="Earlier JSON report to compare the latencies against."
+    ),
+    tolerance: float = typer.Option(
+        0.25, help="Allowed relative latency increase over --baseline."
+    ),
+    keep: bool = typer.Option(False, help="Keep the generated project."),
+) -> None:
+    """
+    Generate max(--size) rules into one project and print the scaling curve.
+    """
+    loader = YAML(typ="safe")
+    package_answers = loader.load((EXAMPLE_DIR / "package.yml").read_text()) or {}
+    base_rule = loader.load((EXAMPLE_DIR / "rule.yml").read_text()) or {}
+    n_rules = max(size)
+
+    workspace = RenderWorkspace(keep=keep)
+    work_dir = workspace.acquire("stress")
+    phases: dict[str, dict[str, float]] = {}
+    try:
+        with phase(phases, "package"):
+            project_dir = render_package(work_dir, package_answers)
+        typer.echo(f"Generating {n_rules} rules into {project_dir}")
+        with phase(phases, "rules"):
+            latencies = run_rules(
+                lambda i: generate_rule(
+                    project_dir, rule_answers(base_rule, i, format_code=format_code)
+                ),
+                n_rules,
+                progress=True,
+            )
+        if parse and shutil.which("snakemake"):
+            with phase(phases, "parse"):
+                subprocess.run(
+                    ["snakemake", "--list-rules"],
+                    cwd=project_dir,
+                    check=True,
+                    capture_output=True,
+                )
+    finally:
+        if keep:
+            workspace.release()
+            typer.echo(f"Project kept under {work_dir}")
+        else:
+            workspace.discard(work_dir)
+
+    report = {
+        "rules": n_rules,
+        "format_code": format_code,
+        "phases": phases,
+        "curve": scaling_curve(latencies, size),
+        "latencies_s": [round(x, 4) for x in latencies],
+    }
+
+    typer.echo(f"{'phase':<8} {'seconds':>9} {'rss_mb':>9} {'child_mb':>9}")
+    for name, row in phases.items():
+        typer.echo(
+            f"{name:<8} {row['seconds']:>9.2f} {row['peak_rss_mb']:>9.1f} "
+            f"{row['peak_children_rss_mb']:>9.1f}"
+        )
+    typer.echo(f"{'rules':>6} {'total_s':>9} {'median_s':>9} {'k':>6}")
+    for point in report["curve"]:
+        k = point.get("growth_exponent")
+        typer.echo(
+            f"{point['rules']:>6} {point['total_s']:>9.2f} "
+            f"{point['median_latency_s']:>9.3f} {'' if k is None else f'{k:.2f}':>6}"
+        )
+
+    if out is not None:
+        out.write_text(json.dumps(report, indent=2) + "\n")
+        typer.echo(f"Report written to {out}")
+    if baseline is not None:
+        found = regressions(json.loads(baseline.read_text()), report, tolerance)
+        for line in found:
+            typer.echo(f"REGRESSION {line}", err=True)
+        if found:
+            raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    app()
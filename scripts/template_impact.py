@@ -0,0 +1,350 @@
+"""
+Change-impact selection for the template test tiers.
+
+Maps the files changed in this repository to the rendered files they
+produce, and the rendered files to the *inner* tox environments that
+exercise them, so that `tests/template/tox/test_tox_envs.py` only runs the
+`(variant, env)` pairs affected by a change.
+
+The mapping is deliberately conservative: any changed file it cannot place
+(and any rendered file no rule covers) selects every env.
+
+1.  **Source → rendered**: a file under `template/` renders to the path
+    obtained by dropping `template/` and the `.jinja` suffix, with every
+    `{{ ... }}` and `{% if %}...{% else %}...{% endif %}` replaced by a
+    wildcard and other `{% ... %}` tags removed. Jinja
+    includes (e.g. `includes/rule.smk.jinja`) map to the template files that
+    include them, and tasks to the files they write (`TASK_OUTPUTS`).
+2.  **Rendered → env**: the first matching pattern in `ENV_IMPACT` names
+    the rendered paths through which the envs exercise the file (e.g. the
+    rule tests for `workflow/rules/*`); any other file is exercised
+    directly. An env exercises a path when its `commands` or `changedir` in
+    the rendered `tox.ini` name that path, a directory above or below it
+    (`.` names every path). An env whose paths cannot be told from
+    `tox.ini` exercises every file.
+"""
+
+from __future__ import annotations
+
+import configparser
+import itertools
+import os
+import re
+import shlex
+import subprocess
+from collections.abc import Iterable
+from fnmatch import fnmatch
+from pathlib import Path
+
+# Changes to these select every env of every variant.
+GLOBAL_SOURCES: tuple[str, ...] = (
+    "copier.yml",
+    "extensions/*",
+    "submodules/*",
+    "scripts/copie_helpers.py",
+    # Every template render goes through these.
+    "scripts/render_fanout.py",
+    "scripts/render_profile.py",
+    "scripts/render_workspace.py",
+    "tests/template/*",
+    "tox.ini",
+    "pyproject.toml",
+)
+
+# Rendered files written or rewritten by each Copier task. Unlisted tasks
+# are treated as global sources.
+TASK_OUTPUTS: dict[str, tuple[str, ...]] = {
+    "tasks/append_smk_include.py": ("workflow/rules/includes*.smk",),
+    "tasks/append_smk_rule.py": ("workflow/rules/*.smk",),
+    "tasks/bundle_smk_includes.py": ("workflow/rules/*",),
+    "tasks/rules_index.py": (".copier-answers/rules-index.json",),
+}
+
+# Source files that are not rendered at all.
+INERT_SOURCES: tuple[str, ...] = ("tasks/README.md", "includes/README.md")
+
+_RULE_PATHS = ("workflow/rules", "tests/workflow/rules")
+_SCRIPT_PATHS = ("workflow/scripts", "tests/workflow/scripts", "tests/workflow/rules")
+
+# Rendered path pattern -> rendered paths through which envs exercise it (the
+# tests that read it); the first match wins.
+ENV_IMPACT: tuple[tuple[str, tuple[str, ...]], ...] = (
+    (".copier-answers/rule-blocks/*", _RULE_PATHS),
+    # Read by `tests/workflow/rules/snakemake_session.py` for the batched
+    # dry-run of every rule.
+    (".copier-answers/rules-index.json", ("tests/workflow/rules",)),
+    (".copier-answers/*", ()),
+    ("workflow/rules/*", _RULE_PATHS),
+    ("workflow/scripts/*", _SCRIPT_PATHS),
+)
+
+# Covers every rendered file.
+_ALL = "."
+_BRACES_RE = re.compile(r"\{([^{}]*,[^{}]*)\}")
+_FACTOR_LINE_RE = re.compile(r"^(?P<cond>[\w{}.,!-]+):\s+(?P<value>.*)$")
+
+_INCLUDE_RE = re.compile(
+    r"""\{%-?\s*(?:include|import|extends|from)\s+["']([^"']+)["']"""
+)
+_SKIP_DIRS = {".git", ".tox", ".snakemake", "__pycache__"}
+
+
+# --- git --------------------------------------------------------------------
+def changed_files(repo: Path, since: str) -> set[str]:
+    """
+    Return the repo-relative paths changed since *since*, including staged,
+    unstaged and untracked files.
+    """
+
+    def _git(*args: str) -> list[str]:
+        out = subprocess.check_output(["git", *args], cwd=repo, text=True)
+        return [line for line in out.splitlines() if line.strip()]
+
+    return {
+        *_git("diff", "--name-only", f"{since}...HEAD"),
+        *_git("diff", "--name-only", "HEAD"),
+        *_git("ls-files", "--others", "--exclude-standard"),
+    }
+
+
+# --- Source → rendered -------------------------------------------------------
+def rendered_glob(template_path: str) -> str:
+    """Turn `template/<jinja path>` into a glob over rendered paths."""
+    path = template_path.removeprefix("template/").removesuffix(".jinja")
+    path = re.sub(r"\{\{\s*_copier_conf\.sep\s*\}\}", "/", path)
+    # `{% if %}a{% else %}b{% endif %}` may render either branch.
+    path = re.sub(r"\{%-?\s*if\b.*?%\}.*?\{%-?\s*else\s*-?%\}.*?\{%.*?%\}", "*", path)
+    path = re.sub(r"\{%.*?%\}", "", path)
+    path = re.sub(r"\{\{.*?\}\}", "*", path)
+    return re.sub(r"/+", "/", path)
+
+
+def _includers(repo: Path) -> dict[str, set[str]]:
+    """Map each Jinja-included file to the files that include it."""
+    includers: dict[str, set[str]] = {}
+    for root in ("template", "includes"):
+        for path in (repo / root).rglob("*"):
+            if not path.is_file():
+                continue
+            try:
+                text = path.read_text()
+            except (OSError, UnicodeDecodeError):
+                continue
+            for target in _INCLUDE_RE.findall(text):
+                includers.setdefault(target, set()).add(
+                    path.relative_to(repo).as_posix()
+                )
+    return includers
+
+
+def _template_files_including(source: str, includers: dict[str, set[str]]) -> set[str]:
+    seen: set[str] = set()
+    pending = [source]
+    while pending:
+        for parent in includers.get(pending.pop(), ()):
+            if parent not in seen:
+                seen.add(parent)
+                pending.append(parent)
+    return {path for path in seen if path.startswith("template/")}
+
+
+def impacted_globs(changed: Iterable[str], repo: Path) -> set[str] | None:
+    """
+    Return globs over rendered paths affected by *changed*, or ``None`` when
+    every rendered file must be considered affected.
+
+    Changed files outside the template sources (docs of this repo, unit tests,
+    the changelog, ...) affect nothing.
+    """
+    globs: set[str] = set()
+    includers: dict[str, set[str]] | None = None
+    for source in changed:
+        if any(fnmatch(source, pattern) for pattern in GLOBAL_SOURCES):
+            return None
+        if source in INERT_SOURCES:
+            continue
+        if source.startswith("template/"):
+            if not (repo / source).exists():
+                # A removed template file may leave stale references behind.
+                return None
+            globs.add(rendered_glob(source))
+        elif source.startswith("includes/"):
+            includers = includers if includers is not None else _includers(repo)
+            globs.update(
+                rendered_glob(path)
+                for path in _template_files_including(source, includers)
+            )
+        elif source.startswith("tasks/"):
+            if source not in TASK_OUTPUTS:
+                return None
+            globs.update(TASK_OUTPUTS[source])
+    return globs
+
+
+# --- Rendered → env ---------------------------------------------------------
+def expand_env_names(pattern: str) -> list[str]:
+    """Expand tox braces: ``py{311,312}-lint`` → ``py311-lint``, ``py312-lint``."""
+    parts = _BRACES_RE.split(pattern)
+    choices = [
+        [c.strip() for c in part.split(",")] if i % 2 else [part]
+        for i, part in enumerate(parts)
+    ]
+    return ["".join(combo) for combo in itertools.product(*choices)]
+
+
+def _factors_match(condition: str, env: str) -> bool:
+    """
+    Whether the tox factor *condition* holds for *env*: alternatives are
+    separated by ``,`` (or written with braces), the factors of one
+    alternative by ``-``, and ``!`` negates a factor.
+    """
+    factors = set(env.split("-"))
+    alternatives = [
+        alternative
+        for expanded in expand_env_names(condition)
+        for alternative in expanded.split(",")
+    ]
+    return any(
+        all(
+            f[1:] not in factors if f.startswith("!") else f in factors
+            for f in alternative.split("-")
+        )
+        for alternative in alternatives
+    )
+
+
+def _env_setting(config: configparser.ConfigParser, env: str, key: str) -> list[str]:
+    """The lines of the tox setting *key* for *env*, factor conditions applied."""
+    value = None
+    for section in config.sections():
+        if not section.startswith("testenv:"):
+            continue
+        if env in expand_env_names(section.removeprefix("testenv:")):
+            value = config[section].get(key, value)
+    if value is None and config.has_section("testenv"):
+        value = config["testenv"].get(key)
+    lines = []
+    for line in (value or "").replace("\\\n", " ").splitlines():
+        line = line.strip()
+        match = _FACTOR_LINE_RE.match(line)
+        if match:
+            if not _factors_match(match["cond"], env):
+                continue
+            line = match["value"]
+        if line:
+            lines.append(line)
+    return lines
+
+
+def _path_token(token: str) -> str:
+    if token.startswith("-") and "=" in token:
+        token = token.split("=", 1)[1]
+    return token.replace("{toxinidir}", ".").replace("{tox_root}", ".")
+
+
+def tox_env_paths(project_dir: Path, envs: list[str]) -> dict[str, set[str]]:
+    """
+    Map each env of *envs* to the rendered paths its `commands` and
+    `changedir` name in `<project_dir>/tox.ini`. An env without any existing
+    path, or a project without `tox.ini`, maps to ``{"."}`` (every file).
+    """
+    config = configparser.ConfigParser(interpolation=None, strict=False)
+    try:
+        config.read_string((project_dir / "tox.ini").read_text())
+    except (OSError, configparser.Error):
+        return {env: {_ALL} for env in envs}
+
+    root = project_dir.resolve()
+
+    def rendered_dir(path: Path) -> str | None:
+        """*path* relative to the project, or ``None`` if it names no dir."""
+        if path.is_file():
+            # A file argument (a test module, `mkdocs.yml`) stands for its
+            # directory; one at the project root says nothing.
+            path = path.parent
+            if path == root:
+                return None
+        if not path.is_dir() or (path != root and root not in path.parents):
+            return None
+        return path.relative_to(root).as_posix()
+
+    paths: dict[str, set[str]] = {}
+    for env in envs:
+        found: set[str] = set()
+        cwd = root
+        for changedir in _env_setting(config, env, "changedir")[:1]:
+            cwd = Path(os.path.normpath(root / _path_token(changedir)))
+            if cwd != root and rendered_dir(cwd):
+                found.add(cwd.relative_to(root).as_posix())
+        for line in _env_setting(config, env, "commands"):
+            try:
+                tokens = [_path_token(token) for token in shlex.split(line)]
+            except ValueError:
+                continue
+            for token in tokens:
+                if "{" in token or "://" in token:
+                    continue
+                rel = rendered_dir(Path(os.path.normpath(cwd / token)))
+                if rel is not None:
+                    found.add(rel)
+        paths[env] = found or {_ALL}
+    return paths
+
+
+def _overlaps(path: str, other: str) -> bool:
+    """Whether one of the rendered paths is at or below the other."""
+    return (
+        _ALL in (path, other)
+        or path == other
+        or other.startswith(f"{path}/")
+        or path.startswith(f"{other}/")
+    )
+
+
+def rendered_files(project_dir: Path) -> list[str]:
+    """List the files of a rendered project, relative to *project_dir*."""
+    files = []
+    for path in project_dir.rglob("*"):
+        rel = path.relative_to(project_dir)
+        if path.is_file() and not _SKIP_DIRS.intersection(rel.parts):
+            files.append(rel.as_posix())
+    return files
+
+
+def envs_for_file(rendered: str, env_paths: dict[str, set[str]]) -> list[str]:
+    """
+    Return the envs of *env_paths* (see `tox_env_paths`) that exercise the
+    rendered file.
+    """
+    targets: tuple[str, ...] = (rendered,)
+    for pattern, paths in ENV_IMPACT:
+        if fnmatch(rendered, pattern):
+            targets = paths
+            break
+    return [
+        env
+        for env, paths in env_paths.items()
+        if any(_overlaps(path, target) for path in paths for target in targets)
+    ]
+
+
+def affected_envs(
+    project_dir: Path, envs: list[str], globs: set[str] | None
+) -> list[str]:
+    """
+    Return the envs of the variant rendered at *project_dir* that exercise
+    a rendered file matching *globs*, in the order of *envs*.
+    """
+    if globs is None:
+        return list(envs)
+    if not globs:
+        return []
+
+    env_paths = tox_env_paths(project_dir, envs)
+    selected: set[str] = set()
+    for rendered in rendered_files(project_dir):
+        if any(fnmatch(rendered, pattern) for pattern in globs):
+            selected.update(envs_for_file(rendered, env_paths))
+            if len(selected) == len(envs):
+                break
+    return [env for env in envs if env in selected]
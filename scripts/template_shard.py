@@ -0,0 +1,128 @@
+"""
+Duration-balanced sharding of the `template-tox` `(variant, env)` matrix.
+
+`--template-shard i/N` keeps the i-th of N shards. Shards are balanced with
+the longest-processing-time-first rule: pairs are sorted by expected
+duration and each goes to the currently lightest shard. Expected durations
+come from the durations file written after every run; pairs without history
+fall back to a cost heuristic per env kind.
+
+Every shard job computes the same split, so all jobs must see the same
+durations file (commit it, or restore it from a shared CI cache).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+from fnmatch import fnmatch
+from pathlib import Path
+
+DURATIONS_FILE = ".template-tox-durations.json"
+
+# Weight of the newest measurement in the stored moving average.
+SMOOTHING = 0.5
+
+# Rough seconds per env kind (env name without its `pyXY-` factor), used
+# when a pair has no recorded duration; the first match wins.
+HEURISTIC_COSTS: tuple[tuple[str, float], ...] = (
+    ("workflow-rules*", 600.0),
+    ("workflow-*", 300.0),
+    ("typecheck*", 120.0),
+    ("docs", 90.0),
+    ("lint", 30.0),
+)
+DEFAULT_COST = 120.0
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse ``"i/N"`` (1-based) into ``(i, N)``."""
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value)
+    if match is None:
+        raise ValueError(f"Expected a shard as 'i/N', got {value!r}.")
+    index, total = int(match.group(1)), int(match.group(2))
+    if not 1 <= index <= total:
+        raise ValueError(f"Shard index must be between 1 and {total}, got {index}.")
+    return index, total
+
+
+def pair_id(variant_id: str, env_name: str) -> str:
+    return f"{variant_id}:{env_name}"
+
+
+def heuristic_cost(env_name: str) -> float:
+    """Guess the duration of *env_name* from its kind."""
+    kind = re.sub(r"^py\d+-", "", env_name)
+    for pattern, cost in HEURISTIC_COSTS:
+        if fnmatch(kind, pattern):
+            return cost
+    return DEFAULT_COST
+
+
+def expected_duration(
+    variant_id: str, env_name: str, durations: dict[str, float]
+) -> float:
+    return durations.get(pair_id(variant_id, env_name), heuristic_cost(env_name))
+
+
+def select_shard(
+    pairs: list[tuple[str, str]],
+    index: int,
+    total: int,
+    durations: dict[str, float],
+) -> list[tuple[str, str]]:
+    """
+    Return the pairs of shard *index* (1-based) out of *total*, in their
+    original order.
+    """
+    loads = [0.0] * total
+    assigned: dict[tuple[str, str], int] = {}
+    ranked = sorted(
+        pairs,
+        key=lambda pair: (-expected_duration(*pair, durations), pair_id(*pair)),
+    )
+    for pair in ranked:
+        shard = min(range(total), key=lambda i: (loads[i], i))
+        loads[shard] += expected_duration(*pair, durations)
+        assigned[pair] = shard + 1
+    return [pair for pair in pairs if assigned[pair] == index]
+
+
+def load_durations(path: Path) -> dict[str, float]:
+    try:
+        data = json.loads(path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {k: float(v) for k, v in data.items() if isinstance(v, (int, float))}
+
+
+def save_durations(
+    path: Path, measured: dict[str, float], *, smoothing: float = SMOOTHING
+) -> dict[str, float]:
+    """
+    Merge *measured* into the durations stored at *path* and write them back.
+
+    Known pairs keep a moving average so one noisy run does not reshuffle
+    every shard.
+    """
+    durations = load_durations(path)
+    for key, seconds in measured.items():
+        if key in durations:
+            seconds = smoothing * seconds + (1 - smoothing) * durations[key]
+        durations[key] = round(seconds, 3)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as fp:
+            json.dump(durations, fp, indent=2, sort_keys=True)
+            fp.write("\n")
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return durations
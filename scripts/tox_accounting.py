@@ -0,0 +1,322 @@
+"""
+Resource accounting of the *inner* tox runs of the `template-tox` tier.
+
+`tests/template/tox/test_tox_envs.py` measures the setup (`tox --notest`)
+and the run of every inner env with `measure()`:
+
+- wall time;
+- CPU time (user + system) of the whole process tree, from
+  ``getrusage(RUSAGE_CHILDREN)`` deltas: tox and everything it starts are
+  reaped before the measurement ends, and nothing else runs children of the
+  pytest process meanwhile;
+- peak RSS of the process tree, sampled from ``/proc`` every `INTERVAL_S`
+  (the sum over all live descendants, so a test runner and its workers add
+  up), and the largest RSS of a single process;
+- bytes read from and written to storage by the tree, from the
+  ``/proc/self/io`` deltas (reaped children's counters add up to their
+  parent's).
+
+The `/proc` figures are ``None`` on systems without it. The measurements
+go to a JSON report and the pytest terminal summary; `Budget`s
+(``--template-budget``) fail an env that exceeds them.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import resource
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any
+
+from scripts.render_workspace import parse_size
+
+USAGE_REPORT_FILE = ".template-tox-usage.json"
+
+# Seconds between two samples of the process tree RSS.
+INTERVAL_S = 0.2
+
+_PROC = Path("/proc")
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+###############################################################################
+#  Usage                                                                       #
+###############################################################################
+
+
+@dataclass
+class Usage:
+    """Resources used by one measured process tree (or a sum of them)."""
+
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_rss_bytes: int | None = None  # sum over the live tree, sampled
+    max_process_rss_bytes: int | None = None  # largest single process, sampled
+    read_bytes: int | None = None
+    write_bytes: int | None = None
+
+    def __add__(self, other: Usage) -> Usage:
+        """Combine sequential phases: times and bytes add, peaks take the max."""
+
+        def peak(a: int | None, b: int | None) -> int | None:
+            return None if a is None and b is None else max(a or 0, b or 0)
+
+        def total(a: int | None, b: int | None) -> int | None:
+            return None if a is None and b is None else (a or 0) + (b or 0)
+
+        return Usage(
+            wall_s=round(self.wall_s + other.wall_s, 3),
+            cpu_s=round(self.cpu_s + other.cpu_s, 3),
+            peak_rss_bytes=peak(self.peak_rss_bytes, other.peak_rss_bytes),
+            max_process_rss_bytes=peak(
+                self.max_process_rss_bytes, other.max_process_rss_bytes
+            ),
+            read_bytes=total(self.read_bytes, other.read_bytes),
+            write_bytes=total(self.write_bytes, other.write_bytes),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Usage:
+        return cls(**{k: data.get(k) for k in cls.__dataclass_fields__})
+
+
+def _children_cpu_s() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _self_io() -> tuple[int, int] | None:
+    try:
+        text = (_PROC / "self" / "io").read_text()
+    except OSError:
+        return None
+    fields = dict(line.split(": ") for line in text.splitlines() if ": " in line)
+    return int(fields["read_bytes"]), int(fields["write_bytes"])
+
+
+def _tree_rss(root_pid: int) -> tuple[int, int] | None:
+    """Return ``(total, largest)`` RSS in bytes of the descendants of *root_pid*."""
+    children: dict[int, list[int]] = {}
+    try:
+        entries = list(_PROC.iterdir())
+    except OSError:
+        return None
+    for entry in entries:
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:  # exited meanwhile
+            continue
+        # The command name may contain spaces; the ppid follows its ")".
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    total = largest = 0
+    stack = list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            rss = int((_PROC / str(pid) / "statm").read_text().split()[1]) * _PAGE_SIZE
+        except (OSError, IndexError, ValueError):
+            continue
+        total += rss
+        largest = max(largest, rss)
+    return total, largest
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, interval: float) -> None:
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak: int | None = None
+        self.largest: int | None = None
+        self._stop_event = threading.Event()
+
+    def sample(self) -> None:
+        rss = _tree_rss(os.getpid())
+        if rss is not None:
+            self.peak = max(self.peak or 0, rss[0])
+            self.largest = max(self.largest or 0, rss[1])
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            self.sample()
+            self._stop_event.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+@contextmanager
+def measure(interval: float = INTERVAL_S) -> Iterator[Usage]:
+    """
+    Measure the child processes started and reaped inside the block.
+
+    The yielded `Usage` is filled in when the block exits, also when it
+    raises (e.g. ``subprocess.run(..., check=True)``).
+    """
+    usage = Usage()
+    sampler = _Sampler(interval)
+    io_before = _self_io()
+    cpu_before = _children_cpu_s()
+    start = time.perf_counter()
+    sampler.start()
+    try:
+        yield usage
+    finally:
+        sampler.stop()
+        usage.wall_s = round(time.perf_counter() - start, 3)
+        usage.cpu_s = round(_children_cpu_s() - cpu_before, 3)
+        usage.peak_rss_bytes = sampler.peak
+        usage.max_process_rss_bytes = sampler.largest
+        io_after = _self_io()
+        if io_before is not None and io_after is not None:
+            usage.read_bytes = io_after[0] - io_before[0]
+            usage.write_bytes = io_after[1] - io_before[1]
+
+
+###############################################################################
+#  Budgets                                                                     #
+###############################################################################
+
+# Budget metric -> (`Usage` field, parser of the limit).
+METRICS: dict[str, tuple[str, Any]] = {
+    "wall": ("wall_s", float),
+    "cpu": ("cpu_s", float),
+    "rss": ("peak_rss_bytes", parse_size),
+    "read": ("read_bytes", parse_size),
+    "write": ("write_bytes", parse_size),
+}
+
+
+@dataclass
+class Budget:
+    """Limits for the inner envs whose name matches `pattern`."""
+
+    pattern: str
+    limits: dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def parse(cls, spec: str) -> Budget:
+        """
+        Parse ``"PATTERN:METRIC=LIMIT[,METRIC=LIMIT...]"``, e.g.
+        ``"py312-workflow-*:rss=4G,cpu=900"``. Metrics are `METRICS`; times
+        are seconds and sizes take `K`/`M`/`G` suffixes.
+        """
+        pattern, sep, rest = spec.rpartition(":")
+        if not sep or not pattern or not rest:
+            raise ValueError(f"Expected a budget as 'ENV:metric=limit', got {spec!r}.")
+        limits: dict[str, float] = {}
+        for item in rest.split(","):
+            metric, sep, value = item.partition("=")
+            metric = metric.strip().lower()
+            if not sep or metric not in METRICS:
+                raise ValueError(
+                    f"Unknown budget {item!r} in {spec!r}; "
+                    f"expected one of {', '.join(METRICS)}."
+                )
+            limits[metric] = float(METRICS[metric][1](value.strip()))
+        return cls(pattern, limits)
+
+    def violations(self, env_name: str, usage: Usage) -> list[str]:
+        """Describe every limit *usage* of *env_name* exceeds."""
+        if not fnmatch(env_name, self.pattern):
+            return []
+        found = []
+        for metric, limit in self.limits.items():
+            value = getattr(usage, METRICS[metric][0])
+            if value is not None and value > limit:
+                found.append(
+                    f"{metric} {format_metric(metric, value)} > "
+                    f"{format_metric(metric, limit)} (budget {self.pattern!r})"
+                )
+        return found
+
+
+def parse_budgets(specs: list[str] | None) -> list[Budget]:
+    return [Budget.parse(spec) for spec in specs or []]
+
+
+def check_budgets(budgets: list[Budget], env_name: str, usage: Usage) -> list[str]:
+    return [v for budget in budgets for v in budget.violations(env_name, usage)]
+
+
+def format_metric(metric: str, value: float | None) -> str:
+    if value is None:
+        return "n/a"
+    if METRICS[metric][1] is float:
+        return f"{value:.1f}s"
+    return format_bytes(value)
+
+
+def format_bytes(value: float | None) -> str:
+    if value is None:
+        return "n/a"
+    if value < 1024:
+        return f"{value:.0f}B"
+    for unit in ("K", "M", "G"):
+        value /= 1024
+        if value < 1024 or unit == "G":
+            break
+    return f"{value:.1f}{unit}"
+
+
+###############################################################################
+#  Report                                                                      #
+###############################################################################
+
+
+def write_report(path: Path, entries: dict[str, dict[str, Any]]) -> None:
+    """
+    Write the usage of this session's inner envs to *path* as JSON.
+
+    *entries* maps ``"variant:env"`` to ``{"setup": Usage, "run": Usage,
+    "total": Usage, "replayed": bool, "violations": [...]}``.
+    """
+    data = {
+        pair: {
+            key: value.to_dict() if isinstance(value, Usage) else value
+            for key, value in entry.items()
+        }
+        for pair, entry in sorted(entries.items())
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def summary_lines(entries: dict[str, dict[str, Any]]) -> list[str]:
+    """One line per env, heaviest peak RSS first."""
+
+    def rss(item: tuple[str, dict[str, Any]]) -> int:
+        return item[1]["total"].peak_rss_bytes or 0
+
+    width = max((len(pair) for pair in entries), default=len("variant:env"))
+    header = (
+        f"{'variant:env':<{width}}  {'wall':>8}  {'cpu':>8}  {'peak rss':>9}  "
+        f"{'read':>8}  {'write':>8}"
+    )
+    lines = [header]
+    for pair, entry in sorted(entries.items(), key=rss, reverse=True):
+        total: Usage = entry["total"]
+        flags = " (replayed)" if entry.get("replayed") else ""
+        if entry.get("violations"):
+            flags += " OVER BUDGET"
+        lines.append(
+            f"{pair:<{width}}  {total.wall_s:>7.1f}s  {total.cpu_s:>7.1f}s  "
+            f"{format_bytes(total.peak_rss_bytes):>9}  "
+            f"{format_bytes(total.read_bytes):>8}  "
+            f"{format_bytes(total.write_bytes):>8}{flags}"
+        )
+    return lines
@@ -0,0 +1,148 @@
+"""
+Local result cache for the *inner* tox envs of the `template-tox` tier.
+
+A passing inner tox env is recorded in the pytest cache (`.pytest_cache/`)
+under a key built from everything that can change its outcome:
+
+- the git tree hashes of the rule template sources at the rendered ref;
+- the package template ref;
+- the answers of the example;
+- the env name;
+- the tox and Python versions.
+
+`tests/template/tox/test_tox_envs.py` replays a recorded pass (including its
+output) instead of running tox again. Only passes are recorded, so a failure
+is always re-run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import platform
+import subprocess
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pytest
+
+CACHE_PREFIX = "template-tox/results"
+
+# Paths of the rule template repository that are rendered into a project.
+TEMPLATE_SOURCES: tuple[str, ...] = (
+    "copier.yml",
+    "template",
+    "includes",
+    "tasks",
+    "extensions",
+)
+
+
+def _digest(payload: object) -> str:
+    text = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def template_tree_hash(
+    repo: Path, ref: str = "HEAD", paths: tuple[str, ...] = TEMPLATE_SOURCES
+) -> str:
+    """
+    Hash the git objects of *paths* at *ref*.
+
+    Changes elsewhere in the repository (docs, unit tests, the changelog)
+    keep the hash, and so the recorded results, unchanged.
+    """
+    objects = {}
+    for path in paths:
+        result = subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", f"{ref}:{path}"],
+            cwd=repo,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        objects[path] = result.stdout.strip() or None
+    return _digest(objects)
+
+
+def answers_hash(*answers: dict[str, Any]) -> str:
+    """Hash the answer sets used to render a variant."""
+    return _digest(list(answers))
+
+
+@lru_cache(maxsize=1)
+def tool_versions() -> dict[str, str]:
+    """Return the tox and Python versions that run the inner envs."""
+    try:
+        tox = subprocess.check_output(["tox", "--version"], text=True).split()[0]
+    except (FileNotFoundError, subprocess.CalledProcessError, IndexError):
+        tox = "unknown"
+    return {"tox": tox, "python": platform.python_version()}
+
+
+def result_key(
+    *,
+    template_tree: str,
+    package_ref: str,
+    answers: str,
+    env_name: str,
+    versions: dict[str, str] | None = None,
+) -> str:
+    """Return the cache key of one `(variant, env)` outcome."""
+    parts = {
+        "template_tree": template_tree,
+        "package_ref": package_ref,
+        "answers": answers,
+        "env_name": env_name,
+        "versions": versions if versions is not None else tool_versions(),
+    }
+    return f"{CACHE_PREFIX}/{_digest(parts)[:32]}"
+
+
+def lookup(cache: pytest.Cache | None, key: str) -> dict[str, Any] | None:
+    """
+    Return the recorded pass stored under *key*, if any.
+
+    *cache* is ``None`` when pytest runs with ``-p no:cacheprovider``.
+    """
+    if cache is None:
+        return None
+    entry = cache.get(key, None)
+    if not isinstance(entry, dict) or entry.get("outcome") != "passed":
+        return None
+    return entry
+
+
+def record_pass(
+    cache: pytest.Cache | None,
+    key: str,
+    *,
+    variant_id: str,
+    env_name: str,
+    duration_s: float,
+    stdout: str,
+    stderr: str,
+    usage: dict[str, Any] | None = None,
+) -> None:
+    """
+    Record a passing run of *env_name* for *variant_id* under *key*, with
+    its resource *usage* (SEE: scripts/tox_accounting.py).
+    """
+    if cache is None:
+        return
+    cache.set(
+        key,
+        {
+            "outcome": "passed",
+            "variant_id": variant_id,
+            "env_name": env_name,
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "duration_s": round(duration_s, 3),
+            "stdout": stdout,
+            "stderr": stderr,
+            "usage": usage,
+        },
+    )
@@ -3,6 +3,9 @@
 Append `include: "<NAME>"` as the *second-to-last* line of
 `workflow/rules/includes.smk`, keeping the final blank line.
 
+When the includes bundle is enabled (see `bundle_smk_includes.py`) the line
+goes to `workflow/rules/includes.members.smk` instead.
+
 Usage
 -----
     python append_smk_include.py <smk_file_name>
@@ -18,6 +21,9 @@ def main() -> None:
 
     smk_file = sys.argv[1]
     target = Path("workflow/rules/includes.smk")
+    members = target.with_name("includes.members.smk")
+    if members.exists():
+        target = members
 
     if not target.exists():
         sys.exit(
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Insert the staged rule block `.copier-answers/rule-blocks/rule-<NAME>.smk`
+into `workflow/rules/<smk_file_name>` in place.
+
+The block is wrapped in marker comments that record a hash of the inserted
+text, which makes the task
+
+- idempotent: re-inserting an identical block is a no-op;
+- update-friendly: an untouched block is replaced by the newly rendered one;
+- conflict-aware: a block edited in the smk file since it was inserted, or a
+  rule of the same name defined outside the markers, is never overwritten.
+
+With `--format` only the staged block is passed through `snakefmt`; the rest
+of the (possibly large) smk file is left byte-for-byte unchanged.
+
+The staged block stays in the project after it is inserted. It is a rendered
+file like any other, so `copier update` needs it to compute the new block, and
+a conflict is resolved by merging it by hand.
+
+Usage
+-----
+    python append_smk_rule.py <rule_name> <smk_file_name> [--format|--no-format]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+BLOCKS_DIR = Path(".copier-answers/rule-blocks")
+RULES_DIR = Path("workflow/rules")
+
+BEGIN = "# >>> able-workflow-rule-copier: rule {name} (sha256:{digest}) >>>"
+END = "# <<< able-workflow-rule-copier: rule {name} <<<"
+
+
+def block_digest(block: str) -> str:
+    return hashlib.sha256(block.encode()).hexdigest()[:12]
+
+
+def format_block(block: str) -> str:
+    """Format *block* alone with snakefmt, falling back to the input."""
+    if not shutil.which("snakefmt"):
+        sys.stderr.write("WARNING: snakefmt not found; block left unformatted.\n")
+        return block
+    cmd = ["snakefmt", "-"]
+    if Path("pyproject.toml").is_file():
+        cmd[1:1] = ["--config", "pyproject.toml"]
+    result = subprocess.run(
+        cmd, input=block, capture_output=True, text=True, check=False
+    )
+    if result.returncode:
+        sys.stderr.write("WARNING: snakefmt failed; block left unformatted.\n")
+        sys.stderr.write(result.stderr)
+        return block
+    return result.stdout
+
+
+def _managed_region(text: str, rule_name: str) -> re.Match[str] | None:
+    name = re.escape(rule_name)
+    return re.search(
+        rf"^# >>> able-workflow-rule-copier: rule {name} "
+        rf"\(sha256:(?P<digest>[0-9a-f]+)\) >>>\n"
+        rf"(?P<block>.*?)"
+        rf"^# <<< able-workflow-rule-copier: rule {name} <<<\n?",
+        text,
+        flags=re.MULTILINE | re.DOTALL,
+    )
+
+
+def _defines_rule(text: str, rule_name: str) -> bool:
+    return (
+        re.search(rf"^rule {re.escape(rule_name)}\s*:", text, re.MULTILINE) is not None
+    )
+
+
+def insert_block(target: Path, rule_name: str, block: str) -> str:
+    """
+    Insert or refresh the managed *block* for *rule_name* in *target*.
+
+    Returns ``"inserted"``, ``"updated"`` or ``"unchanged"``; raises
+    ``SystemExit`` on a conflict without touching *target*.
+    """
+    if not block.endswith("\n"):
+        block += "\n"
+    managed = (
+        BEGIN.format(name=rule_name, digest=block_digest(block))
+        + "\n"
+        + block
+        + END.format(name=rule_name)
+        + "\n"
+    )
+
+    text = target.read_text() if target.exists() else ""
+    region = _managed_region(text, rule_name)
+
+    if region is None:
+        if _defines_rule(text, rule_name):
+            sys.exit(
+                f"ERROR: {target} already defines rule '{rule_name}' outside a "
+                "block managed by able-workflow-rule-copier. Rename the rule or "
+                "remove the existing definition."
+            )
+        # Two blank lines between top-level blocks, as snakefmt would.
+        head = text.rstrip("\n")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(f"{head}\n\n\n{managed}" if head else managed)
+        return "inserted"
+
+    current = region.group("block")
+    if current == block:
+        return "unchanged"
+    if block_digest(current) != region.group("digest"):
+        sys.exit(
+            f"ERROR: rule '{rule_name}' in {target} was edited since it was "
+            f"inserted, so it was not overwritten. Merge the rendered block in "
+            f"{BLOCKS_DIR / f'rule-{rule_name}.smk'} by hand, then update the "
+            "sha256 in its start marker to match."
+        )
+    target.write_text(text[: region.start()] + managed + text[region.end() :])
+    return "updated"
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = sys.argv[1:] if argv is None else argv
+    flags = [a for a in args if a.startswith("--")]
+    positional = [a for a in args if not a.startswith("--")]
+    if len(positional) != 2 or set(flags) - {"--format", "--no-format"}:
+        sys.exit(
+            "Usage: append_smk_rule.py <rule_name> <smk_file_name> "
+            "[--format|--no-format]"
+        )
+    rule_name, smk_file = positional
+
+    staged = BLOCKS_DIR / f"rule-{rule_name}.smk"
+    if not staged.exists():
+        sys.exit(f"ERROR: {staged} not found; nothing to append.")
+
+    block = staged.read_text()
+    if "--format" in flags:
+        block = format_block(block)
+
+    target = RULES_DIR / smk_file
+    if not target.exists():
+        sys.stderr.write(f"WARNING: {target} does not exist yet; creating it.\n")
+    outcome = insert_block(target, rule_name, block)
+    sys.stderr.write(f"Rule '{rule_name}' {outcome} in {target}.\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Serve `workflow/rules/includes.smk` from one bundled file instead of one
+`include:` per rule.
+
+In bundle mode
+
+- `includes.members.smk` holds the per-rule `include:` lines that used to be
+  in `includes.smk` (`append_smk_include.py` appends there);
+- `includes.bundle.smk` inlines every member found in `workflow/rules/`, so
+  Snakemake opens and parses a single file at startup;
+- `includes.smk` is replaced by a short pointer that calls `build()` and then
+  includes the bundle.
+
+`build()` only stats the members while the bundle is fresh. A member whose
+size or mtime changed is re-read and only its segment of the bundle is
+replaced; the bundle is rewritten only when its text actually changed. The
+per-rule smk files stay the source of truth and are never modified.
+
+This file is copied into projects as `workflow/rules/bundle_includes.py`, so
+it must only use the standard library.
+
+Usage
+-----
+    python bundle_includes.py [--rules-dir workflow/rules]
+    python bundle_includes.py --unbundle [--rules-dir workflow/rules]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+RULES_DIR = Path("workflow/rules")
+INCLUDES = "includes.smk"
+MEMBERS = "includes.members.smk"
+BUNDLE = "includes.bundle.smk"
+MANIFEST = ".includes.bundle.json"
+HELPER = "bundle_includes.py"
+MANIFEST_VERSION = 1
+
+POINTER = f"""\
+# Generated by {HELPER} (able-workflow-rule-copier includes bundle).
+# Add `include:` lines to {MEMBERS}, not here. {BUNDLE} inlines those
+# members and is rebuilt at startup whenever one of them changes.
+# Run `python workflow/rules/{HELPER} --unbundle` to switch back.
+from runpy import run_path as _run_path
+
+_run_path(str(workflow.current_basedir) + "/{HELPER}")["build"](
+    str(workflow.current_basedir)
+)
+
+
+include: "{BUNDLE}"
+"""
+
+BUNDLE_HEADER = f"# Generated from {MEMBERS} by {HELPER}; do not edit.\n"
+SEGMENT_BEGIN = "# >>> includes bundle member: {name} >>>\n"
+SEGMENT_END = "# <<< includes bundle member: {name} <<<\n"
+
+_INCLUDE_RE = re.compile(r"""^include:\s*(["'])(?P<path>[^"']+)\1\s*(#.*)?$""")
+_SEGMENT_RE = re.compile(
+    r"^# >>> includes bundle member: (?P<name>\S+) >>>\n"
+    r"(?P<text>.*?)"
+    r"^# <<< includes bundle member: (?P=name) <<<\n",
+    flags=re.MULTILINE | re.DOTALL,
+)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Replace *path* in one step; parallel Snakemake jobs may build at once."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as fp:
+            fp.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _stat(path: Path) -> list[int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def inlined_members(rules_dir: Path, members_text: str) -> list[str]:
+    """
+    Return the members of *members_text* that can be inlined.
+
+    Only files directly inside *rules_dir* qualify: their relative paths
+    resolve the same way from the bundle. Other `include:` lines are copied
+    into the bundle verbatim.
+    """
+    members = []
+    for line in members_text.splitlines():
+        match = _INCLUDE_RE.match(line)
+        if match is None:
+            continue
+        name = match.group("path")
+        if "/" not in name and name not in members and (rules_dir / name).is_file():
+            members.append(name)
+    return members
+
+
+def load_manifest(path: Path) -> dict[str, Any]:
+    try:
+        manifest = json.loads(path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def render_bundle(members_text: str, segments: dict[str, str]) -> str:
+    """Expand the inlined members of *members_text* from *segments*."""
+    parts = [BUNDLE_HEADER]
+    for line in members_text.splitlines(keepends=True):
+        match = _INCLUDE_RE.match(line.rstrip("\n"))
+        name = match.group("path") if match else None
+        if name in segments:
+            text = segments.pop(name)
+            if text and not text.endswith("\n"):
+                text += "\n"
+            parts += [SEGMENT_BEGIN.format(name=name), text]
+            parts.append(SEGMENT_END.format(name=name))
+        else:
+            parts.append(line if line.endswith("\n") else line + "\n")
+    return "".join(parts)
+
+
+def build(rules_dir: Path | str = RULES_DIR) -> str:
+    """
+    Bring the bundle in *rules_dir* up to date.
+
+    Returns ``"fresh"`` when nothing changed, ``"refreshed"`` when only the
+    recorded stats changed (e.g. a member was touched or checked out again)
+    and ``"rebuilt"`` when the bundle text was rewritten.
+    """
+    rules_dir = Path(rules_dir)
+    members_path = rules_dir / MEMBERS
+    bundle_path = rules_dir / BUNDLE
+    manifest_path = rules_dir / MANIFEST
+
+    manifest = load_manifest(manifest_path)
+    members_stat = _stat(members_path)
+    if members_stat is None:
+        sys.exit(f"ERROR: {members_path} not found; run {HELPER} to enable bundling.")
+
+    recorded = manifest.get("members", {})
+    if (
+        bundle_path.exists()
+        and manifest.get("members_file") == members_stat
+        and all(_stat(rules_dir / name) == stat for name, stat in recorded.items())
+    ):
+        return "fresh"
+
+    members_text = members_path.read_text()
+    members = inlined_members(rules_dir, members_text)
+    stats = {name: _stat(rules_dir / name) for name in members}
+
+    old_text = bundle_path.read_text() if bundle_path.exists() else ""
+    old_segments = {
+        m.group("name"): m.group("text") for m in _SEGMENT_RE.finditer(old_text)
+    }
+    segments = {
+        name: (
+            old_segments[name]
+            if name in old_segments and recorded.get(name) == stats[name]
+            else (rules_dir / name).read_text()
+        )
+        for name in members
+    }
+
+    new_text = render_bundle(members_text, segments)
+    status = "refreshed"
+    if new_text != old_text:
+        _write_atomic(bundle_path, new_text)
+        status = "rebuilt"
+    _write_atomic(
+        manifest_path,
+        json.dumps(
+            {
+                "version": MANIFEST_VERSION,
+                "members_file": members_stat,
+                "members": stats,
+            },
+            indent=2,
+            sort_keys=True,
+        )
+        + "\n",
+    )
+    return status
+
+
+def _ignore_artifacts(rules_dir: Path) -> None:
+    gitignore = rules_dir / ".gitignore"
+    lines = gitignore.read_text().splitlines() if gitignore.exists() else []
+    missing = [name for name in (BUNDLE, MANIFEST) if name not in lines]
+    if missing:
+        gitignore.write_text("\n".join([*lines, *missing]) + "\n")
+
+
+def enable(rules_dir: Path = RULES_DIR, helper_source: Path | None = None) -> str:
+    """
+    Switch *rules_dir* to bundle mode and build the bundle.
+
+    The current `includes.smk` becomes `includes.members.smk` unless bundle
+    mode is already on. *helper_source* (this file) is copied to
+    `bundle_includes.py` so the pointer can rebuild the bundle at startup.
+    """
+    includes_path = rules_dir / INCLUDES
+    members_path = rules_dir / MEMBERS
+    if not members_path.exists():
+        if not includes_path.exists():
+            sys.exit(f"ERROR: {includes_path} not found; nothing to bundle.")
+        members_path.write_text(includes_path.read_text())
+    helper = rules_dir / HELPER
+    if helper_source is not None and helper_source != helper.resolve():
+        helper.write_text(helper_source.read_text())
+    if not includes_path.exists() or includes_path.read_text() != POINTER:
+        includes_path.write_text(POINTER)
+    _ignore_artifacts(rules_dir)
+    return build(rules_dir)
+
+
+def disable(rules_dir: Path = RULES_DIR) -> None:
+    """Restore per-file includes and delete the generated bundle files."""
+    members_path = rules_dir / MEMBERS
+    if not members_path.exists():
+        return
+    (rules_dir / INCLUDES).write_text(members_path.read_text())
+    for name in (MEMBERS, BUNDLE, MANIFEST):
+        (rules_dir / name).unlink(missing_ok=True)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rules-dir", type=Path, default=RULES_DIR)
+    parser.add_argument(
+        "--unbundle",
+        action="store_true",
+        help=f"Restore per-file includes from {MEMBERS}.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.unbundle:
+        disable(args.rules_dir)
+        sys.stderr.write(
+            f"Restored per-file includes in {args.rules_dir / INCLUDES}.\n"
+        )
+        return
+    status = enable(args.rules_dir, helper_source=Path(__file__).resolve())
+    sys.stderr.write(f"Includes bundle {status}: {args.rules_dir / BUNDLE}.\n")
+
+
+if __name__ == "__main__":
+    main()
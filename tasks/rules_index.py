@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Register the rendered rule in `.copier-answers/rules-index.json`.
+
+The index records which rules, smk files, script directories, conda
+environment keys and package modules already exist in the project, so that
+`copier.yml` validators (through `_external_data`) and other tasks can answer
+"does this already exist?" with a dictionary lookup instead of scanning the
+project tree.
+
+The index is bootstrapped once from the existing rule answers files when it
+does not exist yet; afterwards every render only updates its own entry.
+
+Usage
+-----
+    python rules_index.py --rule-name <name> --smk-file <file.smk> \\
+        --script <path/to/script.py> [--conda-env-key <KEY>] \\
+        [--module <module_type>/<module_name>] [--answers-file <path>] \\
+        [--operation copy|update]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+INDEX_PATH = Path(".copier-answers/rules-index.json")
+INDEX_VERSION = 2
+
+# Answers files written by earlier renders, used to bootstrap a missing index.
+ANSWERS_GLOBS = ("copier-answers/rule-*.yml", ".copier-answers/rule-*.yml")
+
+# Reverse lookups derived from `rules`: lookup key -> field of a rule entry.
+LOOKUPS = {
+    "smk_files": "smk_file",
+    "script_dirs": "script_dir",
+    "conda_env_keys": "conda_env_key",
+    "modules": "module",
+}
+
+
+def empty_index() -> dict[str, Any]:
+    return {"version": INDEX_VERSION, "rules": {}, **{k: {} for k in LOOKUPS}}
+
+
+def load_index(path: Path = INDEX_PATH) -> dict[str, Any] | None:
+    """Return the index stored at *path*, or ``None`` if it must be rebuilt."""
+    try:
+        index = json.loads(path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+        return None
+    return index
+
+
+def save_index(index: dict[str, Any], path: Path = INDEX_PATH) -> None:
+    """Atomically write *index* so validators never read a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as fp:
+            json.dump(index, fp, indent=2, sort_keys=True)
+            fp.write("\n")
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def unregister_rule(index: dict[str, Any], rule_name: str) -> None:
+    """Drop *rule_name* and its reverse lookups from *index* (if present)."""
+    entry = index["rules"].pop(rule_name, None)
+    if entry is None:
+        return
+    for lookup, field in LOOKUPS.items():
+        key = entry.get(field)
+        owners = index[lookup].get(key, [])
+        if rule_name in owners:
+            owners.remove(rule_name)
+        if not owners:
+            index[lookup].pop(key, None)
+
+
+def register_rule(
+    index: dict[str, Any],
+    *,
+    rule_name: str,
+    smk_file: str,
+    script: str,
+    conda_env_key: str = "",
+    module: str = "",
+    answers_file: str = "",
+) -> None:
+    """Add or replace the entry for *rule_name*, keeping lookups consistent."""
+    unregister_rule(index, rule_name)
+    entry = {
+        "smk_file": smk_file,
+        "script": script,
+        "script_dir": Path(script).parent.name,
+        "conda_env_key": conda_env_key,
+        "module": module,
+        "answers_file": answers_file,
+    }
+    index["rules"][rule_name] = entry
+    for lookup, field in LOOKUPS.items():
+        if not entry[field]:
+            continue
+        owners = index[lookup].setdefault(entry[field], [])
+        if rule_name not in owners:
+            owners.append(rule_name)
+            owners.sort()
+
+
+def _script_for_answers(answers: dict[str, Any]) -> str:
+    """Mirror the script path produced by the rule template."""
+    script_dir = (
+        f"rules_conda_{answers.get('conda_env_key', '')}"
+        if answers.get("uses_conda", True)
+        else "rules_global"
+    )
+    return f"workflow/scripts/{script_dir}/{answers['rule_name']}.py"
+
+
+def _module_for_answers(answers: dict[str, Any]) -> str:
+    """`<module_type>/<module_name>` of a rule implemented in the package."""
+    module_type = answers.get("module_type", "none")
+    if not answers.get("uses_package") or module_type == "none":
+        return ""
+    return f"{module_type}/{answers['module_name']}"
+
+
+def bootstrap_index(project_dir: Path = Path(".")) -> dict[str, Any]:
+    """Build an index from the rule answers files already in *project_dir*."""
+    # PyYAML ships with copier, which is the interpreter running this task.
+    import yaml
+
+    index = empty_index()
+    for pattern in ANSWERS_GLOBS:
+        for answers_file in sorted(project_dir.glob(pattern)):
+            try:
+                answers = yaml.safe_load(answers_file.read_text()) or {}
+            except (OSError, yaml.YAMLError) as exc:
+                sys.stderr.write(f"WARNING: skipping {answers_file}: {exc}\n")
+                continue
+            if "rule_name" not in answers:
+                continue
+            register_rule(
+                index,
+                rule_name=answers["rule_name"],
+                smk_file=answers.get("smk_file_name", f"{answers['rule_name']}.smk"),
+                script=_script_for_answers(answers),
+                conda_env_key=(
+                    answers.get("conda_env_key", "")
+                    if answers.get("uses_conda", True)
+                    else ""
+                ),
+                module=_module_for_answers(answers),
+                answers_file=answers_file.relative_to(project_dir).as_posix(),
+            )
+    return index
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rule-name", required=True)
+    parser.add_argument("--smk-file", required=True)
+    parser.add_argument("--script", required=True)
+    parser.add_argument("--conda-env-key", default="")
+    parser.add_argument(
+        "--module", default="", help="`<module_type>/<module_name>`, if any"
+    )
+    parser.add_argument("--answers-file", default="")
+    parser.add_argument("--operation", default="", help="`_copier_operation`")
+    args = parser.parse_args(argv)
+
+    index = load_index()
+    if index is None:
+        index = bootstrap_index()
+    elif args.operation == "copy" and args.rule_name in index["rules"]:
+        # The `rule_name` validator rejects names registered from another
+        # answers file. A copy over the rule's own answers file renders exactly
+        # like `copier update` and passes it, so it is reported here.
+        sys.stderr.write(
+            f"WARNING: rule '{args.rule_name}' already existed in "
+            f"'{index['rules'][args.rule_name]['smk_file']}' and was rendered "
+            "again by `copier copy`. Snakemake rule names must be unique; use "
+            "`copier update` to update an existing rule.\n"
+        )
+
+    env_key = args.conda_env_key
+    other_users = set(index["conda_env_keys"].get(env_key, [])) - {args.rule_name}
+    if env_key and not other_users:
+        sys.stderr.write(
+            f"WARNING: conda env key '{env_key}' is not used by any other rule; "
+            f'make sure config["CONDA"]["ENVS"]["{env_key}"] is defined.\n'
+        )
+
+    register_rule(
+        index,
+        rule_name=args.rule_name,
+        smk_file=args.smk_file,
+        script=args.script,
+        conda_env_key=env_key,
+        module=args.module,
+        answers_file=args.answers_file,
+    )
+    save_index(index)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Session-scoped Snakemake helpers for the generated rule tests.
+
+- `session_workspace()` creates one workspace holding the test data per
+  pytest session. Rules whose outputs are independent run their
+  full-execution tests there, instead of copying the data into a fresh
+  workspace for every test.
+- `dry_run()` checks the wiring of every rule in the rules index with a
+  single `snakemake --dry-run` per session, so each rule's dry-run test
+  costs milliseconds. When that batch fails, each rule is dry-run on its own
+  to find the broken one.
+- `require_dry_run()` skips a full-execution test whose rule failed its
+  dry-run, so the cheap check reports the problem before the expensive run.
+
+This file is shared by every rule; only the first rule creates it.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from .conftest import _snakemake
+
+RULES_INDEX = Path(".copier-answers/rules-index.json")
+
+_workspace: Path | None = None
+# Rule name -> None when its dry-run passed, else the error.
+_dry_runs: dict[str, str | None] = {}
+
+
+def session_workspace(
+    tmp_path_factory: pytest.TempPathFactory, repo_root: Path
+) -> Path:
+    """Return the workspace shared by the tests of this session."""
+    global _workspace
+    if _workspace is None:
+        workspace = tmp_path_factory.mktemp("session_workspace")
+        shutil.copytree(repo_root / "data/tests", workspace / "data")
+        _workspace = workspace
+    return _workspace
+
+
+def indexed_rules(repo_root: Path) -> list[str]:
+    """Return the rules registered in the project's rules index."""
+    try:
+        index = json.loads((repo_root / RULES_INDEX).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+    return sorted(index.get("rules", {}))
+
+
+def _try_dry_run(workspace: Path, rules: list[str]) -> str | None:
+    try:
+        _snakemake(workspace, ["--dry-run", *rules], verbose=False)
+    except (Exception, pytest.fail.Exception) as exc:
+        return str(exc) or type(exc).__name__
+    return None
+
+
+def dry_run(workspace: Path, rule: str, repo_root: Path) -> None:
+    """Fail if *rule* does not build a valid DAG in *workspace*."""
+    if rule not in _dry_runs:
+        rules = sorted({*indexed_rules(repo_root), rule})
+        if _try_dry_run(workspace, rules) is None:
+            _dry_runs.update(dict.fromkeys(rules))
+        else:
+            _dry_runs[rule] = _try_dry_run(workspace, [rule])
+    error = _dry_runs[rule]
+    if error is not None:
+        pytest.fail(f"Dry-run of rule {rule} failed:\n{error}")
+
+
+def require_dry_run(rule: str) -> None:
+    """Skip the calling test if the dry-run of *rule* failed."""
+    error = _dry_runs.get(rule)
+    if error is not None:
+        pytest.skip(f"Dry-run of rule {rule} failed; not running it.")
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import csv
+import importlib.util
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+# Columns written by Snakemake's `benchmark:` directive.
+BENCHMARK_HEADER = (
+    "s\th:m:s\tmax_rss\tmax_vms\tmax_uss\tmax_pss\tio_in\tio_out\tmean_load\tcpu_time\n"
+)
+
+# --------------------------------------------------------------------------- #
+# Load the script under test once per module                                  #
+# --------------------------------------------------------------------------- #
+
+
+@pytest.fixture(scope="module")
+def module_under_test() -> Any:
+    """Import the runtime module object for benchmarks_aggregate.py."""
+    root = Path(__file__).parents[4]  # project root
+    script = root / "workflow/scripts/rules_global/benchmarks_aggregate.py"
+
+    if not script.exists():  # pragma: no cover
+        pytest.skip(
+            f"Cannot find {script} - are you running tests from the repo root?",
+            allow_module_level=True,
+        )
+
+    spec = importlib.util.spec_from_file_location("benchmarks_aggregate", str(script))
+    module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+    assert spec and spec.loader
+    spec.loader.exec_module(module)  # type: ignore[arg-type]
+    return module
+
+
+# --------------------------------------------------------------------------- #
+# Helper factories                                                            #
+# --------------------------------------------------------------------------- #
+
+
+def _write_benchmark(
+    log_dir: Path,
+    rule: str,
+    runs: list[tuple[float, float]],
+    name: str = "benchmark.tsv",
+) -> None:
+    """Write a benchmark TSV with one ``(seconds, max_rss)`` row per run."""
+    path = log_dir / rule / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [f"{s}\t0:00:01\t{rss}\t0\t0\t0\t0\t0\t0\t0\n" for s, rss in runs]
+    path.write_text(BENCHMARK_HEADER + "".join(lines))
+
+
+def _read_table(path: Path) -> dict[str, dict[str, str]]:
+    with open(path, newline="") as fh:
+        return {row["rule"]: row for row in csv.DictReader(fh, delimiter="\t")}
+
+
+# --------------------------------------------------------------------------- #
+# Tests                                                                       #
+# --------------------------------------------------------------------------- #
+
+
+def test_repeated_runs_are_summarized(tmp_path, module_under_test):
+    """Runtime is averaged and memory is the peak over ``repeat()`` runs."""
+    _write_benchmark(tmp_path / "logs", "rule_a", [(1.0, 100.0), (3.0, 300.0)])
+
+    summary = module_under_test.collect_benchmarks(tmp_path / "logs")
+
+    assert summary["rule_a"] == {"runs": 2, "mean_s": 2.0, "max_rss": 300.0}
+
+
+def test_wildcard_benchmark_files_are_merged(tmp_path, module_under_test):
+    """Per-wildcard benchmark files of one rule are summarized together."""
+    log_dir = tmp_path / "logs"
+    _write_benchmark(log_dir, "rule_a", [(1.0, 100.0)], "benchmark_s1.tsv")
+    _write_benchmark(log_dir, "rule_a", [(3.0, 500.0)], "benchmark_s2.tsv")
+
+    summary = module_under_test.collect_benchmarks(log_dir)
+
+    assert summary == {"rule_a": {"runs": 2, "mean_s": 2.0, "max_rss": 500.0}}
+
+
+def test_regressions_are_flagged_against_baseline(tmp_path, module_under_test):
+    """Only rules slower or larger than the baseline tolerance are flagged."""
+    log_dir = tmp_path / "logs"
+    _write_benchmark(log_dir, "rule_a", [(1.0, 100.0)])
+    _write_benchmark(log_dir, "rule_b", [(1.0, 100.0)])
+    baseline = tmp_path / "baseline.tsv"
+    module_under_test.main(log_dir, baseline)
+
+    _write_benchmark(log_dir, "rule_b", [(2.0, 100.0)])
+    output = tmp_path / "out" / "benchmarks.tsv"
+    regressed = module_under_test.main(
+        log_dir, output, baseline_path=baseline, tolerance=0.2
+    )
+
+    assert regressed == ["rule_b"]
+    table = _read_table(output)
+    assert table["rule_a"]["regression"] == ""
+    assert table["rule_b"]["regression"] == "mean_s"
+    assert table["rule_b"]["baseline_mean_s"] == "1.0"
+
+
+def test_missing_baseline_flags_nothing(tmp_path, module_under_test):
+    """Without a baseline every rule is reported and none is flagged."""
+    _write_benchmark(tmp_path / "logs", "rule_a", [(1.0, 100.0)])
+    output = tmp_path / "benchmarks.tsv"
+
+    regressed = module_under_test.main(
+        tmp_path / "logs", output, baseline_path=tmp_path / "missing.tsv"
+    )
+
+    assert regressed == []
+    assert _read_table(output)["rule_a"]["baseline_mean_s"] == "NA"
@@ -0,0 +1,220 @@
+"""
+Typed stand-in for the ``snakemake`` object passed to rule scripts.
+
+Importing Snakemake takes about a second per test process, which dominates
+script unit tests and every pytest-xdist worker. `SnakemakeStandIn` has the
+attribute surface of `snakemake.script.Snakemake` (``input``, ``output``,
+``params``, ``wildcards``, ``threads``, ``resources``, ``log``, ``config``,
+``rule``, ``bench_iteration``, ``scriptdir`` and ``log_fmt_shell()``) and its
+containers behave like Snakemake's named lists: ``smk.input.readme``,
+``smk.input[0]`` and ``smk.input["readme"]`` all work.
+
+`build_smk(..., real=True)` builds the real Snakemake object from the same
+arguments, for the tests that need it.
+
+This file is shared by every rule; only the first rule creates it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+###############################################################################
+#  Containers                                                                  #
+###############################################################################
+
+
+class Namedlist(list[Any]):
+    """A list whose items can also be accessed by name, as in Snakemake."""
+
+    def __init__(
+        self,
+        toclone: list[Any] | None = None,
+        fromdict: Mapping[str, Any] | None = None,
+    ) -> None:
+        super().__init__(self._convert(v) for v in (toclone or []))
+        self._names: dict[str, int] = {}
+        for name, value in (fromdict or {}).items():
+            self._names[name] = len(self)
+            self.append(self._convert(value))
+
+    @staticmethod
+    def _convert(value: Any) -> Any:
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        names = self.__dict__.get("_names", {})
+        if name in names:
+            return self[names[name]]
+        raise AttributeError(f"{type(self).__name__} has no item {name!r}")
+
+    def __getitem__(self, key: Any) -> Any:  # type: ignore[override]
+        if isinstance(key, str):
+            try:
+                return super().__getitem__(self._names[key])
+            except KeyError:
+                raise KeyError(key) from None
+        return super().__getitem__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self._names else default
+
+    def keys(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        return ((name, self[index]) for name, index in self._names.items())
+
+
+class _PathList(Namedlist):
+    # Snakemake hands scripts plain strings for input, output and log files.
+    @staticmethod
+    def _convert(value: Any) -> Any:
+        return str(value)
+
+
+class InputFiles(_PathList):
+    pass
+
+
+class OutputFiles(_PathList):
+    pass
+
+
+class Log(_PathList):
+    pass
+
+
+class Params(Namedlist):
+    pass
+
+
+class Wildcards(Namedlist):
+    pass
+
+
+class ResourceList(Namedlist):
+    pass
+
+
+# Snakemake container name -> stand-in; the file containers hold strings.
+CONTAINERS: dict[str, type[Namedlist]] = {
+    cls.__name__: cls
+    for cls in (InputFiles, OutputFiles, Params, Wildcards, ResourceList, Log)
+}
+FILE_CONTAINERS = ("InputFiles", "OutputFiles", "Log")
+
+
+###############################################################################
+#  The smk object                                                              #
+###############################################################################
+
+
+class SnakemakeStandIn:
+    """Same constructor and attributes as `snakemake.script.Snakemake`."""
+
+    def __init__(
+        self,
+        input_: InputFiles,
+        output: OutputFiles,
+        params: Params,
+        wildcards: Wildcards,
+        threads: int,
+        resources: ResourceList,
+        log: Log,
+        config: dict[str, Any],
+        rulename: str,
+        bench_iteration: int | None,
+        scriptdir: str | PathLike[str] | None = None,
+    ) -> None:
+        self.input = input_
+        self.output = output
+        self.params = params
+        self.wildcards = wildcards
+        self.threads = threads
+        self.resources = resources
+        self.log = log
+        self.config = config
+        self.rule = rulename
+        self.bench_iteration = bench_iteration
+        self.scriptdir = scriptdir
+
+    def log_fmt_shell(
+        self, stdout: bool = True, stderr: bool = True, append: bool = False
+    ) -> str:
+        """Shell redirection to the rule's single log file, as in Snakemake."""
+        if not self.log:
+            return ""
+        if len(self.log) > 1:
+            raise ValueError("log_fmt_shell needs a single log file")
+        target = f"{'>>' if append else '>'} {self.log[0]}"
+        if stdout and stderr:
+            return f" {target} 2>&1"
+        if stdout:
+            return f" {target}"
+        if stderr:
+            return f" 2{target}"
+        return ""
+
+
+def build_smk(
+    *,
+    input: Mapping[str, str | Path] | None = None,
+    output: Mapping[str, str | Path] | None = None,
+    params: Mapping[str, Any] | None = None,
+    wildcards: Mapping[str, str] | None = None,
+    threads: int = 1,
+    resources: Mapping[str, Any] | None = None,
+    log: Mapping[str, str | Path] | None = None,
+    config: dict[str, Any] | None = None,
+    rulename: str = "rule",
+    bench_iteration: int | None = None,
+    scriptdir: str | PathLike[str] | None = None,
+    real: bool = False,
+) -> Any:
+    """
+    Build the ``smk`` object of a rule script.
+
+    Returns a `SnakemakeStandIn`, or with ``real=True`` a
+    `snakemake.script.Snakemake` built from the same arguments.
+    """
+    if real:
+        from snakemake import script
+
+        try:
+            # Snakemake v9.17.0+ (with snakemake.io.container)
+            from snakemake.io import container as containers
+        except ImportError:
+            # Snakemake v9.16.3 fallback
+            from snakemake import io as containers  # type: ignore[no-redef]
+
+        classes: dict[str, Any] = {
+            name: getattr(containers, name) for name in CONTAINERS
+        }
+        smk_class: Any = script.Snakemake
+    else:
+        classes = dict(CONTAINERS)
+        smk_class = SnakemakeStandIn
+
+    def named(name: str, values: Mapping[str, Any] | None) -> Any:
+        items = dict(values or {})
+        if name in FILE_CONTAINERS:
+            items = {key: str(value) for key, value in items.items()}
+        return classes[name](fromdict=items)
+
+    return smk_class(
+        input_=named("InputFiles", input),
+        output=named("OutputFiles", output),
+        params=named("Params", params),
+        wildcards=named("Wildcards", wildcards),
+        threads=threads,
+        resources=named("ResourceList", resources),
+        log=named("Log", log),
+        config=config or {},
+        rulename=rulename,
+        bench_iteration=bench_iteration,
+        scriptdir=scriptdir,
+    )
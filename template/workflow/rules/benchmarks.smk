@@ -0,0 +1,29 @@
+rule benchmarks_aggregate:
+    """
+    Collect the `benchmark:` files of every rule into one table and flag
+    runtime or memory regressions against a baseline table.
+
+    The benchmark files are found at runtime rather than declared as inputs,
+    so requesting this rule never re-runs the rules being measured. Force a
+    refresh with `--forcerun benchmarks_aggregate`.
+
+    params:
+        benchmark_dir: Directory holding one sub-directory per rule.
+        baseline: Previous aggregate table to compare against, if any.
+        tolerance: Relative increase above the baseline that counts as a
+            regression.
+
+    output:
+        table: One row per rule with mean runtime and peak memory.
+    """
+    localrule: True
+    output:
+        table=str(LOG_DIR / "benchmarks_aggregate" / "benchmarks.tsv"),
+    log:
+        loguru=str(LOG_DIR / "benchmarks_aggregate" / "loguru.log"),
+    params:
+        benchmark_dir=str(LOG_DIR),
+        baseline=config.get("BENCHMARKS", {}).get("BASELINE", ""),
+        tolerance=config.get("BENCHMARKS", {}).get("TOLERANCE", 0.2),
+    script:
+        str(WORKFLOW_BASE / "scripts/rules_global/benchmarks_aggregate.py")
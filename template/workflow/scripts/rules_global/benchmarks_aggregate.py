@@ -0,0 +1,214 @@
+"""
+Script for the benchmarks_aggregate rule
+
+Collect the `benchmark:` TSV files written by every rule into one table and
+flag rules whose runtime or peak memory regressed against a baseline table.
+"""
+
+import csv
+import sys
+from pathlib import Path
+from statistics import mean
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+if TYPE_CHECKING:  # pragma: no cover
+    from snakemake.script import snakemake
+
+# Benchmark files written by rules generated from `able-workflow-rule-copier`.
+BENCHMARK_GLOB = "*/benchmark*.tsv"
+
+# Columns of the aggregate table, in order.
+COLUMNS = [
+    "rule",
+    "runs",
+    "mean_s",
+    "max_rss",
+    "baseline_mean_s",
+    "baseline_max_rss",
+    "regression",
+]
+
+
+def main_smk(smk) -> None:  # type: ignore[no-untyped-def]
+    """
+    Main entry point for the Snakemake script.
+    """
+
+    # Setup loguru logging
+    logger.remove()
+    logger.add(smk.log.loguru)
+
+    baseline = Path(smk.params.baseline) if smk.params.baseline else None
+    main(
+        Path(smk.params.benchmark_dir),
+        Path(smk.output.table),
+        baseline_path=baseline,
+        tolerance=float(smk.params.tolerance),
+    )
+
+
+def _to_float(value: str | None) -> float | None:
+    """Parse a benchmark cell, treating Snakemake's ``NA`` as missing."""
+    if value is None or value.strip() in ("", "NA", "-"):
+        return None
+    return float(value)
+
+
+def read_benchmark(path: Path) -> list[dict[str, str]]:
+    """Read the rows of one Snakemake benchmark TSV."""
+    with open(path, newline="", encoding="utf-8") as fh:
+        return list(csv.DictReader(fh, delimiter="\t"))
+
+
+def summarize_benchmark(rows: list[dict[str, str]]) -> dict[str, float | int | None]:
+    """
+    Summarize the benchmark rows of one rule.
+
+    Rules benchmarked with ``repeat()`` write one row per run, and rules with
+    wildcards one file per job; the runtime is averaged and the peak memory is
+    the maximum over all of them.
+    """
+    seconds = [s for s in (_to_float(r.get("s")) for r in rows) if s is not None]
+    rss = [m for m in (_to_float(r.get("max_rss")) for r in rows) if m is not None]
+    return {
+        "runs": len(rows),
+        "mean_s": mean(seconds) if seconds else None,
+        "max_rss": max(rss) if rss else None,
+    }
+
+
+def collect_benchmarks(benchmark_dir: Path) -> dict[str, dict[str, float | int | None]]:
+    """
+    Summarize every ``<benchmark_dir>/<rule>/benchmark*.tsv`` keyed by rule.
+
+    The rows of all files of a rule (e.g. ``benchmark_{sample}.tsv``) are
+    merged before summarizing.
+    """
+    rows_by_rule: dict[str, list[dict[str, str]]] = {}
+    for path in sorted(benchmark_dir.glob(BENCHMARK_GLOB)):
+        try:
+            rows = read_benchmark(path)
+        except (OSError, ValueError) as exc:
+            logger.warning("Skipping unreadable benchmark file {}: {}", path, exc)
+            continue
+        rows_by_rule.setdefault(path.parent.name, []).extend(rows)
+
+    summaries: dict[str, dict[str, float | int | None]] = {}
+    for rule, rows in rows_by_rule.items():
+        try:
+            summaries[rule] = summarize_benchmark(rows)
+        except ValueError as exc:
+            logger.warning("Skipping unreadable benchmarks of rule {}: {}", rule, exc)
+    return summaries
+
+
+def read_baseline(path: Path) -> dict[str, dict[str, float | None]]:
+    """Read a previous aggregate table written by ``write_table``."""
+    with open(path, newline="", encoding="utf-8") as fh:
+        return {
+            row["rule"]: {
+                "mean_s": _to_float(row.get("mean_s")),
+                "max_rss": _to_float(row.get("max_rss")),
+            }
+            for row in csv.DictReader(fh, delimiter="\t")
+        }
+
+
+def _regressed(
+    current: float | int | None, baseline: float | None, tolerance: float
+) -> bool:
+    if current is None or baseline is None or baseline <= 0:
+        return False
+    return current > baseline * (1 + tolerance)
+
+
+def flag_regressions(
+    summaries: dict[str, dict[str, float | int | None]],
+    baseline: dict[str, dict[str, float | None]],
+    tolerance: float,
+) -> list[dict[str, object]]:
+    """
+    Build the aggregate table rows, flagging regressions against ``baseline``.
+
+    A rule regresses when its mean runtime or peak memory exceeds the baseline
+    value by more than ``tolerance`` (e.g. ``0.2`` for 20 %).
+    """
+    rows: list[dict[str, object]] = []
+    for rule, summary in sorted(summaries.items()):
+        base = baseline.get(rule, {})
+        regressions = [
+            metric
+            for metric in ("mean_s", "max_rss")
+            if _regressed(summary[metric], base.get(metric), tolerance)
+        ]
+        rows.append(
+            {
+                "rule": rule,
+                "runs": summary["runs"],
+                "mean_s": summary["mean_s"],
+                "max_rss": summary["max_rss"],
+                "baseline_mean_s": base.get("mean_s"),
+                "baseline_max_rss": base.get("max_rss"),
+                "regression": ",".join(regressions),
+            }
+        )
+    return rows
+
+
+def write_table(rows: list[dict[str, object]], path: Path) -> None:
+    """Write the aggregate rows as a TSV, using ``NA`` for missing values."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=COLUMNS, delimiter="\t")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: "NA" if v is None else v for k, v in row.items()})
+
+
+def main(
+    benchmark_dir: Path,
+    output_path: Path,
+    *,
+    baseline_path: Path | None = None,
+    tolerance: float = 0.2,
+) -> list[str]:
+    """
+    Aggregate the benchmarks under ``benchmark_dir`` into ``output_path``.
+
+    Returns the names of the rules flagged as regressed.
+    """
+    summaries = collect_benchmarks(benchmark_dir)
+    logger.info("Found benchmarks for {} rules in {}", len(summaries), benchmark_dir)
+
+    baseline: dict[str, dict[str, float | None]] = {}
+    if baseline_path is not None:
+        if baseline_path.is_file():
+            baseline = read_baseline(baseline_path)
+        else:
+            logger.warning("Baseline {} not found; nothing to compare", baseline_path)
+
+    rows = flag_regressions(summaries, baseline, tolerance)
+    write_table(rows, output_path)
+
+    regressed = [row for row in rows if row["regression"]]
+    for row in regressed:
+        logger.warning(
+            "Rule {} regressed ({}) beyond {:.0%} of the baseline",
+            row["rule"],
+            row["regression"],
+            tolerance,
+        )
+    return [str(row["rule"]) for row in regressed]
+
+
+if __name__ == "__main__":
+    try:
+        main_smk(snakemake)
+    except NameError:
+        logger.error(
+            "This script is designed to be run as part of a Snakemake workflow. "
+            "Please run it through Snakemake."
+        )
+        sys.exit(0)
@@ -10,6 +10,69 @@ class PropagateHandler(logging.Handler):
         logging.getLogger(record.name).handle(record)
 
 
+def pytest_addoption(parser):
+    """
+    Add command-line options for the render workspace of the template tests
+    (SEE: scripts/render_workspace.py and tests/template/conftest.py) and for
+    the docs build.
+    """
+    parser.addoption(
+        "--render-keep",
+        action="store_true",
+        dest="render_keep",
+        help="Keep this session's rendered projects; the disk quota never evicts them.",
+    )
+    parser.addoption(
+        "--render-purge",
+        action="store_true",
+        dest="render_purge",
+        help="Remove all rendered projects of earlier sessions before rendering.",
+    )
+    parser.addoption(
+        "--render-no-fanout",
+        action="store_true",
+        dest="render_no_fanout",
+        help=(
+            "Render the package template again for every rule variant instead "
+            + "of cloning one shared render per package answer set."
+        ),
+    )
+    parser.addoption(
+        "--profile-render",
+        action="store",
+        dest="profile_render",
+        metavar="DIR",
+        default=None,
+        help=(
+            "Profile every template render with cProfile and write "
+            + "<example>-<template>.pstats and .collapsed files to DIR."
+        ),
+    )
+    parser.addoption(
+        "--render-quota",
+        action="store",
+        dest="render_quota",
+        metavar="SIZE",
+        default=None,
+        help=(
+            "Disk quota of the render workspace, e.g. 2G "
+            + "(default: $RENDER_WORKSPACE_QUOTA or 10G)."
+        ),
+    )
+    parser.addoption(
+        "--docs-site-dir",
+        action="store",
+        dest="docs_site_dir",
+        metavar="DIR",
+        default=None,
+        help=(
+            "Build the docs into this persistent site dir and skip the build "
+            + "while the docs inputs are unchanged (default: $DOCS_SITE_DIR, "
+            + "else a cold build into a temporary dir)."
+        ),
+    )
+
+
 def pytest_configure(config):
 
     verbosity = getattr(config.option, "verbose", 0)
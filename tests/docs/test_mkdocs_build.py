@@ -1,8 +1,24 @@
+import os
 import subprocess
+from pathlib import Path
 
+from loguru import logger
+
+from scripts.docs_cache import docs_inputs_hash, mark_site, site_is_fresh
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+
+def test_mkdocs_build(tmp_path, pytestconfig):
+    persistent = pytestconfig.getoption("docs_site_dir") or os.environ.get(
+        "DOCS_SITE_DIR"
+    )
+    site_dir = Path(persistent).resolve() if persistent else tmp_path / "site"
+    digest = docs_inputs_hash(ROOT_DIR) if persistent else None
+    if digest is not None and site_is_fresh(site_dir, digest):
+        logger.info("Docs inputs unchanged; reusing the site in {}", site_dir)
+        return
 
-def test_mkdocs_build(tmp_path):
-    site_dir = tmp_path / "site"
     result = subprocess.run(
         [
             "mkdocs",
@@ -15,5 +31,8 @@ def test_mkdocs_build(tmp_path):
         ],
         capture_output=True,
         text=True,
+        cwd=ROOT_DIR,
     )
     assert result.returncode == 0, result.stderr
+    if digest is not None:
+        mark_site(site_dir, digest)
@@ -7,6 +7,8 @@ Scenarios covered
 2.  pyproject.toml staged but pyproject2conda missing → exits 1.
 3.  pyproject2conda present but generation fails      → propagates non-zero code.
 4.  Happy-path: generation succeeds, env-file exists, git add is invoked → exits 0.
+5.  Dependency sections unchanged since the last generation → skipped.
+6.  Env-file missing, or a dependency section changed → regenerated.
 """
 
 from __future__ import annotations
@@ -18,7 +20,6 @@ import pathlib
 import subprocess
 import sys
 from pathlib import Path
-from typing import List
 
 import pytest
 
@@ -42,6 +43,28 @@ class DummyCompleted:
         self.returncode = returncode
 
 
+@pytest.fixture(autouse=True)
+def _isolated_cwd(monkeypatch, tmp_path):
+    """Run every test away from the repository's own env-file and its hash."""
+    monkeypatch.chdir(tmp_path)
+
+
+PYPROJECT = """\
+[project]
+name = "demo"
+dependencies = ["loguru>=0.7"]
+
+[dependency-groups]
+dev = ["pytest"]
+
+[tool.pyproject2conda]
+channels = ["conda-forge"]
+
+[tool.ruff]
+line-length = 79
+"""
+
+
 # ---------------------------------------------------------------------------
 # 1. No pyproject.toml in args ------------------------------------------------
 # ---------------------------------------------------------------------------
@@ -86,7 +109,7 @@ def test_generation_nonzero_propagates(monkeypatch, rc):
 
     monkeypatch.setattr(shutil, "which", lambda _: "/usr/bin/pyproject2conda")
 
-    def fake_run(cmd: List[str], check: bool = False):
+    def fake_run(cmd: list[str], check: bool = False):
         # First call is pyproject2conda → fail; subsequent calls should not happen.
         fake_run.calls += 1
         if fake_run.calls == 1:
@@ -119,7 +142,7 @@ def test_happy_path(monkeypatch, tmp_path):
     # Keep track of subprocess invocations & arguments
     calls: list[list[str]] = []
 
-    def fake_run(cmd: List[str], check: bool = False):
+    def fake_run(cmd: list[str], check: bool = False):
         calls.append(cmd)
         return DummyCompleted(0)
 
@@ -133,3 +156,72 @@ def test_happy_path(monkeypatch, tmp_path):
     assert calls[1][:2] == ["git", "add"]
     # git add path should be absolute or relative, but basename must match.
     assert Path(calls[1][2]).name == env_file.name
+
+
+# ---------------------------------------------------------------------------
+# 5./6. Dependency hash ---------------------------------------------------------
+# ---------------------------------------------------------------------------
+@pytest.fixture
+def generated(monkeypatch, tmp_path):
+    """A pyproject.toml and an env-file generated from it; returns the calls."""
+    import shutil
+
+    Path("pyproject.toml").write_text(PYPROJECT)
+    monkeypatch.setattr(shutil, "which", lambda _: str(tmp_path / "fake_cli"))
+    calls: list[list[str]] = []
+
+    def fake_run(cmd: list[str], check: bool = False):
+        calls.append(cmd)
+        if cmd[0] == "pyproject2conda":
+            Path("environment-py312-dev.yaml").write_text("name: demo\n")
+        return DummyCompleted(0)
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    assert main(["pyproject.toml"]) == 0
+    assert len(calls) == 2
+    calls.clear()
+    return calls
+
+
+def test_hash_recorded_in_env_file(generated):
+    digest = pyproject2conda_hook.dependency_hash(Path("pyproject.toml"))
+    env_file = Path("environment-py312-dev.yaml")
+    assert env_file.read_text().startswith("name: demo\n")
+    assert pyproject2conda_hook.stored_hash(env_file) == digest
+
+
+def test_skips_when_dependencies_unchanged(generated):
+    """Edits outside the hashed sections do not regenerate."""
+    text = Path("pyproject.toml").read_text()
+    Path("pyproject.toml").write_text(
+        text.replace("line-length = 79", "line-length = 88")
+        + "\n[tool.mypy]\nstrict = true\n"
+    )
+    assert main(["pyproject.toml"]) == 0
+    assert generated == []
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ('"loguru>=0.7"', '"loguru>=0.8"'),
+        ('dev = ["pytest"]', 'dev = ["pytest", "ruff"]'),
+        ('channels = ["conda-forge"]', 'channels = ["bioconda"]'),
+    ],
+)
+def test_regenerates_when_dependencies_change(generated, old, new):
+    text = Path("pyproject.toml").read_text()
+    Path("pyproject.toml").write_text(text.replace(old, new))
+    assert main(["pyproject.toml"]) == 0
+    assert [cmd[0] for cmd in generated] == ["pyproject2conda", "git"]
+    digest = pyproject2conda_hook.dependency_hash(Path("pyproject.toml"))
+    env_file = Path("environment-py312-dev.yaml")
+    assert pyproject2conda_hook.stored_hash(env_file) == digest
+    assert env_file.read_text().count(pyproject2conda_hook.HASH_PREFIX) == 1
+
+
+def test_regenerates_when_env_file_missing(generated):
+    Path("environment-py312-dev.yaml").unlink()
+    assert main(["pyproject.toml"]) == 0
+    assert [cmd[0] for cmd in generated] == ["pyproject2conda", "git"]
+    assert Path("environment-py312-dev.yaml").exists()
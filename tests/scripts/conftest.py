@@ -0,0 +1,67 @@
+"""
+Fixtures shared by the `scripts/rule_api.py` and `scripts/rule_daemon.py`
+tests: a tiny local rule template and a project to render it into.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+MINI_COPIER_YML = """\
+_external_data:
+  parent: ".answers/parent.yml"
+_skip_if_exists:
+  - "keep.txt"
+_tasks:
+  - command: "black ./"
+    when: "{{ format_code }}"
+  - command:
+      - "python"
+      - "-c"
+      - "open('task.txt', 'w').write('{{ name }}'); print('task done')"
+name:
+  type: str
+  default: "{{ _external_data.parent.package }}_rule"
+format_code:
+  type: bool
+  default: true
+"""
+
+
+@pytest.fixture
+def mini_template(tmp_path):
+    """A `RuleTemplate` of a tiny non-git template."""
+    from scripts.rule_api import RuleTemplate
+
+    root = tmp_path / "tpl"
+    root.mkdir()
+    (root / "copier.yml").write_text(MINI_COPIER_YML)
+    (root / "{{ name }}.py.jinja").write_text("x = {'a':1,  'b':[1,2]}\n")
+    (root / "keep.txt").write_text("template\n")
+    (root / "{{ _copier_conf.answers_file }}.jinja").write_text(
+        "{{ _copier_answers | to_nice_yaml }}"
+    )
+    return RuleTemplate(root, ref=None)
+
+
+def _make_project(root: Path, package: str = "pkg") -> Path:
+    (root / ".answers").mkdir(parents=True)
+    (root / ".answers" / "parent.yml").write_text(f"package: {package}\n")
+    (root / ".git").mkdir()
+    (root / ".git" / "index").write_text("ignored")
+    (root / "keep.txt").write_text("user edits\n")
+    return root
+
+
+@pytest.fixture
+def make_project():
+    """Factory for projects with the parent answers the mini template reads."""
+    return _make_project
+
+
+@pytest.fixture
+def mini_project(tmp_path):
+    """A project with the parent answers the mini template reads."""
+    return _make_project(tmp_path / "project")
@@ -0,0 +1,37 @@
+"""
+Unit tests for `scripts/benchmark_includes_bundle.py`.
+
+Snakemake itself is not a test dependency, so the timing loop runs `true` in
+its place; only the synthetic workflow and the mode switch are checked.
+"""
+
+from __future__ import annotations
+
+import shutil
+
+import pytest
+
+from scripts import benchmark_includes_bundle as bench
+
+
+def test_synthetic_workflow_has_one_include_per_rule(tmp_path):
+    snakefile = bench.write_synthetic_workflow(tmp_path, 3)
+
+    rules_dir = snakefile.parent / "rules"
+    assert snakefile.read_text() == 'include: "rules/includes.smk"\n'
+    assert sorted(p.name for p in rules_dir.glob("rule_*.smk")) == [
+        "rule_0000.smk",
+        "rule_0001.smk",
+        "rule_0002.smk",
+    ]
+    assert (rules_dir / "includes.smk").read_text().count("include:") == 3
+
+
+@pytest.mark.skipif(shutil.which("true") is None, reason="needs `true`")
+def test_run_benchmark_times_both_modes(tmp_path):
+    result = bench.run_benchmark(tmp_path, n_rules=2, repeat=2, snakemake="true")
+
+    assert set(result) >= {"per_file", "bundled", "speedup"}
+    assert result["per_file"]["min_s"] <= result["per_file"]["median_s"]
+    rules_dir = tmp_path / "workflow" / "rules"
+    assert "rule rule_0001:" in (rules_dir / "includes.bundle.smk").read_text()
@@ -0,0 +1,73 @@
+"""
+Unit tests for `scripts/docs_cache.py`.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from scripts import docs_cache as dc
+
+
+@pytest.fixture
+def repo(tmp_path) -> Path:
+    """A minimal docs tree with an include from outside `docs/`."""
+    (tmp_path / "docs/docs/guide").mkdir(parents=True)
+    (tmp_path / "docs/mkdocs.yml").write_text(
+        'site_name: demo\nextra:\n  url: !ENV ["DEMO_DOCS_URL", "https://x"]\n'
+    )
+    (tmp_path / "docs/docs/index.md").write_text("# Demo\n")
+    (tmp_path / "docs/docs/guide/todo.md").write_text(
+        '{%\n    include-markdown "../../../template/todo.md.jinja"\n%}\n'
+    )
+    (tmp_path / "template").mkdir()
+    (tmp_path / "template/todo.md.jinja").write_text("- [ ] one\n")
+    return tmp_path
+
+
+def test_inputs_cover_docs_includes_and_env(repo, monkeypatch):
+    monkeypatch.setenv("DEMO_DOCS_URL", "https://docs")
+    inputs = dc.docs_inputs(repo)
+    assert set(inputs["docs"]) == {
+        "docs/mkdocs.yml",
+        "docs/docs/index.md",
+        "docs/docs/guide/todo.md",
+    }
+    assert list(inputs["includes"]) == ["template/todo.md.jinja"]
+    assert inputs["env"] == {"DEMO_DOCS_URL": "https://docs"}
+    assert "python" in inputs["tools"]
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda repo: (repo / "docs/docs/index.md").write_text("# Changed\n"),
+        lambda repo: (repo / "docs/docs/new.md").write_text("# New\n"),
+        lambda repo: (repo / "template/todo.md.jinja").write_text("- [ ] two\n"),
+    ],
+)
+def test_hash_changes_with_inputs(repo, change):
+    before = dc.docs_inputs_hash(repo)
+    change(repo)
+    assert dc.docs_inputs_hash(repo) != before
+
+
+def test_hash_ignores_other_files(repo, monkeypatch):
+    before = dc.docs_inputs_hash(repo)
+    (repo / "template/other.jinja").write_text("unrelated\n")
+    (repo / "docs/docs/__pycache__").mkdir()
+    (repo / "docs/docs/__pycache__/x.pyc").write_bytes(b"\0")
+    assert dc.docs_inputs_hash(repo) == before
+    monkeypatch.setenv("DEMO_DOCS_URL", "https://elsewhere")
+    assert dc.docs_inputs_hash(repo) != before
+
+
+def test_site_stamp(tmp_path):
+    site = tmp_path / "site"
+    assert not dc.site_is_fresh(site, "abc")
+    site.mkdir()
+    dc.mark_site(site, "abc")
+    assert dc.site_is_fresh(site, "abc")
+    assert not dc.site_is_fresh(site, "def")
@@ -0,0 +1,102 @@
+"""
+Unit tests for `scripts/generate_example_matrix.py`.
+"""
+
+from __future__ import annotations
+
+import itertools
+
+import pytest
+from ruamel.yaml import YAML
+from typer.testing import CliRunner
+
+from scripts import generate_example_matrix as gem
+
+QUESTIONS = gem.load_questions()
+
+
+def _pairs(assignment):
+    return set(itertools.combinations(assignment, 2))
+
+
+def test_factors_come_from_copier_yml():
+    names = [name for name, _ in gem.discover_factors(QUESTIONS)]
+
+    for expected in (
+        "uses_conda",
+        "smk_file_exists",
+        "script_style",
+        "smk_file_name",
+    ):
+        assert expected in names
+    assert "rule_name" not in names
+
+
+def test_pinned_questions_are_not_factors():
+    """Without `format_code` the generated project fails its lint tests."""
+    names = [name for name, _ in gem.discover_factors(QUESTIONS)]
+
+    assert "format_code" not in names
+    with pytest.raises(ValueError, match="format_code"):
+        gem.discover_factors(QUESTIONS, ["format_code"])
+
+
+def test_hidden_questions_are_not_factors():
+    """`uses_package` (`when: false`) would select unimplemented module rules."""
+    names = [name for name, _ in gem.discover_factors(QUESTIONS)]
+
+    assert "uses_package" not in names
+    with pytest.raises(ValueError, match="uses_package"):
+        gem.discover_factors(QUESTIONS, ["uses_package"])
+
+
+def test_unknown_factor_is_rejected():
+    with pytest.raises(ValueError, match="rule_name"):
+        gem.discover_factors(QUESTIONS, ["rule_name"])
+
+
+def test_inactive_questions_are_dropped():
+    """`module_type` is only asked when the hidden `uses_package` is true."""
+    factors = gem.discover_factors(QUESTIONS, ["module_type", "smk_file_exists"])
+    pool = gem.candidates(factors, QUESTIONS)
+
+    assert pool == [(("smk_file_exists", True),), (("smk_file_exists", False),)]
+
+
+def test_every_candidate_renders_an_smk_file():
+    """No generated example selects a module rule, which has no smk file."""
+    pool = gem.candidates(gem.discover_factors(QUESTIONS), QUESTIONS)
+
+    assert all(dict(a).get("module_type", "none") == "none" for a in pool)
+
+
+def test_covering_set_covers_every_reachable_pair():
+    factors = gem.discover_factors(QUESTIONS)
+    pool = gem.candidates(factors, QUESTIONS)
+
+    chosen = gem.covering_set(pool, strength=2)
+
+    reachable = set().union(*(_pairs(a) for a in pool))
+    assert reachable <= set().union(*(_pairs(a) for a in chosen))
+    assert len(chosen) < len(pool) / 4
+
+
+def test_cli_writes_discoverable_examples(tmp_path):
+    out = tmp_path / "generated"
+    result = CliRunner().invoke(
+        gem.app,
+        ["--factor", "uses_conda", "--factor", "smk_file_name", "--out", str(out)],
+    )
+    assert result.exit_code == 0, result.output
+
+    example_dirs = sorted(out.iterdir())
+    # Two factors with two levels each: every pair is a full combination.
+    assert [d.name for d in example_dirs] == [f"matrix-t2-{i}" for i in range(1, 5)]
+    answers = [YAML(typ="safe").load(d / "rule.yml") for d in example_dirs]
+    assert {a["uses_conda"] for a in answers} == {True, False}
+    assert all(a["format_code"] is True for a in answers)
+    # `conda_env_key` is only asked with `uses_conda`.
+    assert all(("conda_env_key" in a) == a["uses_conda"] for a in answers)
+    # The default level leaves the question out so Copier's default applies.
+    assert sum("smk_file_name" in a for a in answers) == 2
+    assert all((d / "package.yml").is_file() for d in example_dirs)
@@ -0,0 +1,87 @@
+"""
+Unit tests for `scripts/render_fanout.py`.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+from pytest_copie.plugin import Result
+
+from scripts import render_fanout as rf
+from scripts.copie_helpers import make_copier_config, new_copie
+
+
+@pytest.fixture
+def parent(tmp_path) -> Path:
+    """A rendered package project with shareable and private files."""
+    root = tmp_path / "parent"
+    for rel, text in {
+        "pyproject.toml": "[project]\n",
+        "workflow/rules/includes.smk": "",
+        "data/raw/input.bin": "raw",
+        ".git/objects/ab/cdef": "object",
+    }.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(text)
+    os.symlink("raw/input.bin", root / "data" / "latest")
+    return root
+
+
+def test_clone_copies_files_without_touching_the_parent(parent, tmp_path, monkeypatch):
+    monkeypatch.setattr(rf, "fcntl", None)  # force the copy fallback
+    modes = {p: p.stat().st_mode for p in parent.rglob("*") if not p.is_symlink()}
+    clone = tmp_path / "clone"
+
+    counts = rf.clone_tree(parent, clone)
+
+    assert counts == {"copied": 5}
+    assert {p: p.stat().st_mode for p in modes} == modes
+    shared = clone / "data/raw/input.bin"
+    assert shared.stat().st_ino != (parent / "data/raw/input.bin").stat().st_ino
+    assert os.readlink(clone / "data/latest") == "raw/input.bin"
+
+    # Any file may be rewritten in place, e.g. by a formatter or notebook step.
+    for rel in ("workflow/rules/includes.smk", "data/raw/input.bin"):
+        with (clone / rel).open("r+") as fp:
+            fp.write("x")
+    assert (parent / "workflow/rules/includes.smk").read_text() == ""
+    assert (parent / "data/raw/input.bin").read_text() == "raw"
+
+
+def test_clone_uses_reflinks_when_available(parent, tmp_path, monkeypatch):
+    monkeypatch.setattr(rf, "_reflink", lambda src, dst: dst.write_bytes(b"") or True)
+
+    counts = rf.clone_tree(parent, tmp_path / "clone")
+
+    assert counts == {"reflinked": 4, "copied": 1}
+
+
+def test_fan_out_copie_renders_onto_a_clone(parent, tmp_path):
+    template = tmp_path / "template"
+    (template / "template").mkdir(parents=True)
+    (template / "copier.yml").write_text(
+        "_subdirectory: template\nrule_name:\n  type: str\n  default: demo\n"
+    )
+    (template / "template" / "workflow").mkdir()
+    (template / "template" / "workflow" / "{{ rule_name }}.smk.jinja").write_text(
+        "rule {{ rule_name }}:\n"
+    )
+    work = tmp_path / "work"
+    (work / "rule").mkdir(parents=True)
+
+    copie = new_copie(
+        template_dir=template,
+        test_dir=work / "rule",
+        config_file=make_copier_config(work),
+        parent_result=Result(project_dir=parent),
+        fan_out=True,
+    )
+    result = copie.copy(extra_answers={"rule_name": "clean"})
+
+    assert result.exit_code == 0, result.exception
+    assert (result.project_dir / "workflow/clean.smk").read_text() == "rule clean:\n"
+    assert (result.project_dir / "data/raw/input.bin").read_text() == "raw"
+    assert not (parent / "workflow/clean.smk").exists()
@@ -0,0 +1,54 @@
+"""
+Unit tests for `scripts/render_profile.py`.
+"""
+
+from __future__ import annotations
+
+import pstats
+import time
+
+from scripts import render_profile as rp
+
+
+def _leaf() -> None:
+    time.sleep(0)
+    sum(i * i for i in range(20_000))
+
+
+def _render() -> None:
+    for _ in range(3):
+        _leaf()
+
+
+def test_profiled_is_a_no_op_without_a_directory(tmp_path, monkeypatch):
+    """Nothing is written, not even relative to the working directory."""
+    monkeypatch.chdir(tmp_path)
+
+    with rp.profiled(None, "demo"):
+        _render()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profiled_writes_pstats_and_collapsed_stacks(tmp_path):
+    with rp.profiled(tmp_path / "profiles", "demo-rule"):
+        _render()
+
+    stats = pstats.Stats(str(tmp_path / "profiles" / "demo-rule.pstats"))
+    assert any(name == "_leaf" for _, _, name in stats.stats)
+
+    lines = (tmp_path / "profiles" / "demo-rule.collapsed").read_text().splitlines()
+    stacks = dict(line.rsplit(" ", 1) for line in lines)
+    assert all(int(micros) > 0 for micros in stacks.values())
+    # The leaf's work shows up below its caller, for flamegraph tools.
+    assert any("(_render);" in stack and "(_leaf)" in stack for stack in stacks)
+
+
+def test_frame_label_is_safe_for_collapsed_stacks():
+    assert rp.frame_label(("/x/copier/_main.py", 922, "_render_file")) == (
+        "_main.py:922(_render_file)"
+    )
+    assert rp.frame_label(("~", 0, "<built-in method time.sleep>")) == (
+        "<built-in_method_time.sleep>"
+    )
+    assert ";" not in rp.frame_label(("a;b.py", 1, "f"))
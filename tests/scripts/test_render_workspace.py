@@ -0,0 +1,126 @@
+"""
+Unit tests for `scripts/render_workspace.py`.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts import render_workspace as rw
+
+
+def _fill(path: Path, rel: str, size: int) -> None:
+    target = path / rel
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(b"x" * size)
+
+
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("512", 512), ("2K", 2048), ("1.5M", 1572864), ("1GiB", 1024**3), (7, 7)],
+)
+def test_parse_size(value, expected):
+    assert rw.parse_size(value) == expected
+
+
+def test_parse_size_rejects_garbage():
+    with pytest.raises(ValueError):
+        rw.parse_size("lots")
+
+
+def test_released_renders_are_evicted_lru_tox_first(tmp_path):
+    ws = rw.RenderWorkspace(tmp_path, quota=2500)
+    old, new = ws.acquire("copie_old"), ws.acquire("copie_new")
+    for render in (old, new):
+        _fill(render, "rule/copie000/workflow/rules/demo.smk", 100)
+        _fill(render, "rule/copie000/.tox/lint/lib.so", 1000)
+    ws.release(old)
+    ws.release(new)
+    assert ws.entries().keys() == {old.name, new.name}
+
+    ws.quota = 1500
+    evicted = ws.enforce_quota()
+
+    # Trimming the oldest render's tox env is enough.
+    assert evicted == [old / "rule/copie000/.tox"]
+    assert (old / "rule/copie000/workflow/rules/demo.smk").exists()
+    assert (new / "rule/copie000/.tox").exists()
+
+    # Then the other tox env, and only then the oldest render itself.
+    ws.quota = 150
+    ws.enforce_quota()
+
+    assert not (new / "rule/copie000/.tox").exists()
+    assert not old.exists()
+    assert ws.entries().keys() == {new.name}
+
+
+def test_acquire_makes_room_for_renders_in_use(tmp_path):
+    """Renders still in use count toward the quota at the next acquire."""
+    earlier = rw.RenderWorkspace(tmp_path)
+    old = earlier.acquire("copie_old")
+    _fill(old, "rule/data.bin", 1000)
+    earlier.release()
+
+    ws = rw.RenderWorkspace(tmp_path, quota=1500)
+    first = ws.acquire("copie_first")
+    _fill(first, "rule/data.bin", 1000)
+    assert old.exists()
+
+    ws.acquire("copie_second")
+
+    assert not old.exists()
+    assert first.exists()
+    assert ws.entries()[first.name]["size"] == 1000
+
+
+def test_owned_and_kept_renders_survive_the_quota(tmp_path):
+    ws = rw.RenderWorkspace(tmp_path, quota=0)
+    owned = ws.acquire("collect_a")
+    _fill(owned, "rule/data.bin", 100)
+    kept_ws = rw.RenderWorkspace(tmp_path, quota=0, keep=True)
+    kept = kept_ws.acquire("copie_b")
+    _fill(kept, "rule/data.bin", 100)
+    kept_ws.release()
+
+    ws.enforce_quota()
+
+    assert owned.exists() and kept.exists()
+    assert ws.entries()[kept.name]["kept"] is True
+
+
+def test_purge_removes_everything_but_live_renders(tmp_path):
+    ws = rw.RenderWorkspace(tmp_path, keep=True)
+    kept = ws.acquire("copie_kept")
+    ws.release()
+    live = ws.acquire("copie_live")
+    orphan = ws.acquire("copie_orphan")
+    # A render left behind by a crashed session.
+    other = rw.RenderWorkspace(tmp_path)
+    with other._locked_index() as index:
+        index[orphan.name]["owner"] = _dead_pid()
+
+    removed = other.purge()
+
+    assert set(removed) == {kept, orphan}
+    assert live.exists() and not kept.exists() and not orphan.exists()
+
+
+def test_discard_forgets_the_render(tmp_path):
+    ws = rw.RenderWorkspace(tmp_path)
+    render = ws.acquire("copie_failed")
+
+    ws.discard(render)
+
+    assert not render.exists()
+    assert ws.entries() == {}
@@ -0,0 +1,63 @@
+"""
+Unit tests for `scripts/rule_api.py`, against a small local template.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from scripts import rule_api as ra
+
+
+def test_generate_rule_returns_a_structured_result(mini_template, mini_project):
+    result = ra.generate_rule(mini_project, {}, template=mini_template)
+    assert result.ok
+    assert result.written == [".copier-answers.yml", "pkg_rule.py", "task.txt"]
+    assert result.skipped == ["keep.txt"]
+    assert (mini_project / "keep.txt").read_text() == "user edits\n"
+    assert result.answers == {"format_code": True, "name": "pkg_rule"}
+    assert set(result.phases) == {"copy", "total"}
+    # The `black ./` task ran.
+    assert (mini_project / "pkg_rule.py").read_text() == ('x = {"a": 1, "b": [1, 2]}\n')
+    assert result.to_dict()["project_dir"] == str(mini_project)
+    assert result.external_data == {"parent": ".answers/parent.yml"}
+
+
+def test_format_and_tasks_switches(mini_template, mini_project):
+    ra.generate_rule(
+        mini_project, {"format_code": True}, format=False, template=mini_template
+    )
+    assert "x = {'a':1" in (mini_project / "pkg_rule.py").read_text()
+    assert (mini_project / "task.txt").read_text() == "pkg_rule"
+
+    result = ra.generate_rule(
+        mini_project, {"name": "other"}, tasks=False, template=mini_template
+    )
+    assert "other.py" in result.written
+    assert (mini_project / "task.txt").read_text() == "pkg_rule"
+
+
+def test_failed_task_raises_with_the_partial_result(
+    mini_template, mini_project, monkeypatch
+):
+    copier_yml = mini_template.src / "copier.yml"
+    copier_yml.write_text(copier_yml.read_text().replace("black ./", "false"))
+
+    with pytest.raises(ra.RuleGenerationError) as info:
+        ra.generate_rule(mini_project, {}, template=mini_template)
+    result = info.value.result
+    assert not result.ok
+    assert "false" in result.error
+    assert "pkg_rule.py" in result.written
+
+
+def test_required_external_data_fails_before_writing(mini_template, tmp_path):
+    project = tmp_path / "bare"
+    project.mkdir()
+    with pytest.raises(ra.RuleGenerationError, match="'parent'") as info:
+        ra.generate_rule(
+            project, {}, template=mini_template, require_external_data=["parent"]
+        )
+    assert info.value.result.external_data == {"parent": None}
+    assert info.value.result.written == []
+    assert list(project.iterdir()) == []
@@ -0,0 +1,62 @@
+"""
+Unit tests for `scripts/rule_daemon.py`, against a small local template.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from scripts import rule_daemon as rd
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+
+def test_client_server_roundtrip(tmp_path, mini_template, mini_project):
+    sock = tmp_path / "daemon.sock"
+    server = rd.RuleDaemon(sock, mini_template)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert rd.request({"op": "ping"}, sock)["ok"]
+        response = rd.request(
+            {
+                "op": "generate",
+                "project_dir": str(mini_project),
+                "answers": {},
+            },
+            sock,
+        )
+        assert response["ok"], response
+        assert "pkg_rule.py" in response["written"]
+        assert response["skipped"] == ["keep.txt"]
+        assert response["answers"]["name"] == "pkg_rule"
+        missing = rd.request(
+            {"op": "generate", "project_dir": str(tmp_path / "nope")}, sock
+        )
+        assert not missing["ok"]
+        assert rd.request({"op": "bogus"}, sock) == {
+            "ok": False,
+            "error": "Unknown op: 'bogus'",
+        }
+        assert rd.request({"op": "ping"}, sock)["served"] == 1
+        assert rd.request({"op": "stop"}, sock) == {"ok": True}
+        thread.join(timeout=5)
+    finally:
+        server.server_close()
+    assert not sock.exists()
+
+
+def test_client_does_not_import_copier():
+    """The `generate`/`stop` clients start without the Copier import cost."""
+    code = "import sys, scripts.rule_daemon; print('copier' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,113 @@
+"""
+Unit tests for `scripts/rule_rollout.py`, against a small local template.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+
+import pytest
+from typer.testing import CliRunner
+
+from scripts import rule_rollout as rr
+
+REQUIRED = ("parent",)
+
+
+@pytest.fixture
+def fleet(tmp_path, make_project):
+    """Two projects, one without parent answers and a missing directory."""
+    good = [make_project(tmp_path / name, package=name) for name in ("alpha", "beta")]
+    orphan = tmp_path / "orphan"
+    orphan.mkdir()
+    return good, orphan, tmp_path / "missing"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_rollout_reports_every_project(mini_template, fleet, jobs):
+    (alpha, beta), orphan, missing = fleet
+    outcomes = rr.rollout(
+        [alpha, orphan, beta, missing, alpha],
+        {},
+        jobs=jobs,
+        format=False,
+        src=mini_template.src,
+        ref=None,
+        require_external_data=REQUIRED,
+    )
+
+    assert [o.project_dir for o in outcomes] == [
+        str(p) for p in (alpha, orphan, beta, missing)
+    ]
+    assert [o.ok for o in outcomes] == [True, False, True, False]
+    # Each project's own parent answers feed the render.
+    assert (alpha / "alpha_rule.py").is_file()
+    assert (beta / "beta_rule.py").is_file()
+    assert outcomes[0].written == [".copier-answers.yml", "alpha_rule.py", "task.txt"]
+    assert outcomes[0].result["external_data"] == {"parent": ".answers/parent.yml"}
+    # A project without parent answers fails before anything is written.
+    assert "'parent'" in outcomes[1].error
+    assert list(orphan.iterdir()) == []
+    assert outcomes[3].error == "not a directory"
+
+
+def test_task_output_is_captured_per_project(mini_template, mini_project, capfd):
+    """Subprocess output lands in the outcome, not on the terminal."""
+    outcome = rr.apply_rule(
+        mini_project,
+        {},
+        format=False,
+        template=mini_template,
+        require_external_data=REQUIRED,
+    )
+
+    assert outcome.ok, outcome.error
+    assert "task done" in outcome.output
+    assert "task done" not in capfd.readouterr().out
+
+
+def test_cli_summary_and_report(mini_template, fleet, tmp_path):
+    (alpha, beta), orphan, _ = fleet
+    src = mini_template.src
+    for cmd in (
+        ["git", "init", "-q"],
+        ["git", "add", "-A"],
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "t"],
+    ):
+        subprocess.run(cmd, cwd=src, check=True)
+    answers = tmp_path / "rule.yml"
+    answers.write_text("format_code: false\n")
+    fleet_file = tmp_path / "fleet.txt"
+    fleet_file.write_text("# the fleet\nbeta\norphan  # no parent answers\n")
+    report = tmp_path / "report.json"
+
+    result = CliRunner().invoke(
+        rr.app,
+        [
+            str(answers),
+            str(alpha),
+            "--projects-file",
+            str(fleet_file),
+            "--jobs",
+            "1",
+            "--template",
+            str(src),
+            "--require-data",
+            "parent",
+            "--report",
+            str(report),
+        ],
+    )
+
+    assert result.exit_code == 1, result.output
+    lines = result.stdout.splitlines()
+    assert [line.split()[:2] for line in lines] == [
+        ["ok", str(alpha)],
+        ["ok", str(beta)],
+        ["FAILED", str(orphan)],
+    ]
+    assert "2/3 project(s) updated" in result.stderr
+    data = json.loads(report.read_text())
+    assert [entry["ok"] for entry in data] == [True, True, False]
+    assert data[0]["written"] == [".copier-answers.yml", "alpha_rule.py", "task.txt"]
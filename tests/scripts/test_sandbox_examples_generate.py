@@ -139,7 +139,85 @@ def test_cli_generate_happy_path(
 
     runner = CliRunner()
     # pass the example name so the command exits cleanly (exit-code 0)
-    result = runner.invoke(seg.app, ["fake-example", ex_name])
+    result = runner.invoke(seg.app, ["generate", ex_name])
 
     assert result.exit_code == 0
     assert sentinel.is_file()
+
+
+def test_cli_generate_writes_render_profiles(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """--profile-render writes pstats and collapsed stacks per template."""
+    _, ex_name = _prepare_single_example(tmp_path, monkeypatch=monkeypatch)
+    monkeypatch.setenv("RENDER_WORKSPACE_DIR", str(tmp_path / "workspace"))
+    profiles = tmp_path / "profiles"
+
+    result = CliRunner().invoke(
+        seg.app, ["generate", ex_name, "--profile-render", str(profiles)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert sorted(p.name for p in profiles.iterdir()) == [
+        f"{ex_name}-package.collapsed",
+        f"{ex_name}-package.pstats",
+        f"{ex_name}-rule.collapsed",
+        f"{ex_name}-rule.pstats",
+    ]
+
+
+def test_cli_watch_renders_then_watches_a_template_copy(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """`watch` renders first and syncs the template copy the re-renders read."""
+    sentinel, ex_name = _prepare_single_example(tmp_path, monkeypatch=monkeypatch)
+    monkeypatch.setenv("RENDER_WORKSPACE_DIR", str(tmp_path / "workspace"))
+    (seg.TEMPLATE_RULE_DIR / "copier.yml").write_text("_subdirectory: template\n")
+    exported = []
+
+    def stop(watched, state, *, debounce):
+        exported.extend(
+            p.relative_to(tmp_path / "workspace").parts[1:]
+            for p in (tmp_path / "workspace").glob("watch_template-*/**/*.yml")
+        )
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(seg, "wait_for_changes", stop)
+
+    result = CliRunner().invoke(seg.app, ["watch", ex_name])
+
+    assert result.exit_code == 0, result.output
+    assert sentinel.is_file()
+    assert exported == [("template", "copier.yml")]
+    assert "Stopped watching." in result.output
+    assert not list((tmp_path / "workspace").glob("watch_template-*"))
+
+
+def test_rerender_rule_patches_the_sandbox(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mini_template, mini_project
+) -> None:
+    """Re-renders clone the package render and patch only the sandbox."""
+    monkeypatch.setenv("RENDER_WORKSPACE_DIR", str(tmp_path / "workspace"))
+    rule_yml = tmp_path / "rule.yml"
+    rule_yml.write_text("format_code: false\n")
+    example = seg.Example(
+        name="demo", package_answers_file=rule_yml, rule_answers_file=rule_yml
+    )
+    sandbox = tmp_path / "sandbox"
+    seg.clone_tree(mini_project, sandbox)
+    render = seg._Render(
+        package=seg.Result(project_dir=mini_project),
+        project_dir=sandbox,
+        manifest=seg.tree_manifest(sandbox),
+    )
+    workspace = seg.RenderWorkspace()
+
+    assert seg._rerender_rule(example, render, workspace, mini_template)
+    assert (sandbox / "pkg_rule.py").read_text() == "x = {'a':1,  'b':[1,2]}\n"
+    assert (sandbox / "task.txt").read_text() == "pkg_rule"
+    assert not (mini_project / "pkg_rule.py").exists()
+
+    (mini_template.src / "{{ name }}.py.jinja").write_text("x = 2\n")
+    assert seg._rerender_rule(example, render, workspace, mini_template)
+    assert (sandbox / "pkg_rule.py").read_text() == "x = 2\n"
+    assert not list((tmp_path / "workspace").glob("watch_demo-*"))
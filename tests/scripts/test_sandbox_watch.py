@@ -0,0 +1,139 @@
+"""
+Unit tests for `scripts/sandbox_watch.py`.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from scripts import sandbox_watch as sw
+
+
+def _write(root: Path, rel: str, text: str) -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def test_wait_for_changes_debounces_a_burst_of_saves(tmp_path):
+    template = tmp_path / "template"
+    first = _write(template, "a.jinja", "a")
+    state = sw.snapshot([template])
+    # One save per poll for three polls, then quiet.
+    edits = iter(
+        [
+            lambda: None,
+            lambda: first.write_text("aa"),
+            lambda: _write(template, "b.jinja", "b"),
+            lambda: first.write_text("aaa"),
+        ]
+    )
+    polls = []
+
+    def fake_sleep(seconds: float) -> None:
+        polls.append(seconds)
+        next(edits, lambda: None)()
+
+    new_state, changed = sw.wait_for_changes(
+        [template], state, interval=0.1, debounce=0.25, sleep=fake_sleep
+    )
+
+    assert changed == {first, template / "b.jinja"}
+    assert new_state == sw.snapshot([template])
+    # Three quiet polls after the last save before returning.
+    assert len(polls) == 7
+
+
+def test_plan_rerender_maps_changes_to_examples(tmp_path):
+    template = tmp_path / "template"
+    package = {"a": tmp_path / "a/package.yml", "b": tmp_path / "b/package.yml"}
+    rule = {"a": tmp_path / "a/rule.yml", "b": tmp_path / "b/rule.yml"}
+
+    plan = sw.plan_rerender({rule["b"]}, [template], package, rule)
+    assert (plan.full, plan.rule) == (set(), {"b"})
+
+    plan = sw.plan_rerender(
+        {package["a"], template / "workflow/rule.smk.jinja"}, [template], package, rule
+    )
+    assert (plan.full, plan.rule) == ({"a"}, {"b"})
+
+    assert not sw.plan_rerender({tmp_path / "README.md"}, [template], package, rule)
+
+
+def test_patch_tree_only_touches_changed_render_output(tmp_path):
+    sandbox, render = tmp_path / "sandbox", tmp_path / "render"
+    for root in (sandbox, render):
+        _write(root, "workflow/rules/demo.smk", "rule demo:\n")
+        _write(root, "docs/rule-demo.md", "# demo\n")
+        _write(root, "old.txt", "stale\n")
+    previous = sw.tree_manifest(sandbox)
+    _write(sandbox, "notes.txt", "mine\n")  # created by the user
+    _write(sandbox, "docs/rule-demo.md", "# demo, edited\n")  # edited by the user
+
+    _write(render, "workflow/rules/demo.smk", "rule demo:\n    threads: 2\n")
+    _write(render, "workflow/scripts/demo.py", "")
+    (render / "old.txt").unlink()
+
+    manifest, written, removed, conflicts = sw.patch_tree(render, sandbox, previous)
+
+    assert written == ["workflow/rules/demo.smk", "workflow/scripts/demo.py"]
+    assert removed == ["old.txt"]
+    assert conflicts == []
+    assert (sandbox / "notes.txt").exists()
+    assert (sandbox / "docs/rule-demo.md").read_text() == "# demo, edited\n"
+    assert manifest == sw.tree_manifest(render)
+
+
+def test_patch_tree_keeps_user_edits_as_conflicts(tmp_path):
+    """A changed render never overwrites or removes a file edited in the sandbox."""
+    sandbox, render = tmp_path / "sandbox", tmp_path / "render"
+    for root in (sandbox, render):
+        _write(root, "workflow/rules/demo.smk", "rule demo:\n")
+        _write(root, "old.txt", "stale\n")
+    previous = sw.tree_manifest(sandbox)
+    _write(sandbox, "workflow/rules/demo.smk", "rule demo:\n    # mine\n")
+    _write(sandbox, "old.txt", "kept\n")
+    _write(sandbox, "new.py", "mine\n")  # the render now creates it too
+
+    _write(render, "workflow/rules/demo.smk", "rule demo:\n    threads: 2\n")
+    _write(render, "new.py", "rendered\n")
+    (render / "old.txt").unlink()
+
+    manifest, written, removed, conflicts = sw.patch_tree(render, sandbox, previous)
+
+    assert (written, removed) == ([], [])
+    assert conflicts == ["new.py", "old.txt", "workflow/rules/demo.smk"]
+    assert (sandbox / "workflow/rules/demo.smk").read_text() == (
+        "rule demo:\n    # mine\n"
+    )
+    assert (sandbox / "old.txt").read_text() == "kept\n"
+    # Still conflicts on the next render, until the edit is resolved.
+    again = sw.patch_tree(render, sandbox, manifest)
+    assert again[3] == conflicts
+
+
+def test_sync_template_copies_only_the_template_sources(tmp_path):
+    repo, export = tmp_path / "repo", tmp_path / "export"
+    _write(repo, "copier.yml", "name: {type: str}\n")
+    smk = _write(repo, "template/rule.smk.jinja", "rule {{ name }}:\n")
+    _write(repo, "template/old.jinja", "old\n")
+    readme = _write(repo, "README.md", "docs\n")
+    sources = ("copier.yml", "template", "tasks")
+
+    assert sw.sync_template(repo, sources, export) == 3
+    assert sorted(sw.tree_manifest(export)) == [
+        "copier.yml",
+        "template/old.jinja",
+        "template/rule.smk.jinja",
+    ]
+
+    smk.write_text("rule {{ name }}:\n    threads: 2\n")
+    (repo / "template/old.jinja").unlink()
+    readme.write_text("more docs\n")
+    changed = {smk, repo / "template/old.jinja", readme}
+
+    assert sw.sync_template(repo, sources, export, changed) == 2
+    assert (export / "template/rule.smk.jinja").read_text() == smk.read_text()
+    assert not (export / "template/old.jinja").exists()
+    assert not (export / "README.md").exists()
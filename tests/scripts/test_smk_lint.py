@@ -0,0 +1,118 @@
+"""
+Unit tests for `scripts/smk_lint.py`.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from scripts import smk_lint
+
+pytest.importorskip("snakemake")
+
+RULE = """\
+rule {name}:
+    localrule: True
+    log:
+        loguru=str(LOG_DIR / "{log}" / "loguru.log"),
+    benchmark:
+        repeat(str(LOG_DIR / "{log}" / "benchmark.tsv"), 3)
+    conda:
+        get_localized_conda(config["CONDA"]["ENVS"]["{env}"])
+    script:
+        str(WORKFLOW_BASE / "scripts/rules_global/{name}.py")
+"""
+
+
+def _write(root: Path, rel: str, text: str = "") -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def _project(root: Path, *rules: str) -> Path:
+    includes = "".join(f'include: "{name}.smk"\n' for name in rules)
+    _write(root, "workflow/rules/includes.smk", f'"""Dummy."""\n{includes}')
+    _write(root, "config/config.yaml", "CONDA:\n  ENVS:\n    env: envs/env.yaml\n")
+    _write(root, "workflow/envs/env.yaml", "dependencies: []\n")
+    for name in rules:
+        _write(
+            root,
+            f"workflow/rules/{name}.smk",
+            RULE.format(name=name, log=name, env="env"),
+        )
+        _write(root, f"workflow/scripts/rules_global/{name}.py")
+    return root
+
+
+def test_clean_project_has_no_issues(tmp_path):
+    report = smk_lint.lint_project(_project(tmp_path, "a", "b"))
+    assert report.issues == []
+    assert [rule.name for rule in report.rules] == ["a", "b"]
+    assert [p.name for p in report.files] == ["includes.smk", "a.smk", "b.smk"]
+
+
+def test_members_file_is_the_entry_point_in_bundle_mode(tmp_path):
+    project = _project(tmp_path, "a")
+    rules = project / "workflow" / "rules"
+    (rules / "includes.members.smk").write_text('include: "a.smk"\n')
+    (rules / "includes.smk").write_text('include: "includes.bundle.smk"\n')
+    report = smk_lint.lint_project(project)
+    assert report.issues == []
+    assert [p.name for p in report.files] == ["includes.members.smk", "a.smk"]
+
+
+def test_syntax_errors_keep_the_original_line(tmp_path):
+    project = _project(tmp_path, "a")
+    _write(
+        project,
+        "workflow/rules/a.smk",
+        "rule a:\n    localrule: True\n    frob:\n        1\n",
+    )
+    (issue,) = smk_lint.lint_project(project).issues
+    assert (issue.path, issue.line) == ("workflow/rules/a.smk", 3)
+    assert "frob" in issue.message
+
+
+def test_missing_files_duplicates_and_collisions(tmp_path):
+    project = _project(tmp_path, "a", "b")
+    (project / "workflow/scripts/rules_global/a.py").unlink()
+    (project / "workflow/envs/env.yaml").unlink()
+    _write(
+        project,
+        "workflow/rules/b.smk",
+        RULE.format(name="b", log="a", env="env")
+        + RULE.format(name="a", log="c", env="nope"),
+    )
+    (project / "workflow/rules/includes.smk").write_text(
+        'include: "a.smk"\ninclude: "b.smk"\ninclude: "gone.smk"\n'
+    )
+    messages = {
+        (i.severity, i.rule, i.message.split(":")[0])
+        for i in smk_lint.lint_project(project).issues
+    }
+    assert messages == {
+        ("error", None, "included file not found"),
+        ("error", "a", "script"),  # a.py removed
+        ("error", "a", "conda"),  # env file removed
+        ("error", "b", "conda"),
+        ("error", "b", "log.loguru"),  # same log as rule a
+        ("error", "b", "benchmark"),
+        ("error", "a", "rule name already defined in workflow/rules/a.smk"),
+        ("warning", "a", "conda"),  # env key `nope` not in config
+    }
+
+
+def test_cli_exit_code(tmp_path):
+    from typer.testing import CliRunner
+
+    project = _project(tmp_path, "a")
+    runner = CliRunner()
+    assert runner.invoke(smk_lint.app, [str(project)]).exit_code == 0
+    (project / "workflow/scripts/rules_global/a.py").unlink()
+    result = runner.invoke(smk_lint.app, [str(project)])
+    assert result.exit_code == 1
+    assert "1 error(s)" in result.output
@@ -0,0 +1,99 @@
+"""
+Unit tests for `scripts/snapshot_manifest.py`.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from scripts import snapshot_manifest as sm
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def project(tmp_path) -> Path:
+    files = {
+        "workflow/rules/demo.smk": "rule demo:\n    shell:\n        'true'\n",
+        "workflow/scripts/rules_global/demo.py": f"ROOT = '{tmp_path}/data'\n",
+        "docs/docs/contributing/templates/rule-demo.md": "# demo\n",
+        "copier-answers/rule-demo.yml": "_commit: abc123\n_src_path: /src\nrule_name: demo\n",
+        "pyproject.toml": "[project]\n",
+        "workflow/rules/common.smk": "# package rule file\n",
+        "workflow/rules/.includes.bundle.json": '{"st_mtime_ns": 1}\n',
+    }
+    for rel, text in files.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return tmp_path
+
+
+def test_globs_cover_the_rule_template_outputs():
+    globs = sm.rule_template_globs(ROOT_DIR)
+
+    assert "docs/docs/contributing/templates/rule-*.md" in globs
+    assert "workflow/rules/includes*.smk" in globs
+    assert sm.ANSWERS_GLOB in globs
+
+
+def test_manifest_is_normalized_and_scoped(project):
+    manifest = sm.build_manifest(project, sm.rule_template_globs(ROOT_DIR))
+    files = manifest["files"]
+
+    # Parent-template files are not part of the snapshot.
+    assert "pyproject.toml" not in files
+    assert files["workflow/scripts/rules_global/demo.py"]["text"] == (
+        "ROOT = '<PROJECT>/data'\n"
+    )
+    # Only rule files keep their text; volatile answers are dropped.
+    assert "text" not in files["copier-answers/rule-demo.yml"]
+    other = project / "copier-answers" / "rule-demo.yml"
+    other.write_text("_commit: def456\n_src_path: /elsewhere\nrule_name: demo\n")
+    again = sm.build_manifest(project, sm.rule_template_globs(ROOT_DIR))
+    assert again == manifest
+
+
+def test_answers_scope_the_manifest_to_the_rule(project):
+    """Package-owned and volatile files never enter a manifest."""
+    (project / "copier-answers/rule-demo.yml").write_text(
+        "rule_name: demo\nsmk_file_name: demo.smk\nuses_conda: false\n"
+    )
+    globs = sm.project_globs(ROOT_DIR, project)
+
+    assert "workflow/rules/demo.smk" in globs
+    files = sm.build_manifest(project, globs)["files"]
+    assert "workflow/rules/demo.smk" in files
+    assert "workflow/rules/common.smk" not in files
+    assert "workflow/rules/.includes.bundle.json" not in files
+    # Without answers the globs are broader, but volatile files stay out.
+    broad = sm.build_manifest(project, sm.rule_template_globs(ROOT_DIR))["files"]
+    assert "workflow/rules/.includes.bundle.json" not in broad
+
+
+def test_unreadable_manifest_is_missing(tmp_path):
+    path = tmp_path / "demo.json"
+    path.write_text("{not json")
+
+    assert sm.load_manifest(path) is None
+
+
+def test_diff_reports_added_removed_and_changed_text(project, tmp_path):
+    globs = sm.rule_template_globs(ROOT_DIR)
+    expected = sm.build_manifest(project, globs)
+    path = tmp_path / "snapshots" / "demo.json"
+    sm.save_manifest(path, expected)
+    assert sm.diff_manifests(sm.load_manifest(path), expected) == []
+
+    (project / "workflow/rules/demo.smk").write_text("rule demo:\n    threads: 2\n")
+    (project / "workflow/rules/extra.smk").write_text("")
+    (project / "docs/docs/contributing/templates/rule-demo.md").unlink()
+
+    lines = sm.diff_manifests(expected, sm.build_manifest(project, globs))
+
+    assert "removed: docs/docs/contributing/templates/rule-demo.md" in lines
+    assert "added:   workflow/rules/extra.smk" in lines
+    assert "changed: workflow/rules/demo.smk" in lines
+    assert "+    threads: 2" in lines
@@ -0,0 +1,72 @@
+"""
+Unit tests for `scripts/stress_rule_generation.py`.
+
+Rendering needs the package template submodule, so only the measurement
+and reporting helpers are checked here.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from scripts import stress_rule_generation as stress
+
+
+def test_run_rules_times_each_rule():
+    calls = []
+
+    latencies = stress.run_rules(calls.append, 5)
+
+    assert calls == [0, 1, 2, 3, 4]
+    assert len(latencies) == 5 and all(x >= 0 for x in latencies)
+
+
+def test_phase_records_time_and_peak_rss():
+    phases = {}
+
+    with stress.phase(phases, "rules"):
+        pass
+
+    assert set(phases["rules"]) == {
+        "seconds",
+        "peak_rss_mb",
+        "peak_children_rss_mb",
+    }
+    assert phases["rules"]["peak_rss_mb"] > 0
+
+
+def test_scaling_curve_reports_the_growth_exponent():
+    # Latency of the i-th rule grows linearly with the project size.
+    latencies = [0.01 * (i + 1) for i in range(1000)]
+
+    curve = stress.scaling_curve(latencies, [1000, 10, 100, 5000])
+
+    assert [p["rules"] for p in curve] == [10, 100, 1000]
+    assert curve[0]["median_latency_s"] == pytest.approx(0.1)
+    assert "growth_exponent" not in curve[0]
+    assert curve[2]["growth_exponent"] == pytest.approx(1.0, abs=0.02)
+    assert stress.scaling_curve([0.2] * 100, [10, 100])[1]["growth_exponent"] == 0
+
+
+def test_regressions_compare_latency_per_size():
+    baseline = {"curve": [{"rules": 10, "median_latency_s": 1.0}]}
+    report = {
+        "curve": [
+            {"rules": 10, "median_latency_s": 1.3},
+            {"rules": 100, "median_latency_s": 9.0},  # not in the baseline
+        ]
+    }
+
+    assert stress.regressions(baseline, report, tolerance=0.5) == []
+    assert stress.regressions(baseline, report, tolerance=0.25) == [
+        "10 rules: median latency 1.300s vs 1.000s baseline"
+    ]
+
+
+def test_each_synthetic_rule_gets_its_own_smk_file():
+    answers = stress.rule_answers({"uses_conda": True}, 7, format_code=False)
+
+    assert answers["rule_name"] == "stress_rule_0007"
+    assert answers["smk_file_name"] == "stress_rule_0007.smk"
+    assert answers["smk_file_exists"] is False
+    assert answers["uses_conda"] is True
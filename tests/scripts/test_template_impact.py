@@ -0,0 +1,190 @@
+"""
+Unit tests for `scripts/template_impact.py`.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from scripts import template_impact as impact
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+ENVS = [
+    "py312-lint",
+    "py312-typecheck-core",
+    "py312-workflow-unit-core",
+    "py312-workflow-unit-docs",
+    "py312-workflow-rules",
+    "py312-docs",
+]
+
+# Shaped like the `tox.ini` of the package template.
+TOX_INI = """\
+[tox]
+envlist = py312-{lint,typecheck-core,workflow-unit-{core,docs},workflow-rules,docs}
+
+[testenv]
+commands =
+    workflow-unit-core: pytest tests/workflow/scripts/rules_conda_CORE {posargs}
+    workflow-unit-docs: pytest tests/workflow/scripts/rules_conda_DOCS {posargs}
+    workflow-rules: pytest tests/workflow/rules \\
+        --basetemp={envtmpdir}
+
+[testenv:py{311,312}-lint]
+commands =
+    ruff check .
+    snakefmt --check workflow/
+
+[testenv:py312-typecheck-core]
+commands = mypy workflow/scripts/rules_conda_CORE tests/workflow/scripts
+
+[testenv:py312-docs]
+changedir = docs
+commands = mkdocs build --strict -f mkdocs.yml
+"""
+
+SCRIPT_TEMPLATE = (
+    "template/workflow/scripts/{% if not uses_conda %}rules_global"
+    "{% else %}rules_conda_{{ conda_env_key }}{% endif %}"
+    "{{ _copier_conf.sep }}{{ rule_name }}.py.jinja"
+)
+
+
+@pytest.fixture
+def project(tmp_path) -> Path:
+    """A minimal rendered project with one rule."""
+    for rel in (
+        "docs/docs/contributing/templates/rule-demo.md",
+        "workflow/rules/demo.smk",
+        "workflow/scripts/rules_conda_CORE/demo.py",
+        "tests/workflow/scripts/rules_conda_CORE/test_demo.py",
+        "tests/workflow/scripts/rules_conda_DOCS/test_other.py",
+        "docs/mkdocs.yml",
+        "tests/workflow/rules/test_snakemake_demo.py",
+        ".copier-answers/post-copier-todos/rule-demo.md",
+        ".copier-answers/rules-index.json",
+        ".tox/py312-lint/ignored.txt",
+    ):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+    (tmp_path / "tox.ini").write_text(TOX_INI)
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        (
+            "template/docs/docs/contributing/templates/rule-{{ rule_name }}.md.jinja",
+            "docs/docs/contributing/templates/rule-*.md",
+        ),
+        (SCRIPT_TEMPLATE, "workflow/scripts/*/*.py"),
+        (
+            (
+                "template/.copier-answers/{% if module_type == 'none' and "
+                "smk_file_exists %}rule-blocks{% endif %}/rule-{{ rule_name }}.smk.jinja"
+            ),
+            ".copier-answers/rule-blocks/rule-*.smk",
+        ),
+    ],
+)
+def test_rendered_glob(source, expected):
+    assert impact.rendered_glob(source) == expected
+
+
+def test_docs_template_only_selects_docs_env(project):
+    """Editing the rule docs page must not rebuild the workflow envs."""
+    globs = impact.impacted_globs(
+        ["template/docs/docs/contributing/templates/rule-{{ rule_name }}.md.jinja"],
+        ROOT_DIR,
+    )
+
+    # `ruff check .` lints every file.
+    assert impact.affected_envs(project, ENVS, globs) == ["py312-lint", "py312-docs"]
+
+
+def test_script_template_selects_script_envs(project):
+    globs = impact.impacted_globs([SCRIPT_TEMPLATE], ROOT_DIR)
+
+    assert impact.affected_envs(project, ENVS, globs) == ENVS[:-1]
+
+
+def test_include_maps_to_the_templates_including_it(project):
+    """`includes/rule.smk.jinja` reaches the rendered smk file."""
+    globs = impact.impacted_globs(["includes/rule.smk.jinja"], ROOT_DIR)
+
+    assert globs is not None
+    assert "workflow/rules/*" in globs
+    assert impact.affected_envs(project, ENVS, globs) == [
+        "py312-lint",
+        "py312-workflow-rules",
+    ]
+
+
+def test_rules_index_task_selects_workflow_rules(project):
+    """The session dry-run of the rule tests reads the rules index."""
+    globs = impact.impacted_globs(["tasks/rules_index.py"], ROOT_DIR)
+
+    assert impact.affected_envs(project, ENVS, globs) == [
+        "py312-lint",
+        "py312-workflow-rules",
+    ]
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "copier.yml",
+        "extensions/strict_undefined.py",
+        "tasks/unknown.py",
+        "scripts/render_fanout.py",
+        "scripts/render_profile.py",
+        "scripts/render_workspace.py",
+    ],
+)
+def test_global_sources_select_everything(project, source):
+    globs = impact.impacted_globs([source], ROOT_DIR)
+
+    assert globs is None
+    assert impact.affected_envs(project, ENVS, globs) == ENVS
+
+
+def test_unrelated_changes_select_nothing(project):
+    globs = impact.impacted_globs(["CHANGELOG.md", "docs/docs/index.md"], ROOT_DIR)
+
+    assert globs == set()
+    assert impact.affected_envs(project, ENVS, globs) == []
+
+
+def test_env_paths_come_from_the_rendered_tox_ini(project):
+    assert impact.tox_env_paths(project, ENVS) == {
+        "py312-lint": {".", "workflow"},
+        "py312-typecheck-core": {
+            "workflow/scripts/rules_conda_CORE",
+            "tests/workflow/scripts",
+        },
+        "py312-workflow-unit-core": {"tests/workflow/scripts/rules_conda_CORE"},
+        "py312-workflow-unit-docs": {"tests/workflow/scripts/rules_conda_DOCS"},
+        "py312-workflow-rules": {"tests/workflow/rules"},
+        "py312-docs": {"docs"},
+    }
+
+
+def test_env_without_known_paths_exercises_every_file(project):
+    """Envs `tox.ini` does not place, or a missing `tox.ini`, keep every file."""
+    (project / "tox.ini").write_text("[testenv]\ncommands = snakemake -n\n")
+    assert impact.tox_env_paths(project, ["py312-smoke"]) == {"py312-smoke": {"."}}
+    (project / "tox.ini").unlink()
+    assert impact.tox_env_paths(project, ENVS) == {env: {"."} for env in ENVS}
+
+
+def test_bookkeeping_files_select_nothing(project):
+    env_paths = impact.tox_env_paths(project, ENVS)
+    assert impact.envs_for_file(".copier-answers/rule-demo.yml", env_paths) == []
+    assert impact.envs_for_file("docs/index.md", {"py312-lint": {"."}}) == [
+        "py312-lint"
+    ]
@@ -0,0 +1,62 @@
+"""
+Unit tests for `scripts/template_shard.py`.
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from scripts import template_shard as ts
+
+PAIRS = [
+    ("a", "py312-lint"),
+    ("a", "py312-docs"),
+    ("a", "py312-workflow-rules"),
+    ("b", "py312-lint"),
+    ("b", "py312-docs"),
+    ("b", "py312-workflow-rules"),
+]
+
+
+@pytest.mark.parametrize("value", ["0/2", "3/2", "1", "a/b"])
+def test_parse_shard_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        ts.parse_shard(value)
+
+
+def test_shards_partition_the_matrix():
+    """Every pair lands in exactly one shard, in its original order."""
+    shards = [ts.select_shard(PAIRS, i, 3, {}) for i in (1, 2, 3)]
+
+    assert sorted(p for shard in shards for p in shard) == sorted(PAIRS)
+    for shard in shards:
+        assert shard == [p for p in PAIRS if p in shard]
+
+
+def test_heuristic_separates_the_heaviest_envs():
+    """Without history the two workflow-rules envs go to different shards."""
+    first, second = (ts.select_shard(PAIRS, i, 2, {}) for i in (1, 2))
+
+    assert ("a", "py312-workflow-rules") in first
+    assert ("b", "py312-workflow-rules") in second
+
+
+def test_recorded_durations_override_the_heuristic():
+    durations = {ts.pair_id(*pair): 1.0 for pair in PAIRS}
+    durations["a:py312-lint"] = 100.0
+
+    first = ts.select_shard(PAIRS, 1, 2, durations)
+
+    assert first == [("a", "py312-lint")]
+
+
+def test_save_durations_smooths_known_pairs(tmp_path):
+    path = tmp_path / "durations.json"
+
+    ts.save_durations(path, {"a:py312-lint": 10.0})
+    ts.save_durations(path, {"a:py312-lint": 20.0, "b:py312-lint": 4.0})
+
+    assert json.loads(path.read_text()) == {"a:py312-lint": 15.0, "b:py312-lint": 4.0}
+    assert ts.load_durations(tmp_path / "missing.json") == {}
@@ -0,0 +1,108 @@
+"""
+Unit tests for `scripts/tox_accounting.py`.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts import tox_accounting as ta
+
+# A child that holds ~64 MiB while its own child writes 1 MiB to disk.
+CHILD = """
+import subprocess, sys, time
+block = bytearray(64 * 1024 * 1024)
+write = "import sys; open(sys.argv[1], 'wb').write(b'0' * 2**20)"
+subprocess.run([sys.executable, "-c", write, sys.argv[1]], check=True)
+time.sleep(0.5)
+"""
+
+
+@pytest.mark.skipif(not Path("/proc/self/io").exists(), reason="needs /proc")
+def test_measure_covers_the_process_tree(tmp_path):
+    out = tmp_path / "out.bin"
+    with ta.measure(interval=0.05) as usage:
+        subprocess.run([sys.executable, "-c", CHILD, str(out)], check=True)
+
+    assert usage.wall_s >= 0.5
+    assert usage.cpu_s > 0
+    assert usage.peak_rss_bytes >= 64 * 1024**2
+    assert usage.peak_rss_bytes >= usage.max_process_rss_bytes >= 64 * 1024**2
+    # Storage writes; 0 on filesystems without block IO accounting (tmpfs).
+    assert usage.write_bytes is not None and usage.write_bytes >= 0
+
+
+def test_measure_fills_usage_when_the_block_raises():
+    with pytest.raises(subprocess.CalledProcessError), ta.measure() as usage:
+        subprocess.run([sys.executable, "-c", "raise SystemExit(3)"], check=True)
+    assert usage.wall_s > 0
+
+
+def test_usage_addition():
+    setup = ta.Usage(10.0, 4.0, 100, 80, 1000, None)
+    run = ta.Usage(20.0, 30.0, 300, 200, None, None)
+    total = setup + run
+    assert total == ta.Usage(30.0, 34.0, 300, 200, 1000, None)
+    assert ta.Usage.from_dict(total.to_dict()) == total
+
+
+def test_budget_parse_and_violations():
+    budget = ta.Budget.parse("py312-workflow-*:rss=1G, cpu=60,write=10M")
+    assert budget.limits == {"rss": 1024**3, "cpu": 60.0, "write": 10 * 1024**2}
+
+    usage = ta.Usage(wall_s=5, cpu_s=90, peak_rss_bytes=2 * 1024**3, write_bytes=None)
+    found = budget.violations("py312-workflow-rules", usage)
+    assert found == [
+        "rss 2.0G > 1.0G (budget 'py312-workflow-*')",
+        "cpu 90.0s > 60.0s (budget 'py312-workflow-*')",
+    ]
+    assert budget.violations("py312-lint", usage) == []
+    assert ta.check_budgets(
+        ta.parse_budgets(["*:wall=1", "py312-lint:cpu=1"]), "py312-lint", usage
+    ) == [
+        "wall 5.0s > 1.0s (budget '*')",
+        "cpu 90.0s > 1.0s (budget 'py312-lint')",
+    ]
+
+
+@pytest.mark.parametrize("spec", ["rss=1G", "env:", "env:mem=1G", "env:cpu"])
+def test_budget_parse_errors(spec):
+    with pytest.raises(ValueError):
+        ta.Budget.parse(spec)
+
+
+def test_report_and_summary(tmp_path):
+    light = ta.Usage(1.0, 1.0, 10 * 1024**2, 10 * 1024**2, 0, 2048)
+    heavy = ta.Usage(100.0, 250.0, 3 * 1024**3, 2 * 1024**3, None, None)
+    entries = {
+        "a:py312-lint": {
+            "setup": light,
+            "run": light,
+            "total": light + light,
+            "replayed": True,
+            "violations": [],
+        },
+        "a:py312-workflow-rules": {
+            "setup": light,
+            "run": heavy,
+            "total": light + heavy,
+            "replayed": False,
+            "violations": ["rss ..."],
+        },
+    }
+    path = tmp_path / "usage.json"
+    ta.write_report(path, entries)
+    data = json.loads(path.read_text())
+    assert data["a:py312-workflow-rules"]["total"]["peak_rss_bytes"] == 3 * 1024**3
+    assert data["a:py312-lint"]["replayed"] is True
+
+    header, first, second = ta.summary_lines(entries)
+    assert header.split()[:3] == ["variant:env", "wall", "cpu"]
+    assert first.startswith("a:py312-workflow-rules")
+    assert "3.0G" in first and first.endswith("OVER BUDGET")
+    assert second.endswith("(replayed)") and "4.0K" in second
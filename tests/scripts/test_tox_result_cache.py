@@ -0,0 +1,132 @@
+"""
+Unit tests for `scripts/tox_result_cache.py`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from scripts import tox_result_cache as trc
+
+VERSIONS = {"tox": "4.25.0", "python": "3.12.0"}
+
+
+class _DictCache:
+    """In-memory stand-in for `pytest.Cache`, with its JSON round trip."""
+
+    def __init__(self) -> None:
+        self._values: dict[str, str] = {}
+
+    def get(self, key: str, default: Any) -> Any:
+        return json.loads(self._values[key]) if key in self._values else default
+
+    def set(self, key: str, value: Any) -> None:
+        self._values[key] = json.dumps(value)
+
+
+def _git(repo: Path, *args: str) -> str:
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "CI",
+        "GIT_AUTHOR_EMAIL": "ci@example.invalid",
+        "GIT_COMMITTER_NAME": "CI",
+        "GIT_COMMITTER_EMAIL": "ci@example.invalid",
+    }
+    return subprocess.check_output(["git", *args], cwd=repo, env=env, text=True)
+
+
+@pytest.fixture
+def repo(tmp_path) -> Path:
+    """A git repo with a `template/` dir and an unrelated `docs/` dir."""
+    for rel in ("template/a.txt", "docs/index.md", "copier.yml"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(rel)
+    _git(tmp_path, "init", "--quiet")
+    _git(tmp_path, "add", "-A")
+    _git(tmp_path, "commit", "--quiet", "-m", "init")
+    return tmp_path
+
+
+def _commit(repo: Path, rel: str, text: str) -> None:
+    (repo / rel).write_text(text)
+    _git(repo, "commit", "--quiet", "-am", f"edit {rel}")
+
+
+def test_tree_hash_ignores_files_outside_the_template(repo):
+    before = trc.template_tree_hash(repo)
+
+    _commit(repo, "docs/index.md", "changed")
+    assert trc.template_tree_hash(repo) == before
+
+    _commit(repo, "template/a.txt", "changed")
+    assert trc.template_tree_hash(repo) != before
+
+
+def test_key_depends_on_every_part():
+    parts = {
+        "template_tree": "t",
+        "package_ref": "p",
+        "answers": trc.answers_hash({"a": 1}, {"b": 2}),
+        "env_name": "py312-lint",
+        "versions": VERSIONS,
+    }
+    key = trc.result_key(**parts)
+
+    assert key.startswith(trc.CACHE_PREFIX)
+    assert trc.result_key(**parts) == key
+    for name, value in [
+        ("template_tree", "t2"),
+        ("package_ref", "p2"),
+        ("answers", trc.answers_hash({"a": 1}, {"b": 3})),
+        ("env_name", "py312-docs"),
+        ("versions", {**VERSIONS, "tox": "4.26.0"}),
+    ]:
+        assert trc.result_key(**{**parts, name: value}) != key
+
+
+def test_recorded_pass_is_replayed():
+    key = trc.result_key(
+        template_tree="t",
+        package_ref="p",
+        answers="a",
+        env_name="py312-lint",
+        versions=VERSIONS,
+    )
+    cache = _DictCache()
+    assert trc.lookup(cache, key) is None
+
+    trc.record_pass(
+        cache,
+        key,
+        variant_id="demo",
+        env_name="py312-lint",
+        duration_s=1.23456,
+        stdout="out",
+        stderr="err",
+    )
+    entry = trc.lookup(cache, key)
+    assert entry is not None
+    assert (entry["stdout"], entry["stderr"], entry["duration_s"]) == (
+        "out",
+        "err",
+        1.235,
+    )
+
+
+def test_no_cacheprovider_is_a_miss():
+    trc.record_pass(
+        None,
+        "k",
+        variant_id="v",
+        env_name="e",
+        duration_s=0,
+        stdout="",
+        stderr="",
+    )
+    assert trc.lookup(None, "k") is None
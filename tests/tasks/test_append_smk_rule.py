@@ -0,0 +1,123 @@
+"""
+Unit tests for `tasks/append_smk_rule.py`.
+
+Every test `chdir`s into a temporary project root containing a staged rule
+block, mirroring how Copier runs the task after rendering.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+SCRIPT_PATH = ROOT_DIR / "tasks" / "append_smk_rule.py"
+
+spec = importlib.util.spec_from_file_location("append_smk_rule", SCRIPT_PATH)
+append_smk_rule = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+sys.modules["append_smk_rule"] = append_smk_rule
+assert spec.loader
+spec.loader.exec_module(append_smk_rule)  # type: ignore[attr-defined]
+
+EXISTING = 'rule existing:\n    shell:\n        "true"\n'
+
+
+def _stage(rule_name: str, body: str = "true") -> None:
+    staged = append_smk_rule.BLOCKS_DIR / f"rule-{rule_name}.smk"
+    staged.parent.mkdir(parents=True, exist_ok=True)
+    staged.write_text(f'rule {rule_name}:\n    shell:\n        "{body}"\n')
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch) -> Path:
+    """Project root with `workflow/rules/shared.smk` holding one rule."""
+    monkeypatch.chdir(tmp_path)
+    target = append_smk_rule.RULES_DIR / "shared.smk"
+    target.parent.mkdir(parents=True)
+    target.write_text(EXISTING)
+    return target
+
+
+def test_block_is_appended_after_existing_rules(project):
+    """Existing content is kept verbatim and the block is wrapped in markers."""
+    _stage("new_rule")
+
+    append_smk_rule.main(["new_rule", "shared.smk", "--no-format"])
+
+    text = project.read_text()
+    assert text.startswith(EXISTING + "\n\n# >>> able-workflow-rule-copier")
+    assert 'rule new_rule:\n    shell:\n        "true"\n' in text
+    assert text.endswith("# <<< able-workflow-rule-copier: rule new_rule <<<\n")
+
+
+def test_reappending_is_idempotent(project):
+    """Running the task twice leaves the file unchanged."""
+    _stage("new_rule")
+    append_smk_rule.main(["new_rule", "shared.smk", "--no-format"])
+    first = project.read_text()
+
+    append_smk_rule.main(["new_rule", "shared.smk", "--no-format"])
+
+    assert project.read_text() == first
+
+
+def test_untouched_block_is_updated_in_place(project):
+    """A re-rendered block replaces the previous one at the same position."""
+    _stage("new_rule")
+    append_smk_rule.main(["new_rule", "shared.smk", "--no-format"])
+    project.write_text(project.read_text() + "\n\nrule later:\n    shell: 'x'\n")
+
+    _stage("new_rule", body="echo updated")
+    append_smk_rule.main(["new_rule", "shared.smk", "--no-format"])
+
+    text = project.read_text()
+    assert "echo updated" in text
+    assert text.count("rule new_rule:") == 1
+    assert text.index("rule new_rule:") < text.index("rule later:")
+
+
+def test_edited_block_is_a_conflict(project):
+    """Hand edits inside the markers are never overwritten."""
+    _stage("new_rule")
+    append_smk_rule.main(["new_rule", "shared.smk", "--no-format"])
+    edited = project.read_text().replace(
+        'rule new_rule:\n    shell:\n        "true"',
+        'rule new_rule:\n    shell:\n        "echo mine"',
+    )
+    project.write_text(edited)
+
+    _stage("new_rule", body="echo theirs")
+    with pytest.raises(SystemExit, match="was edited since it was inserted"):
+        append_smk_rule.main(["new_rule", "shared.smk", "--no-format"])
+
+    assert project.read_text() == edited
+
+
+def test_unmanaged_rule_with_same_name_is_a_conflict(project):
+    """A hand-written rule of the same name blocks the insertion."""
+    _stage("existing")
+
+    with pytest.raises(SystemExit, match="already defines rule 'existing'"):
+        append_smk_rule.main(["existing", "shared.smk", "--no-format"])
+
+    assert project.read_text() == EXISTING
+
+
+def test_format_only_touches_the_block(project, monkeypatch):
+    """snakefmt receives the staged block, never the existing file."""
+    _stage("new_rule")
+    seen: list[str] = []
+
+    def fake_format(block: str) -> str:
+        seen.append(block)
+        return block.replace('"true"', '"formatted"')
+
+    monkeypatch.setattr(append_smk_rule, "format_block", fake_format)
+    append_smk_rule.main(["new_rule", "shared.smk", "--format"])
+
+    assert seen == ['rule new_rule:\n    shell:\n        "true"\n']
+    assert project.read_text().startswith(EXISTING)
+    assert '"formatted"' in project.read_text()
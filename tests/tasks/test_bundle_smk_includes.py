@@ -0,0 +1,123 @@
+"""
+Unit tests for `tasks/bundle_smk_includes.py`.
+
+Every test works on a temporary `workflow/rules/` directory holding an
+`includes.smk` with one `include:` per rule file.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+SCRIPT_PATH = ROOT_DIR / "tasks" / "bundle_smk_includes.py"
+
+spec = importlib.util.spec_from_file_location("bundle_smk_includes", SCRIPT_PATH)
+bundle = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+sys.modules["bundle_smk_includes"] = bundle
+assert spec.loader
+spec.loader.exec_module(bundle)  # type: ignore[attr-defined]
+
+
+def _rule(name: str) -> str:
+    return f'rule {name}:\n    shell:\n        "true"\n'
+
+
+@pytest.fixture
+def rules_dir(tmp_path) -> Path:
+    """`workflow/rules/` with two per-rule smk files and a nested include."""
+    rules = tmp_path / "workflow" / "rules"
+    rules.mkdir(parents=True)
+    (rules / "a.smk").write_text(_rule("a"))
+    (rules / "b.smk").write_text(_rule("b"))
+    (rules / "includes.smk").write_text(
+        '# shared setup\ninclude: "a.smk"\ninclude: "b.smk"\ninclude: "sub/c.smk"\n'
+    )
+    return rules
+
+
+def test_enable_moves_members_and_inlines_them(rules_dir):
+    """Members are inlined in order; other lines are kept verbatim."""
+    assert bundle.enable(rules_dir, helper_source=SCRIPT_PATH) == "rebuilt"
+
+    assert (rules_dir / "includes.smk").read_text() == bundle.POINTER
+    assert 'include: "a.smk"' in (rules_dir / "includes.members.smk").read_text()
+    assert (rules_dir / "bundle_includes.py").read_text() == SCRIPT_PATH.read_text()
+
+    text = (rules_dir / "includes.bundle.smk").read_text()
+    assert "# shared setup\n" in text
+    assert text.index("rule a:") < text.index("rule b:")
+    assert 'include: "a.smk"' not in text
+    assert 'include: "sub/c.smk"\n' in text
+
+    ignored = (rules_dir / ".gitignore").read_text().splitlines()
+    assert {"includes.bundle.smk", ".includes.bundle.json"} <= set(ignored)
+
+
+def test_build_is_a_no_op_while_members_are_unchanged(rules_dir):
+    """A fresh bundle is neither re-read nor rewritten."""
+    bundle.enable(rules_dir)
+    before = (rules_dir / "includes.bundle.smk").stat().st_mtime_ns
+
+    assert bundle.build(rules_dir) == "fresh"
+    assert (rules_dir / "includes.bundle.smk").stat().st_mtime_ns == before
+
+
+def test_touched_member_only_refreshes_the_manifest(rules_dir):
+    """A new mtime with identical content keeps the bundle text."""
+    bundle.enable(rules_dir)
+    member = rules_dir / "a.smk"
+    st = member.stat()
+    os.utime(member, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    assert bundle.build(rules_dir) == "refreshed"
+    assert bundle.build(rules_dir) == "fresh"
+
+
+def test_changed_member_replaces_only_its_segment(rules_dir):
+    """Unchanged members are reused from the previous bundle."""
+    bundle.enable(rules_dir)
+    (rules_dir / "b.smk").write_text(_rule("b") + "\n\n" + _rule("b2"))
+    # Unchanged members must come from the old bundle, not from disk.
+    old = (rules_dir / "includes.bundle.smk").read_text()
+    (rules_dir / "includes.bundle.smk").write_text(
+        old.replace("rule a:", "rule a_from_bundle:")
+    )
+
+    assert bundle.build(rules_dir) == "rebuilt"
+
+    text = (rules_dir / "includes.bundle.smk").read_text()
+    assert "rule b2:" in text
+    assert "rule a_from_bundle:" in text
+
+
+def test_new_member_is_picked_up(rules_dir):
+    """Appending to the members file rebuilds the bundle."""
+    bundle.enable(rules_dir)
+    (rules_dir / "d.smk").write_text(_rule("d"))
+    with (rules_dir / "includes.members.smk").open("a") as fp:
+        fp.write('include: "d.smk"\n')
+
+    assert bundle.build(rules_dir) == "rebuilt"
+    assert "rule d:" in (rules_dir / "includes.bundle.smk").read_text()
+
+
+def test_unbundle_restores_per_file_includes(rules_dir):
+    """`--unbundle` puts the member list back and removes the artifacts."""
+    original = (rules_dir / "includes.smk").read_text()
+    bundle.enable(rules_dir)
+
+    bundle.main(["--rules-dir", str(rules_dir), "--unbundle"])
+
+    assert (rules_dir / "includes.smk").read_text() == original
+    for name in (
+        "includes.members.smk",
+        "includes.bundle.smk",
+        ".includes.bundle.json",
+    ):
+        assert not (rules_dir / name).exists()
@@ -0,0 +1,142 @@
+"""
+Unit tests for `tasks/rules_index.py`.
+
+The task runs inside the rendered project, so every test `chdir`s into a
+temporary directory that plays the role of the project root.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+SCRIPT_PATH = ROOT_DIR / "tasks" / "rules_index.py"
+
+spec = importlib.util.spec_from_file_location("rules_index", SCRIPT_PATH)
+rules_index = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+sys.modules["rules_index"] = rules_index
+assert spec.loader
+spec.loader.exec_module(rules_index)  # type: ignore[attr-defined]
+
+
+def _run(*args: str) -> dict:
+    rules_index.main(list(args))
+    return json.loads(rules_index.INDEX_PATH.read_text())
+
+
+def _register(rule: str, smk: str, env: str = "CORE", *extra: str) -> dict:
+    return _run(
+        "--rule-name",
+        rule,
+        "--smk-file",
+        smk,
+        "--script",
+        f"workflow/scripts/rules_conda_{env}/{rule}.py",
+        "--conda-env-key",
+        env,
+        *extra,
+    )
+
+
+def test_register_builds_reverse_lookups(tmp_path, monkeypatch):
+    """Each rule is reachable from its smk file, script dir and env key."""
+    monkeypatch.chdir(tmp_path)
+
+    _register("rule_a", "shared.smk")
+    index = _register("rule_b", "shared.smk")
+
+    assert set(index["rules"]) == {"rule_a", "rule_b"}
+    assert index["smk_files"] == {"shared.smk": ["rule_a", "rule_b"]}
+    assert index["script_dirs"] == {"rules_conda_CORE": ["rule_a", "rule_b"]}
+    assert index["conda_env_keys"] == {"CORE": ["rule_a", "rule_b"]}
+
+
+def test_reregister_replaces_stale_lookups(tmp_path, monkeypatch):
+    """Re-rendering a rule with new answers leaves no stale lookup entries."""
+    monkeypatch.chdir(tmp_path)
+
+    _register("rule_a", "old.smk", env="CORE")
+    index = _register("rule_a", "new.smk", env="DOCS")
+
+    assert index["smk_files"] == {"new.smk": ["rule_a"]}
+    assert index["conda_env_keys"] == {"DOCS": ["rule_a"]}
+    assert index["rules"]["rule_a"]["script_dir"] == "rules_conda_DOCS"
+
+
+def test_module_lookup_tracks_package_modules(tmp_path, monkeypatch):
+    """Rules implemented in a package module are reachable from the module."""
+    monkeypatch.chdir(tmp_path)
+
+    _register("rule_a", "rule_a.smk", "CORE", "--module", "datasets/clean")
+    index = _register("rule_b", "rule_b.smk")
+
+    assert index["modules"] == {"datasets/clean": ["rule_a"]}
+    assert index["rules"]["rule_b"]["module"] == ""
+
+    index = _register("rule_a", "rule_a.smk", "CORE", "--module", "models/fit")
+    assert index["modules"] == {"models/fit": ["rule_a"]}
+
+
+def test_missing_index_is_bootstrapped_from_answers(tmp_path, monkeypatch):
+    """Rules rendered before the index existed are picked up once."""
+    monkeypatch.chdir(tmp_path)
+    answers_dir = tmp_path / "copier-answers"
+    answers_dir.mkdir()
+    (answers_dir / "rule-legacy.yml").write_text(
+        "rule_name: legacy\nsmk_file_name: legacy.smk\nuses_conda: false\n"
+    )
+    (answers_dir / "rule-packaged.yml").write_text(
+        "rule_name: packaged\nuses_package: true\nmodule_type: features\n"
+        "module_name: scale\nconda_env_key: CORE\n"
+    )
+
+    index = _register("rule_a", "rule_a.smk")
+
+    assert index["rules"]["legacy"]["script"] == (
+        "workflow/scripts/rules_global/legacy.py"
+    )
+    assert index["rules"]["legacy"]["answers_file"] == "copier-answers/rule-legacy.yml"
+    assert index["modules"] == {"features/scale": ["packaged"]}
+    assert index["conda_env_keys"] == {"CORE": ["packaged", "rule_a"]}
+
+
+def test_new_conda_env_key_warns(tmp_path, monkeypatch, capsys):
+    """A conda env key no other rule uses is reported, a shared one is not."""
+    monkeypatch.chdir(tmp_path)
+
+    _register("rule_a", "rule_a.smk", env="CORE")
+    assert "CORE" in capsys.readouterr().err
+
+    _register("rule_b", "rule_b.smk", env="CORE")
+    assert capsys.readouterr().err == ""
+
+
+def test_copying_a_registered_rule_again_warns(tmp_path, monkeypatch, capsys):
+    """Only a `copier copy` of an already registered rule is reported."""
+    monkeypatch.chdir(tmp_path)
+    _register("rule_a", "rule_a.smk", "CORE", "--operation", "copy")
+    capsys.readouterr()
+
+    _register("rule_a", "rule_a.smk", "CORE", "--operation", "update")
+    assert "already existed" not in capsys.readouterr().err
+
+    _register("rule_a", "rule_a.smk", "CORE", "--operation", "copy")
+    assert "rule 'rule_a' already existed in 'rule_a.smk'" in (capsys.readouterr().err)
+
+
+@pytest.mark.parametrize("content", ["not json", '{"version": 1}'])
+def test_unreadable_index_is_rebuilt(tmp_path, monkeypatch, content):
+    """Corrupt or outdated indexes are rebuilt rather than trusted."""
+    monkeypatch.chdir(tmp_path)
+    rules_index.INDEX_PATH.parent.mkdir(parents=True)
+    rules_index.INDEX_PATH.write_text(content)
+
+    index = _register("rule_a", "rule_a.smk")
+
+    assert index["version"] == rules_index.INDEX_VERSION
+    assert set(index["rules"]) == {"rule_a"}
@@ -14,13 +14,13 @@ The test fixture yields ``(project_dir, example_name)`` exactly like before.
 
 from __future__ import annotations
 
-import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, cast
 
 import pytest
 from loguru import logger
+from pytest_copie.plugin import Result
 from ruamel.yaml import YAML
 
 from scripts.copie_helpers import (
@@ -29,6 +29,8 @@ from scripts.copie_helpers import (
     new_copie,
     run_copie_with_output_control,
 )
+from scripts.render_workspace import RenderWorkspace, parse_size
+from scripts.tox_result_cache import answers_hash
 
 PROJECT_ROOT: Path = Path(__file__).resolve().parents[2]
 ensure_package_repo_path = PROJECT_ROOT / "scripts" / "pull_able_workflow_copier.py"
@@ -62,19 +64,29 @@ def _read_yaml(path: Path) -> Dict[str, Any]:
 
 
 def _discover_example_dirs() -> List[Path]:
+    """
+    Return the hand-written examples under `example-answers/` followed by the
+    ones written to `example-answers/generated/` by
+    `scripts/generate_example_matrix.py`.
+    """
     examples_dir = PROJECT_ROOT / "example-answers"
     if not examples_dir.is_dir():
         return []
 
     example_dirs: List[Path] = []
-    for answers_dir in examples_dir.iterdir():
-        if not answers_dir.is_dir():
+    for parent in (examples_dir, examples_dir / "generated"):
+        if not parent.is_dir():
             continue
-        pkg = answers_dir / "package.yml"
-        rule = answers_dir / "rule.yml"
-        if pkg.exists() and rule.exists():
-            example_dirs.append(answers_dir)
-    return sorted(example_dirs)
+        found = []
+        for answers_dir in parent.iterdir():
+            if not answers_dir.is_dir():
+                continue
+            pkg = answers_dir / "package.yml"
+            rule = answers_dir / "rule.yml"
+            if pkg.exists() and rule.exists():
+                found.append(answers_dir)
+        example_dirs.extend(sorted(found))
+    return example_dirs
 
 
 EXAMPLE_DIRS: List[Path | None] = _discover_example_dirs() or [None]
@@ -105,13 +117,113 @@ class _LazyExamples:
 EXAMPLES = _LazyExamples()
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Render workspace
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Reject a bad --render-quota before anything is rendered."""
+    quota = config.getoption("render_quota")
+    try:
+        if quota is not None:
+            parse_size(quota)
+    except ValueError as exc:
+        raise pytest.UsageError(str(exc)) from exc
+
+
+def get_render_workspace(config: pytest.Config) -> RenderWorkspace:
+    """
+    Return this session's render workspace, creating it on first use, so
+    that only sessions that render examples touch it.
+    SEE: scripts/render_workspace.py and --render-* in tests/conftest.py
+    """
+    workspace: RenderWorkspace | None = getattr(config, "_render_workspace", None)
+    if workspace is None:
+        workspace = RenderWorkspace(
+            quota=config.getoption("render_quota"),
+            keep=config.getoption("render_keep"),
+        )
+        if config.getoption("render_purge"):
+            removed = workspace.purge()
+            logger.info("Purged {} render(s) from {}", len(removed), workspace.root)
+        config._render_workspace = workspace  # type: ignore[attr-defined]
+    return workspace
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """
+    Release this session's renders and evict old ones over the disk quota.
+    """
+    workspace = getattr(config, "_render_workspace", None)
+    if workspace is None:
+        return
+    if workspace.keep:
+        logger.info("Keeping rendered projects under {}", workspace.root)
+    workspace.release()
+
+
+@pytest.fixture(scope="session")
+def render_workspace(request: pytest.FixtureRequest) -> RenderWorkspace:
+    """The render workspace of this session."""
+    return get_render_workspace(request.config)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Parent renders
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def render_package(
+    config: pytest.Config,
+    name: str,
+    answers: Dict[str, Any],
+    *,
+    vcs_ref: str | None = None,
+) -> Result:
+    """
+    Render the package template (parent) for *answers*.
+
+    Unless `--render-no-fanout` is given, the render is shared by every
+    example with the same package answers; pass the result to
+    ``new_copie(..., fan_out=True)`` so each rule render works on a clone.
+    SEE: scripts/render_fanout.py
+    """
+    fan_out = not config.getoption("render_no_fanout")
+    cache: Dict[tuple[str, str | None], Result] = getattr(config, "_parent_renders", {})
+    key = (answers_hash(answers), vcs_ref)
+    if fan_out and key in cache:
+        logger.debug(f"Reusing package render of '{name}' → {cache[key].project_dir}")
+        return cache[key]
+
+    tmp_root = get_render_workspace(config).acquire(f"package_{name}")
+    pkg_dir = tmp_root / "package"
+    pkg_dir.mkdir()
+    pkg_copie = new_copie(
+        template_dir=TEMPLATE_PACKAGE_DIR,
+        test_dir=pkg_dir,
+        config_file=make_copier_config(tmp_root),
+    )
+
+    # Run the package template with output control
+    # to avoid cluttering the test output with copier's own logs.
+    # This is especially useful when running tests with `-v` or `-vv`.
+    pkg_result = run_copie_with_output_control(
+        config, pkg_copie, answers, vcs_ref=vcs_ref, profile_name=f"{name}-package"
+    )
+    if fan_out and not (pkg_result.exit_code or pkg_result.exception):
+        cache[key] = pkg_result
+        config._parent_renders = cache
+    return pkg_result
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Fixture
 # ─────────────────────────────────────────────────────────────────────────────
 
 
 @pytest.fixture(scope="session", params=EXAMPLE_DIRS, ids=_example_id)
-def rendered(request):
+def rendered(request, render_workspace):
     """Render an example and yield (project_dir, example_name)."""
     example_dir: Path | None = request.param
 
@@ -137,24 +249,7 @@ def rendered(request):
             pytrace=False,
         )
 
-    tmp_root = Path(tempfile.mkdtemp(prefix=f"copie_{example.name}_"))
-    config_file = make_copier_config(tmp_root)
-
-    # Package template (parent)
-    pkg_dir = tmp_root / "package"
-    pkg_dir.mkdir()
-    pkg_copie = new_copie(
-        template_dir=TEMPLATE_PACKAGE_DIR,
-        test_dir=pkg_dir,
-        config_file=config_file,
-    )
-
-    # Run the package template with output control
-    # to avoid cluttering the test output with copier's own logs.
-    # This is especially useful when running tests with `-v` or `-vv`.
-    pkg_result = run_copie_with_output_control(
-        request.config, pkg_copie, example.package_answers
-    )
+    pkg_result = render_package(request.config, example.name, example.package_answers)
 
     # Smoke test the package template
     if pkg_result.exit_code or pkg_result.exception:
@@ -162,7 +257,10 @@ def rendered(request):
             f"Package template failed for {example.name}: {pkg_result.exception}"
         )
 
-    # Rule template (child)
+    # Rule template (child), on a clone of the shared package render
+    # SEE: scripts/render_workspace.py and --render-* in tests/conftest.py
+    tmp_root = render_workspace.acquire(f"copie_{example.name}")
+    config_file = make_copier_config(tmp_root)
     rule_dir = tmp_root / "rule"
     rule_dir.mkdir()
     rule_copie = new_copie(
@@ -170,13 +268,17 @@ def rendered(request):
         test_dir=rule_dir,
         config_file=config_file,
         parent_result=pkg_result,
+        fan_out=not request.config.getoption("render_no_fanout"),
     )
 
     # Run the rule template with output control
     # to avoid cluttering the test output with copier's own logs.
     # This is especially useful when running tests with `-v` or `-vv`.
     rule_result = run_copie_with_output_control(
-        request.config, rule_copie, example.rule_answers
+        request.config,
+        rule_copie,
+        example.rule_answers,
+        profile_name=f"{example.name}-rule",
     )
 
     # Smoke test the rule template
@@ -0,0 +1,19 @@
+"""
+Options for the rendered-output tier.
+"""
+
+
+# --- pytest options ---------------------------------------------------------
+def pytest_addoption(parser):
+    """
+    Add command-line options for the golden snapshot tests.
+    """
+    parser.addoption(
+        "--snapshot-update",
+        action="store_true",
+        dest="snapshot_update",
+        help=(
+            "(Re)write the golden snapshot manifests of the rendered examples "
+            + "instead of comparing against them."
+        ),
+    )
@@ -0,0 +1,22 @@
+"""
+The generated integration tests dry-run the rule before executing it.
+"""
+
+import ast
+
+
+def test_dry_run_test_comes_before_the_full_execution(rendered):
+    project_dir, _ = rendered
+    rules_tests = project_dir / "tests" / "workflow" / "rules"
+    assert (rules_tests / "snakemake_session.py").is_file()
+
+    for path in rules_tests.glob("test_snakemake_*.py"):
+        rule = path.stem.removeprefix("test_snakemake_")
+        tests = [
+            node.name
+            for node in ast.parse(path.read_text()).body
+            if isinstance(node, ast.FunctionDef) and node.name.startswith("test_")
+        ]
+        if f"test_dry_run_{rule}" not in tests:
+            continue  # written before the dry-run tests were generated
+        assert tests.index(f"test_dry_run_{rule}") < tests.index(f"test_rule_{rule}")
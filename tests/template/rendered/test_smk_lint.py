@@ -0,0 +1,24 @@
+"""
+In-process Snakemake parse and lint of each rendered example.
+
+Seconds instead of the minutes of the inner tox envs: the include chain is
+parsed with Snakemake's parser and the `script:`, `conda:`, `log:` and
+`benchmark:` paths are checked against the rendered tree, without running
+anything. SEE: scripts/smk_lint.py
+"""
+
+import pytest
+from loguru import logger
+
+from scripts.smk_lint import lint_project
+
+pytest.importorskip("snakemake")
+
+
+def test_smk_include_chain_parses_and_lints(rendered):
+    project_dir, _ = rendered
+    report = lint_project(project_dir)
+    for issue in report.issues:
+        logger.warning(str(issue))
+    assert report.rules, f"No rules found from {report.files[:1]}"
+    assert not report.errors, "\n".join(str(issue) for issue in report.errors)
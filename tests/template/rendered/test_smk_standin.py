@@ -0,0 +1,55 @@
+"""
+The generated `smk` stand-in has the attribute surface of the real Snakemake
+object, so script tests behave the same with and without the real one.
+"""
+
+import importlib.util
+
+import pytest
+
+
+def _public(obj):
+    return {name for name in vars(obj) if not name.startswith("_")} | {
+        name
+        for name in dir(type(obj))
+        if not name.startswith("_") and callable(getattr(obj, name))
+    }
+
+
+def test_standin_mirrors_snakemake(rendered, tmp_path):
+    pytest.importorskip("snakemake")
+    project_dir, _ = rendered
+    path = project_dir / "tests" / "workflow" / "scripts" / "smk_standin.py"
+    spec = importlib.util.spec_from_file_location("smk_standin", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    kwargs = {
+        "input": {"readme": tmp_path / "README.md"},
+        "output": {"table": tmp_path / "out.tsv"},
+        "params": {"n": 3},
+        "wildcards": {"sample": "a"},
+        "threads": 2,
+        "log": {"loguru": tmp_path / "loguru.log"},
+        "config": {"key": "value"},
+        "rulename": "demo",
+    }
+    standin = module.build_smk(**kwargs)
+    real = module.build_smk(**kwargs, real=True)
+
+    # The stand-in may lack Snakemake helpers, but not the attributes scripts read.
+    assert {name for name in vars(real) if not name.startswith("_")} | {
+        "params"
+    } <= _public(standin)
+    for attr in ("input", "output", "params", "wildcards", "log"):
+        container, expected = getattr(standin, attr), getattr(real, attr)
+        assert list(container) == list(expected)
+        assert dict(container.items()) == dict(expected.items())
+    assert standin.input.readme == real.input.readme == str(tmp_path / "README.md")
+    assert standin.params["n"] == real.params["n"] == 3
+    assert standin.log_fmt_shell(append=True) == real.log_fmt_shell(append=True)
+    assert (standin.threads, standin.rule, standin.config) == (
+        real.threads,
+        real.rule,
+        real.config,
+    )
@@ -0,0 +1,53 @@
+"""
+Compare each rendered example against its golden snapshot manifest.
+
+The manifests live in `tests/template/rendered/snapshots/<example>.json` and
+hold a normalized content hash of every file the rule template produces
+(plus the full text of the rule files). Regenerate them after an intended
+change with
+
+    pytest tests/template/rendered/test_snapshot.py --snapshot-update
+
+and commit the manifests. An example without a committed manifest is
+skipped, so the tier only guards the examples that have goldens.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from scripts.snapshot_manifest import (
+    build_manifest,
+    diff_manifests,
+    load_manifest,
+    project_globs,
+    save_manifest,
+)
+from tests.template.conftest import TEMPLATE_RULE_DIR
+
+SNAPSHOT_DIR = Path(__file__).parent / "snapshots"
+
+
+def test_rendered_output_matches_snapshot(rendered, request):
+    """The rule template output is unchanged since the snapshot was taken."""
+    project_dir, answers_id = rendered
+    snapshot = SNAPSHOT_DIR / f"{answers_id}.json"
+    actual = build_manifest(project_dir, project_globs(TEMPLATE_RULE_DIR, project_dir))
+
+    if request.config.getoption("snapshot_update"):
+        save_manifest(snapshot, actual)
+        return
+
+    expected = load_manifest(snapshot)
+    if expected is None:
+        pytest.skip(
+            f"No golden snapshot {snapshot} for {answers_id} yet; "
+            "create it with --snapshot-update and commit it."
+        )
+
+    differences = diff_manifests(expected, actual)
+    assert not differences, (
+        f"Rendered output of {answers_id} differs from {snapshot}.\n"
+        + "\n".join(differences)
+        + "\nRerun with --snapshot-update if the change is intended."
+    )
@@ -14,6 +14,9 @@ import tomllib
 from loguru import logger
 from typing import List, Sequence
 
+from scripts import tox_accounting
+from scripts.template_shard import DURATIONS_FILE, save_durations
+
 
 # --- pytest options ---------------------------------------------------------
 def pytest_addoption(parser):
@@ -40,6 +43,79 @@ def pytest_addoption(parser):
         ),
     )
 
+    parser.addoption(
+        "--template-changed-since",
+        action="store",
+        dest="template_changed_since",
+        metavar="REF",
+        default=None,
+        help=(
+            "Only run the (variant, env) pairs affected by files changed since "
+            + "the git REF (plus uncommitted and untracked files)."
+        ),
+    )
+
+    parser.addoption(
+        "--template-force-run",
+        action="store_true",
+        dest="template_force_run",
+        help=(
+            "Run the *inner* tox environment(s) even when a pass with the same "
+            + "template, answers and tool versions is recorded in the cache."
+        ),
+    )
+
+    parser.addoption(
+        "--template-shard",
+        action="store",
+        dest="template_shard",
+        metavar="I/N",
+        default=None,
+        help=(
+            "Only run the I-th of N duration-balanced shards of the "
+            + "(variant, env) matrix, e.g. 2/4."
+        ),
+    )
+
+    parser.addoption(
+        "--template-durations",
+        action="store",
+        dest="template_durations",
+        metavar="PATH",
+        default=DURATIONS_FILE,
+        help=(
+            "JSON file of recorded (variant, env) durations used to balance "
+            + "--template-shard; updated after each run. "
+            + "Default: %(default)s"
+        ),
+    )
+
+    parser.addoption(
+        "--template-usage-report",
+        action="store",
+        dest="template_usage_report",
+        metavar="PATH",
+        default=tox_accounting.USAGE_REPORT_FILE,
+        help=(
+            "JSON file for the wall time, CPU time, peak RSS and IO bytes of "
+            + "each *inner* tox env setup and run of this session. "
+            + "Default: %(default)s"
+        ),
+    )
+
+    parser.addoption(
+        "--template-budget",
+        action="append",
+        dest="template_budgets",
+        metavar="ENV:METRIC=LIMIT[,...]",
+        help=(
+            "Fail the *inner* tox env(s) matching the ENV glob that exceed a "
+            + "limit, e.g. 'py312-workflow-*:rss=4G,cpu=900'. Metrics: wall "
+            + "and cpu (seconds), rss, read and write (bytes, K/M/G suffixes); "
+            + "may be given more than once."
+        ),
+    )
+
     parser.addoption(
         "--no-parallel",
         action="store_true",
@@ -48,6 +124,58 @@ def pytest_addoption(parser):
     )
 
 
+# --- PyTest Hooks -----------------------------------------------------------
+def pytest_configure(config):
+    """
+    Parse the --template-budget limits once per session.
+    """
+    try:
+        config._tox_budgets = tox_accounting.parse_budgets(
+            config.getoption("template_budgets", default=None)
+        )
+    except ValueError as exc:
+        raise pytest.UsageError(str(exc)) from exc
+
+
+def _session_path(config: pytest.Config, option: str) -> Path:
+    path = Path(config.getoption(option))
+    if not path.is_absolute():
+        path = Path(config.rootpath) / path
+    return path
+
+
+def pytest_sessionfinish(session):
+    """
+    Persist the inner tox env durations and resource usage measured in this
+    session.
+    SEE: test_inner_tox_env_passes() in test_tox_envs.py
+    """
+    usage = getattr(session.config, "_tox_usage", None)
+    if usage:
+        path = _session_path(session.config, "template_usage_report")
+        tox_accounting.write_report(path, usage)
+        logger.info("Wrote the usage of {} inner tox env(s) to {}", len(usage), path)
+
+    measured = getattr(session.config, "_tox_durations", None)
+    if not measured:
+        return
+    path = _session_path(session.config, "template_durations")
+    save_durations(path, measured)
+    logger.info("Recorded {} inner tox env duration(s) in {}", len(measured), path)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """
+    Show the resource usage of each inner tox env, heaviest peak RSS first.
+    """
+    usage = getattr(config, "_tox_usage", None)
+    if not usage:
+        return
+    terminalreporter.write_sep("=", "inner tox env resource usage")
+    for line in tox_accounting.summary_lines(usage):
+        terminalreporter.write_line(line)
+
+
 # --- Helpers ----------------------------------------------------------------
 def _parse_env_list_from_config(project_dir: Path) -> list[str]:
     """Return ``tox.env_list`` by reading *pyproject.toml* (or *tox.ini*)."""
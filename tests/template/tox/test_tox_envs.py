@@ -12,18 +12,22 @@ from __future__ import annotations
 import os
 import sys
 import subprocess
-import tempfile
+import time
 from pathlib import Path
 
 import pytest
 from loguru import logger
 
+from scripts import template_shard, tox_accounting, tox_result_cache
+from scripts.template_impact import affected_envs, changed_files, impacted_globs
 from tests.template.conftest import (
     EXAMPLES,
     TEMPLATE_PACKAGE_DIR,
     TEMPLATE_RULE_DIR,
+    get_render_workspace,
     make_copier_config,
     new_copie,
+    render_package,
     run_copie_with_output_control,
 )
 from tests.template.tox.conftest import _list_tox_envs
@@ -135,6 +139,60 @@ def _bootstrap_git_repo(path: Path) -> None:
     )
 
 
+def _impacted_globs(config: pytest.Config) -> set[str] | None:
+    """
+    Rendered-path globs affected by ``--template-changed-since``, or ``None``
+    to keep every env.
+    """
+    since = config.getoption("template_changed_since", default=None)
+    if not since:
+        return None
+    try:
+        changed = changed_files(TEMPLATE_RULE_DIR, since)
+    except (FileNotFoundError, subprocess.CalledProcessError) as exc:
+        raise pytest.UsageError(
+            f"Failed to list files changed since {since!r}: {exc}"
+        ) from exc
+    globs = impacted_globs(changed, TEMPLATE_RULE_DIR)
+    logger.info(
+        "{} file(s) changed since {}; impacted rendered paths: {}",
+        len(changed),
+        since,
+        "all" if globs is None else sorted(globs),
+    )
+    return globs
+
+
+def _account(
+    config: pytest.Config,
+    variant_id: str,
+    env_name: str,
+    setup: tox_accounting.Usage,
+    run: tox_accounting.Usage,
+    *,
+    replayed: bool = False,
+) -> list[str]:
+    """
+    Record the resource usage of one inner env for the session report and
+    return the --template-budget limits it exceeds.
+    SEE: pytest_sessionfinish() and pytest_terminal_summary() in conftest.py
+    """
+    total = setup + run
+    violations = tox_accounting.check_budgets(
+        getattr(config, "_tox_budgets", []), env_name, total
+    )
+    usage = getattr(config, "_tox_usage", {})
+    usage[template_shard.pair_id(variant_id, env_name)] = {
+        "setup": setup,
+        "run": run,
+        "total": total,
+        "replayed": replayed,
+        "violations": violations,
+    }
+    config._tox_usage = usage
+    return violations
+
+
 # --- PyTest Hooks -----------------------------------------------------------
 def pytest_generate_tests(metafunc):
     """
@@ -163,33 +221,44 @@ def pytest_generate_tests(metafunc):
             metafunc.config, "_tox_collect_cache", {}
         )
 
-        for ex in EXAMPLES:
-            var_id = ex.name
-            if var_id not in cache:
+        # Only keep the envs affected by the current change, if requested.
+        # SEE: --template-changed-since in conftest.py
+        if not hasattr(metafunc.config, "_tox_impacted_globs"):
+            metafunc.config._tox_impacted_globs = _impacted_globs(metafunc.config)
+        impacted = metafunc.config._tox_impacted_globs
 
-                # Prepare a temporary directory for rendering
-                tmp_root = Path(tempfile.mkdtemp(prefix=f"collect_{var_id}_"))
-                config_file = make_copier_config(tmp_root)
+        # Everything but the env name of the result cache key, per variant.
+        # SEE: scripts/tox_result_cache.py
+        result_keys: dict[str, dict[str, str]] = getattr(
+            metafunc.config, "_tox_result_keys", {}
+        )
+        template_tree = tox_result_cache.template_tree_hash(
+            template_rule_root, template_refs[template_rule_root]
+        )
 
-                # Render package template
-                pkg_dir = tmp_root / "pkg"
-                pkg_dir.mkdir()
-                pkg_copie = new_copie(
-                    template_dir=TEMPLATE_PACKAGE_DIR,
-                    test_dir=pkg_dir,
-                    config_file=config_file,
-                )
+        # No template source changed, so no variant needs rendering at all.
+        examples = [] if impacted == set() else EXAMPLES
 
-                # Run the package template with output control
-                # to avoid cluttering the test output with copier's own logs.
-                # This is especially useful when running tests with `-v` or `-vv`.
-                pkg = run_copie_with_output_control(
+        for ex in examples:
+            var_id = ex.name
+            if var_id not in cache:
+
+                # Render package template (parent), shared by all variants
+                # with the same package answers (SEE: --render-no-fanout)
+                pkg = render_package(
                     metafunc.config,
-                    pkg_copie,
+                    var_id,
                     ex.package_answers,
                     vcs_ref=template_refs[template_package_root],
                 )
 
+                # Prepare a temporary directory for rendering
+                # SEE: scripts/render_workspace.py
+                tmp_root = get_render_workspace(metafunc.config).acquire(
+                    f"collect_{var_id}"
+                )
+                config_file = make_copier_config(tmp_root)
+
                 # Render rule template (child)
                 rule_dir = tmp_root / "rule"
                 rule_dir.mkdir()
@@ -198,6 +267,7 @@ def pytest_generate_tests(metafunc):
                     test_dir=rule_dir,
                     config_file=config_file,
                     parent_result=pkg,
+                    fan_out=not metafunc.config.getoption("render_no_fanout"),
                 )
 
                 # Run the rule template with output control
@@ -208,6 +278,7 @@ def pytest_generate_tests(metafunc):
                     rule_copie,
                     ex.rule_answers,
                     vcs_ref=template_refs[template_rule_root],
+                    profile_name=f"{var_id}-rule",
                 )
 
                 project_dir: Path = rule.project_dir
@@ -215,6 +286,13 @@ def pytest_generate_tests(metafunc):
                 cache[var_id] = (project_dir, envs)
 
             project_dir, envs = cache[var_id]
+            result_keys[var_id] = {
+                "template_tree": template_tree,
+                "package_ref": template_refs[template_package_root],
+                "answers": tox_result_cache.answers_hash(
+                    ex.package_answers, ex.rule_answers
+                ),
+            }
             if not envs:
                 logger.warning("No tox envs found for {}, skipping", var_id)
                 continue
@@ -230,17 +308,57 @@ def pytest_generate_tests(metafunc):
                 # If the option is not set, use an empty set
                 requested = set()
 
+            selected = set(affected_envs(project_dir, envs, impacted))
+            if len(selected) < len(envs):
+                logger.info(
+                    "{}: change-impact selection skips {}",
+                    var_id,
+                    sorted(set(envs) - selected),
+                )
+
             for env in envs:
                 # If the user asked for a subset (--inner-envs=*) keep only those
                 if requested and env not in requested:
                     continue
+                if env not in selected:
+                    continue
                 argvalues.append((var_id, env))
                 argids.append(f"{var_id}:{env}")
 
+        # Keep only this job's share of the matrix.
+        # SEE: --template-shard in conftest.py
+        shard = metafunc.config.getoption("template_shard", default=None)
+        if shard:
+            try:
+                index, total = template_shard.parse_shard(shard)
+            except ValueError as exc:
+                raise pytest.UsageError(str(exc)) from exc
+            durations_path = Path(metafunc.config.getoption("template_durations"))
+            if not durations_path.is_absolute():
+                durations_path = Path(metafunc.config.rootpath) / durations_path
+            kept = set(
+                template_shard.select_shard(
+                    argvalues,
+                    index,
+                    total,
+                    template_shard.load_durations(durations_path),
+                )
+            )
+            logger.info(
+                "Shard {}/{} runs {} of {} (variant, env) pairs",
+                index,
+                total,
+                len(kept),
+                len(argvalues),
+            )
+            argids = [i for v, i in zip(argvalues, argids) if v in kept]
+            argvalues = [v for v in argvalues if v in kept]
+
         metafunc.parametrize(
             ("variant_id", "env_name"), argvalues, ids=argids, scope="session"
         )
         metafunc.config._tox_collect_cache = cache
+        metafunc.config._tox_result_keys = result_keys
 
     else:
         logger.warning(f"Skipping dynamic param for {metafunc.function}")
@@ -254,6 +372,39 @@ def test_inner_tox_env_passes(variant_id, env_name, request):
     """
     project_dir, _ = request.config._tox_collect_cache[variant_id]
 
+    # Replay a recorded pass for identical inputs instead of running tox.
+    # SEE: --template-force-run in conftest.py
+    result_cache = getattr(request.config, "cache", None)
+    result_key = tox_result_cache.result_key(
+        **request.config._tox_result_keys[variant_id], env_name=env_name
+    )
+    recorded = tox_result_cache.lookup(result_cache, result_key)
+    if recorded and not request.config.getoption("template_force_run"):
+        logger.info(
+            "[{}:{}] replaying pass recorded at {} ({:.1f}s)",
+            variant_id,
+            env_name,
+            recorded["recorded_at"],
+            recorded["duration_s"],
+        )
+        sys.stdout.write(recorded["stdout"])
+        sys.stderr.write(recorded["stderr"])
+        if recorded.get("usage"):
+            violations = _account(
+                request.config,
+                variant_id,
+                env_name,
+                tox_accounting.Usage.from_dict(recorded["usage"]["setup"]),
+                tox_accounting.Usage.from_dict(recorded["usage"]["run"]),
+                replayed=True,
+            )
+            assert not violations, (
+                f"[variant = {variant_id}, env = {env_name}] recorded pass "
+                f"over budget: {'; '.join(violations)}"
+            )
+        return
+    started = time.perf_counter()
+
     # Ensure the project directory is a Git repo (for setuptools-scm)
     _bootstrap_git_repo(project_dir)
 
@@ -304,52 +455,64 @@ def test_inner_tox_env_passes(variant_id, env_name, request):
         "-e",
         env_name,
     ]
-    if verbosity >= 2:
-        subprocess.run(
-            setup_args,
-            cwd=project_dir,
-            check=True,
-            stdout=sys.stdout,
-            stderr=sys.stderr,
-            text=True,
+    # Resource usage of the setup and the run feed the usage report and the
+    # --template-budget checks. SEE: scripts/tox_accounting.py
+    setup_usage = tox_accounting.Usage()
+    try:
+        with tox_accounting.measure() as setup_usage:
+            if verbosity >= 2:
+                subprocess.run(
+                    setup_args,
+                    cwd=project_dir,
+                    check=True,
+                    stdout=sys.stdout,
+                    stderr=sys.stderr,
+                    text=True,
+                )
+            else:
+                subprocess.run(
+                    setup_args,
+                    cwd=project_dir,
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+    except subprocess.CalledProcessError:
+        _account(
+            request.config, variant_id, env_name, setup_usage, tox_accounting.Usage()
         )
-    else:
-        subprocess.run(
-            setup_args,
+        raise
+
+    # Run the tox tests within the rendered project
+    with tox_accounting.measure() as run_usage:
+        process = subprocess.Popen(
+            [
+                "tox",
+                *run_args,
+                "--skip-pkg-install",
+                "--quiet",
+                "-e",
+                env_name,
+                *extra_args,
+            ],
             cwd=project_dir,
-            check=True,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
         )
 
-    # Run the tox tests within the rendered project
-    process = subprocess.Popen(
-        [
-            "tox",
-            *run_args,
-            "--skip-pkg-install",
-            "--quiet",
-            "-e",
-            env_name,
-            *extra_args,
-        ],
-        cwd=project_dir,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
+        stdout, stderr = [], []
 
-    stdout, stderr = [], []
+        # Stream output live and capture
+        for line in process.stdout:
+            sys.stdout.write(line)
+            stdout.append(line)
+        for line in process.stderr:
+            sys.stderr.write(line)
+            stderr.append(line)
 
-    # Stream output live and capture
-    for line in process.stdout:
-        sys.stdout.write(line)
-        stdout.append(line)
-    for line in process.stderr:
-        sys.stderr.write(line)
-        stderr.append(line)
+        process.wait()
 
-    process.wait()
     completed = subprocess.CompletedProcess(
         args=process.args,
         returncode=process.returncode,
@@ -357,8 +520,30 @@ def test_inner_tox_env_passes(variant_id, env_name, request):
         stderr="".join(stderr),
     )
 
+    # Durations feed the shard balancing, whatever the outcome.
+    # SEE: pytest_sessionfinish() in conftest.py
+    duration_s = time.perf_counter() - started
+    durations = getattr(request.config, "_tox_durations", {})
+    durations[template_shard.pair_id(variant_id, env_name)] = duration_s
+    request.config._tox_durations = durations
+    violations = _account(request.config, variant_id, env_name, setup_usage, run_usage)
+
     assert completed.returncode == 0, (
         f"\n[variant = {variant_id}, env = {env_name}]\n"
         f"stdout:\n{completed.stdout}\n"
         f"stderr:\n{completed.stderr}"
     )
+    assert not violations, (
+        f"[variant = {variant_id}, env = {env_name}] over budget: "
+        f"{'; '.join(violations)}"
+    )
+    tox_result_cache.record_pass(
+        result_cache,
+        result_key,
+        variant_id=variant_id,
+        env_name=env_name,
+        duration_s=duration_s,
+        stdout=completed.stdout,
+        stderr=completed.stderr,
+        usage={"setup": setup_usage.to_dict(), "run": run_usage.to_dict()},
+    )